@@ -0,0 +1,201 @@
+"""
+Adaptive element timeouts
+=========================
+Records how long each logical locator took to appear (resolve + wait) per
+(page, logical_name, environment) and derives a timeout from that history:
+p99 x SA_TIMEOUT_SAFETY, never below SA_TIMEOUT_FLOOR and never above the
+timeout the caller asked for (CLICK_TIMEOUT, PRIMARY_TIMEOUT or the explicit
+value), so a missing element fails after the time it realistically needs.
+
+Samples are buffered in memory and written in one transaction at session end
+(LatencyStore.flush, from testCases/conftest.py), so recording adds no disk
+I/O to clicks and waits.
+
+SA_ADAPTIVE_TIMEOUTS:
+    off   - no recording, fixed timeouts
+    learn - record latencies only (default)
+    on    - record and use the derived timeouts once a key has enough samples
+
+Usage:
+    python -m common_utilities.adaptive_timeouts report [--env ENV] [--min-ratio 3]
+"""
+
+import argparse
+import math
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from common_utilities.path_settings import PathSettings
+
+ADAPTIVE_MODE = os.environ.get("SA_ADAPTIVE_TIMEOUTS", "learn").lower()
+STORE_PATH = os.path.join(PathSettings.CACHE_DIR, "appear_latency.sqlite3")
+SAFETY = float(os.environ.get("SA_TIMEOUT_SAFETY", "3"))
+FLOOR = float(os.environ.get("SA_TIMEOUT_FLOOR", "3"))
+MIN_SAMPLES = int(os.environ.get("SA_TIMEOUT_MIN_SAMPLES", "20"))
+KEEP = 200      # most recent successful samples kept per key
+
+
+def current_env() -> str:
+    return os.environ.get("DIMAGIQA_ENV", "default_env")
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile of non-empty `values` (q in 0..1)."""
+    s = sorted(values)
+    return s[max(0, math.ceil(q * len(s)) - 1)]
+
+
+def derive_timeout(samples: List[float], configured: float) -> Optional[float]:
+    """p99 x SAFETY clamped to [FLOOR, configured]; None until there are MIN_SAMPLES."""
+    if len(samples) < MIN_SAMPLES:
+        return None
+    return min(float(configured), max(FLOOR, percentile(samples, 0.99) * SAFETY))
+
+
+class LatencyStore:
+    """
+    SQLite (WAL) table of time-to-appear samples, shared across runs and xdist
+    workers like the resolution cache. Derived timeouts are computed once per
+    process and key from the history present at first use; new samples are
+    buffered until flush().
+    """
+
+    def __init__(self, path: str = STORE_PATH, mode: str = ADAPTIVE_MODE):
+        self.path = path
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._history: Dict[tuple, List[float]] = {}
+        self._pending: List[tuple] = []
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS samples (
+                    page TEXT NOT NULL, name TEXT NOT NULL, env TEXT NOT NULL,
+                    seconds REAL NOT NULL, ok INTEGER NOT NULL,
+                    timeout REAL, budget REAL, ts REAL)
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS samples_key ON samples (page, name, env, ts)")
+            self._conn = conn
+        return self._conn
+
+    def _samples(self, page: str, name: str, env: str) -> List[float]:
+        key = (page, name, env)
+        if key not in self._history:
+            try:
+                rows = self._db().execute(
+                    "SELECT seconds FROM samples WHERE page=? AND name=? AND env=? AND ok=1 "
+                    "ORDER BY ts DESC LIMIT ?", (page, name, env, KEEP)).fetchall()
+            except sqlite3.Error as e:
+                print(f"[adaptive-timeouts] read failed: {e}")
+                rows = []
+            self._history[key] = [r[0] for r in rows]
+        return self._history[key]
+
+    def timeout_for(self, page: str, name: str, configured: float, env: Optional[str] = None) -> float:
+        """Timeout to actually wait for `name` (the configured value unless mode is "on" and history exists)."""
+        if self.mode != "on":
+            return configured
+        with self._lock:
+            derived = derive_timeout(self._samples(page, name, env or current_env()), configured)
+        return configured if derived is None else derived
+
+    def record(self, page: str, name: str, seconds: float, ok: bool,
+               timeout: float, budget: float, env: Optional[str] = None) -> None:
+        """Buffer one sample (written by flush())."""
+        row = (page, name, env or current_env(), float(seconds), int(ok), float(timeout), float(budget), time.time())
+        with self._lock:
+            self._pending.append(row)
+
+    def flush(self) -> int:
+        """Write the buffered samples in one transaction and prune the keys they touched; returns the count."""
+        with self._lock:
+            rows, self._pending = self._pending, []
+            if not rows:
+                return 0
+            try:
+                db = self._db()
+                with db:
+                    db.execute("BEGIN")
+                    db.executemany("INSERT INTO samples VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                    for page, name, env in {(r[0], r[1], r[2]) for r in rows if r[4]}:
+                        db.execute(
+                            "DELETE FROM samples WHERE rowid IN (SELECT rowid FROM samples "
+                            "WHERE page=? AND name=? AND env=? AND ok=1 ORDER BY ts DESC LIMIT -1 OFFSET ?)",
+                            (page, name, env, KEEP))
+            except sqlite3.Error as e:
+                print(f"[adaptive-timeouts] write failed: {e}")
+                return 0
+        return len(rows)
+
+    def loose_timeouts(self, env: Optional[str] = None, min_ratio: float = 3.0) -> List[Dict[str, Any]]:
+        """Keys whose configured timeout is at least `min_ratio` x the derived one, loosest first."""
+        self.flush()
+        with self._lock:
+            try:
+                q = "SELECT page, name, env, seconds, ok, timeout FROM samples"
+                rows = self._db().execute(q + " WHERE env=?", (env,)).fetchall() if env \
+                    else self._db().execute(q).fetchall()
+            except sqlite3.Error as e:
+                print(f"[adaptive-timeouts] read failed: {e}")
+                return []
+        keys: Dict[tuple, Dict[str, Any]] = {}
+        for page, name, e, seconds, ok, timeout in rows:
+            k = keys.setdefault((page, name, e), {"ok": [], "failed": 0, "timeout": 0.0})
+            if ok:
+                k["ok"].append(seconds)
+            else:
+                k["failed"] += 1
+            k["timeout"] = max(k["timeout"], timeout or 0.0)
+        out = []
+        for (page, name, e), k in keys.items():
+            derived = derive_timeout(k["ok"], k["timeout"])
+            if derived is None or k["timeout"] < min_ratio * derived:
+                continue
+            out.append({"page": page, "name": name, "env": e, "samples": len(k["ok"]), "failed": k["failed"],
+                        "p50_s": round(percentile(k["ok"], 0.5), 3), "p99_s": round(percentile(k["ok"], 0.99), 3),
+                        "max_s": round(max(k["ok"]), 3), "configured_s": k["timeout"],
+                        "derived_s": round(derived, 2), "ratio": round(k["timeout"] / derived, 1)})
+        out.sort(key=lambda r: r["configured_s"] - r["derived_s"], reverse=True)
+        return out
+
+
+_store: Optional[LatencyStore] = None
+
+
+def get_latency_store() -> Optional[LatencyStore]:
+    """Process-wide store (None when disabled via SA_ADAPTIVE_TIMEOUTS=off)."""
+    global _store
+    if ADAPTIVE_MODE not in ("learn", "on"):
+        return None
+    if _store is None:
+        _store = LatencyStore()
+    return _store
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("cmd", choices=["report"])
+    parser.add_argument("--env", help="only this DIMAGIQA_ENV (default: all)")
+    parser.add_argument("--min-ratio", type=float, default=3.0, help="list keys with configured >= ratio x derived")
+    args = parser.parse_args(argv)
+    rows = LatencyStore(mode="learn").loose_timeouts(args.env, args.min_ratio)
+    print(f"{'configured':>10}{'derived':>9}{'p99':>8}{'n':>6}{'fail':>6}  page/name [env]")
+    for r in rows:
+        print(f"{r['configured_s']:>9.0f}s{r['derived_s']:>8.1f}s{r['p99_s']:>7.2f}s{r['samples']:>6}"
+              f"{r['failed']:>6}  {r['page']}/{r['name']} [{r['env']}]")
+    print(f"{len(rows)} locator(s) with a timeout >= {args.min_ratio:g}x what history needs "
+          f"(p99 x {SAFETY:g}, floor {FLOOR:g}s, >= {MIN_SAMPLES} samples)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
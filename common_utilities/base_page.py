@@ -1,4 +1,3 @@
-import locale
 import math
 import os
 import json
@@ -6,7 +5,7 @@ import random
 import re
 import difflib
 import time
-from typing import Dict, Any, Iterable, List, Tuple, Optional
+from typing import Dict, Any, Callable, Iterable, Iterator, List, Mapping, Tuple, Optional
 import platform
 import pdfplumber
 import requests
@@ -23,7 +22,6 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import contextlib
 import calendar
-from collections import defaultdict
 from datetime import datetime, date, timedelta
 from selenium.common.exceptions import (
         TimeoutException,
@@ -31,7 +29,15 @@ from selenium.common.exceptions import (
         JavascriptException,
         )
 
+from common_utilities.adaptive_timeouts import get_latency_store
+from common_utilities.column_sort import check_sorted, describe_failure
+from common_utilities.element_snapshot import snapshot
+from common_utilities.grid_snapshot import ColumnKey, GridRow, GridSnapshot, PAGER_FIRST, PAGER_NEXT, read_grid
+from common_utilities.heal_journal import apply_heal, get_journal as get_heal_journal, read_healed, write_healed
+from common_utilities.locator_registry import get_registry as get_locator_registry
 from common_utilities.path_settings import PathSettings
+from common_utilities.resolution_cache import JS_DOM_FINGERPRINT, entry_signature, get_cache
+from common_utilities.resolution_telemetry import note_tier, traced
 
 # ---- Tunables ---------------------------------------------------------------
 
@@ -41,6 +47,37 @@ VISIBLE_REQUIRED = True     # only accept visible elements
 SIM_THRESHOLD = 0.62        # fuzzy match threshold for text-ish attrs
 MIN_STABLE_PREFIX = 3       # for dynamic-id starts-with heuristics
 PERSIST_HEALED = True       # write healed selectors to self_healed/<page>.json
+# "js" scores every healing candidate in-page with one execute_script;
+# "python" keeps the per-element WebDriver scoring (the reference implementation)
+RESOLVER_MODE = os.environ.get("SA_RESOLVER_MODE", "js").lower()
+RESOLVER_PARITY_CHECK = os.environ.get("SA_RESOLVER_PARITY") == "1"  # run both and report mismatches
+# explicit + alternates are polled together under one deadline instead of 8 s + 3 s per alternate
+RESOLVE_RACE = os.environ.get("SA_RESOLVE_RACE", "1") == "1"
+RACE_DEADLINE = float(os.environ.get("SA_RACE_DEADLINE", "8"))   # seconds for the whole race
+RACE_GRACE = float(os.environ.get("SA_RACE_GRACE", "0.5"))       # wait this long for a higher tier to show up
+RACE_POLL = 0.15
+EXPLICIT_TIMEOUT, ALTERNATE_TIMEOUT = 8, 3                       # sequential budgets (fallback path)
+# expect_absent=True checks (negative assertions) probe the known selectors in one script instead of
+# running full healing; SA_FAST_ABSENCE=0 sends them through resolve() like every other check
+FAST_ABSENCE = os.environ.get("SA_FAST_ABSENCE", "1") == "1"
+NEGATIVE_TTL = float(os.environ.get("SA_NEGATIVE_TTL", "30"))    # max age of a cached miss (same DOM generation)
+ABSENCE_QUIET = float(os.environ.get("SA_ABSENCE_QUIET", "0.5"))  # DOM must be unchanged this long to call it absent
+# _find_unique_in: poll backoff bounds, and how long an ambiguous (>1) match must stay unchanged to fail early
+UNIQUE_POLL_MIN, UNIQUE_POLL_MAX = 0.05, 0.5
+AMBIGUOUS_STABLE = float(os.environ.get("SA_AMBIGUOUS_STABLE", "1.0"))
+# wait_for_dom_quiet: the watched subtree must go this long without a mutation
+DOM_QUIET_MS = int(os.environ.get("SA_DOM_QUIET_MS", "500"))
+# kendo_dd/ms_get_all_texts: "data" reads the widget's bound data in one script (scroll-and-scrape
+# when that is not possible), "scroll" always scrapes the popup; parity runs both and reports differences
+KENDO_LIST_MODE = os.environ.get("SA_KENDO_LIST_MODE", "data").lower()
+KENDO_LIST_PARITY = os.environ.get("SA_KENDO_LIST_PARITY") == "1"
+# wait_for_grid_refresh: the new grid signature must hold this long (no loading mask)
+GRID_SETTLE_MS = int(os.environ.get("SA_GRID_SETTLE_MS", "300"))
+# wait_for_network_idle: no matching XHR/fetch in flight or finished for this long
+NET_IDLE_MS = int(os.environ.get("SA_NET_IDLE_MS", "300"))
+
+# attributes _score_element compares against the JSON entry (order matters for scoring)
+SCORE_ATTRS = ["type", "placeholder", "aria-label", "name", "id", "class", "title", "role"]
 
 # ---- Helpers ----------------------------------------------------------------
 
@@ -81,6 +118,669 @@ def _and(parts: Iterable[str]) -> str:
 def _wrap_unique(xpath: str, index: int) -> str:
     return f"({xpath})[{index}]"
 
+# In-page port of _query + _score_element over the whole candidate list.
+# Mirrors the Python scoring step for step (same attribute order, same float
+# additions, difflib ratio incl. autojunk) so both modes pick the same winner.
+# Returns {i: candidate index, n: 1-based element index, single: bool} or null.
+_JS_RESOLVE_RUNTIME = r"""
+const cands = arguments[0], want = arguments[1], opts = arguments[2];
+
+const norm = s => String(s == null ? '' : s).replace(/\s+/g, ' ').trim();
+
+function ratio(a, b) {
+  // difflib.SequenceMatcher(None, a, b).ratio() on code points
+  a = Array.from(a); b = Array.from(b);
+  const la = a.length, lb = b.length;
+  if (!la && !lb) return 1.0;
+  const b2j = new Map();
+  b.forEach((c, j) => { if (!b2j.has(c)) b2j.set(c, []); b2j.get(c).push(j); });
+  if (lb >= 200) {
+    const ntest = Math.floor(lb / 100) + 1;
+    for (const [c, idx] of Array.from(b2j.entries())) if (idx.length > ntest) b2j.delete(c);
+  }
+  function longest(alo, ahi, blo, bhi) {
+    let bi = alo, bj = blo, size = 0, j2len = new Map();
+    for (let i = alo; i < ahi; i++) {
+      const next = new Map();
+      for (const j of (b2j.get(a[i]) || [])) {
+        if (j < blo) continue;
+        if (j >= bhi) break;
+        const k = (j2len.get(j - 1) || 0) + 1;
+        next.set(j, k);
+        if (k > size) { bi = i - k + 1; bj = j - k + 1; size = k; }
+      }
+      j2len = next;
+    }
+    while (bi > alo && bj > blo && a[bi - 1] === b[bj - 1]) { bi--; bj--; size++; }
+    while (bi + size < ahi && bj + size < bhi && a[bi + size] === b[bj + size]) size++;
+    return [bi, bj, size];
+  }
+  let matches = 0;
+  const queue = [[0, la, 0, lb]];
+  while (queue.length) {
+    const [alo, ahi, blo, bhi] = queue.pop();
+    const [i, j, k] = longest(alo, ahi, blo, bhi);
+    if (!k) continue;
+    matches += k;
+    if (alo < i && blo < j) queue.push([alo, i, blo, j]);
+    if (i + k < ahi && j + k < bhi) queue.push([i + k, ahi, j + k, bhi]);
+  }
+  return 2.0 * matches / (la + lb);
+}
+const sim = (x, y) => ratio(norm(x).toLowerCase(), norm(y).toLowerCase());
+
+function attr(el, name) {
+  // same precedence as Selenium's get_attribute: property first, then attribute
+  const prop = name === 'class' ? 'className' : name;
+  let p;
+  try { p = el[prop]; } catch (e) {}
+  const v = (p == null || typeof p === 'object') ? el.getAttribute(name) : p;
+  return v == null ? '' : String(v);
+}
+
+function displayed(el) {
+  if (!el.isConnected) return false;
+  const st = getComputedStyle(el);
+  if (st.display === 'none' || st.visibility === 'hidden' || st.visibility === 'collapse') return false;
+  if (parseFloat(st.opacity) === 0) return false;
+  const r = el.getBoundingClientRect();
+  return r.width > 0 && r.height > 0;
+}
+
+function score(el) {
+  let s = 0.0;
+  if (opts.visibleRequired && !displayed(el)) return 0.0;
+  if (want.tag && el.tagName.toLowerCase() === want.tag.toLowerCase()) s += 0.35;
+  for (const a of opts.attrs) {
+    const w = want[a];
+    if (!w) continue;
+    const have = attr(el, a);
+    if (!have) continue;
+    if (norm(have) === norm(w)) s += 0.25;
+    else s += 0.15 * sim(have, w);
+  }
+  if (want.text) {
+    const t = sim(el.innerText || '', want.text);
+    if (t >= opts.simThreshold) s += 0.25 * t;
+  }
+  return s;
+}
+
+function query(sel) {
+  const t = sel.trim();
+  const isXpath = t.startsWith('//') || t.startsWith('(') || sel.includes('[contains(') || sel.includes('@');
+  try {
+    if (!isXpath) return Array.from(document.querySelectorAll(sel));
+    const snap = document.evaluate(sel, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    const out = [];
+    for (let i = 0; i < snap.snapshotLength; i++) {
+      const n = snap.snapshotItem(i);
+      if (n.nodeType !== 1) return [];  // find_elements rejects non-element results
+      out.push(n);
+    }
+    return out;
+  } catch (e) { return []; }
+}
+
+for (let ci = 0; ci < cands.length; ci++) {
+  const els = query(cands[ci]);
+  if (!els.length) continue;
+  const scores = els.map(score);
+  if (els.length === 1 && scores[0] > 0) return {i: ci, n: 1, single: true};
+  let best = 0, bestScore = scores[0];
+  for (let k = 1; k < scores.length; k++) if (scores[k] > bestScore) { best = k; bestScore = scores[k]; }
+  const c = cands[ci].trim();
+  if (bestScore > 0 && (c.startsWith('//') || c.startsWith('('))) return {i: ci, n: best + 1, single: false};
+}
+return null;
+"""
+
+# One poll of the selector race: the first element each selector finds (same as
+# find_element) checked against _candidate_matches_entry's guard. Returns the
+# index of the highest-priority passing selector, or -1.
+_JS_RACE_SELECTORS = r"""
+const specs = arguments[0], want = arguments[1];
+for (let i = 0; i < specs.length; i++) {
+  let el = null;
+  try {
+    el = specs[i][0] === 'xpath'
+      ? document.evaluate(specs[i][1], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue
+      : document.querySelector(specs[i][1]);
+  } catch (e) { el = null; }
+  if (!el || el.nodeType !== 1) continue;
+  if (want.tag && el.tagName.toLowerCase().trim() !== want.tag) continue;
+  if (want.col !== null && (el.getAttribute('aria-colindex') || '').trim() !== want.col) continue;
+  if (want.cls.length) {
+    const have = new Set((el.getAttribute('class') || '').split(/\s+/));
+    if (!want.cls.every(t => have.has(t))) continue;
+  }
+  return i;
+}
+return -1;
+"""
+
+# DOM generation: a per-document random id plus a MutationObserver counter.
+# Any DOM/attribute change or navigation yields a new value, so a cached miss
+# can never outlive the DOM it was observed on. null if observers are unavailable.
+_JS_GEN_INIT = r"""
+let g = window.__saDomGen;
+if (!g) {
+  g = window.__saDomGen = {id: Math.random().toString(36).slice(2), n: 0};
+  try {
+    new MutationObserver(() => { g.n++; }).observe(document,
+      {childList: true, subtree: true, characterData: true, attributes: true});
+  } catch (e) { g.n = -1; }
+}
+const gen = g.n < 0 ? null : g.id + ':' + g.n;
+"""
+
+_JS_DOM_GENERATION = _JS_GEN_INIT + "return gen;"
+
+# Presence probe for absence checks: is any of the selectors matching right now?
+_JS_PRESENCE_PROBE = _JS_GEN_INIT + r"""
+const specs = arguments[0];
+let hit = -1;
+for (let i = 0; i < specs.length && hit < 0; i++) {
+  let el = null;
+  try {
+    el = specs[i][0] === 'xpath'
+      ? document.evaluate(specs[i][1], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue
+      : document.querySelector(specs[i][1]);
+  } catch (e) { el = null; }
+  if (el && el.nodeType === 1) hit = i;
+}
+return {gen: gen, hit: hit, ready: document.readyState === 'complete'};
+"""
+
+# Async: resolve once `scope` (default body) has had no mutation for quietMs,
+# or after timeoutMs. Returns {quiet, mutations, elapsed} and detached: true
+# when the scope element itself was removed (re-rendered) while waiting.
+_JS_WAIT_DOM_QUIET = r"""
+const scope = arguments[0] || document.body || document.documentElement;
+const quietMs = arguments[1], timeoutMs = arguments[2];
+const done = arguments[arguments.length - 1];
+const t0 = performance.now();
+let last = t0, mutations = 0, tick = null;
+const obs = new MutationObserver(recs => { mutations += recs.length; last = performance.now(); });
+function finish(res) {
+  obs.disconnect();
+  clearInterval(tick);
+  res.mutations = mutations;
+  res.elapsed = Math.round(performance.now() - t0);
+  done(res);
+}
+try {
+  obs.observe(scope, {childList: true, subtree: true, characterData: true, attributes: true});
+} catch (e) { done({quiet: false, error: String(e)}); return; }
+tick = setInterval(() => {
+  const now = performance.now();
+  if (!scope.isConnected) finish({quiet: false, detached: true});
+  else if (now - last >= quietMs) finish({quiet: true});
+  else if (now - t0 >= timeoutMs) finish({quiet: false});
+}, Math.max(10, Math.min(50, quietMs / 4)));
+"""
+
+# Async: resolve once nothing matching `specs` is left in the given state.
+#   invisible - every match hidden (or none left)
+#   detached  - no match left in the DOM
+#   stale     - the first match seen at start has been removed/re-rendered
+#   auto      - invisible or stale, whichever happens first
+# Re-checked on DOM mutations and transition/animation ends (plus a coarse tick
+# for pure CSS changes). Returns {ok, elapsed, checks} and on timeout the last
+# state seen: {matches, visible, sample}.
+_JS_WAIT_GONE = r"""
+const specs = arguments[0], mode = arguments[1], timeoutMs = arguments[2], every = !!arguments[3];
+const done = arguments[arguments.length - 1];
+const t0 = performance.now();
+
+function query() {
+  const out = [];
+  for (const [kind, sel] of specs) {
+    try {
+      if (kind === 'xpath') {
+        const snap = document.evaluate(sel, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        for (let i = 0; i < snap.snapshotLength; i++) out.push(snap.snapshotItem(i));
+      } else {
+        out.push(...document.querySelectorAll(sel));
+      }
+    } catch (e) {}
+  }
+  return out.filter(el => el && el.nodeType === 1);
+}
+
+function displayed(el) {
+  if (!el.isConnected) return false;
+  const st = getComputedStyle(el);
+  if (st.display === 'none' || st.visibility === 'hidden' || st.visibility === 'collapse') return false;
+  if (parseFloat(st.opacity) === 0) return false;
+  const r = el.getBoundingClientRect();
+  return r.width > 0 && r.height > 0;
+}
+
+const initial = query()[0] || null;
+let last = null, checks = 0, finished = false, tick = null, obs = null;
+
+function state() {
+  const els = query();
+  const visible = els.filter(displayed);
+  const first = visible[0] || els[0];
+  return {
+    matches: els.length, visible: visible.length, firstVisible: els.length ? displayed(els[0]) : false,
+    initialConnected: initial ? initial.isConnected : false,
+    sample: first ? first.outerHTML.slice(0, 200) : null,
+  };
+}
+
+function satisfied(st) {
+  const stale = !initial || !initial.isConnected;
+  if (mode === 'detached') return st.matches === 0;
+  if (mode === 'stale') return stale;
+  // like EC.invisibility_of_element_located: the first match only, unless every match was asked for
+  const hidden = every ? st.visible === 0 : !st.firstVisible;
+  if (mode === 'invisible') return hidden;
+  return hidden || stale;
+}
+
+function finish(ok) {
+  if (finished) return;
+  finished = true;
+  if (obs) obs.disconnect();
+  clearInterval(tick);
+  document.removeEventListener('transitionend', check, true);
+  document.removeEventListener('animationend', check, true);
+  const res = {ok: ok, elapsed: Math.round(performance.now() - t0), checks: checks};
+  if (!ok) res.state = last;
+  done(res);
+}
+
+function check() {
+  if (finished) return;
+  checks++;
+  last = state();
+  if (satisfied(last)) finish(true);
+  else if (performance.now() - t0 >= timeoutMs) finish(false);
+}
+
+check();
+if (!finished) {
+  let queued = false;
+  obs = new MutationObserver(() => {
+    if (queued) return;
+    queued = true;
+    requestAnimationFrame(() => { queued = false; check(); });
+  });
+  obs.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+  document.addEventListener('transitionend', check, true);
+  document.addEventListener('animationend', check, true);
+  tick = setInterval(check, 250);
+}
+"""
+
+# XHR/fetch counter, installed once per document (and via CDP on every new
+# document where available, so requests made during navigation are seen too).
+# Every request gets a start seq; every completion an end counter `n`, so a
+# mark taken before an action can ask "which requests finished after it?".
+_JS_NET_INIT = r"""
+if (!window.__saNet) {
+  const net = window.__saNet = {id: Math.random().toString(36).slice(2), seq: 0, n: 0,
+                                t: performance.now(), open: {}, done: []};
+  const start = url => {
+    const id = ++net.seq;
+    net.open[id] = {url: String(url), t0: performance.now()};
+    return id;
+  };
+  const end = (id, status) => {
+    const o = net.open[id];
+    if (!o) return;
+    delete net.open[id];
+    const t1 = performance.now();
+    net.done.push({n: ++net.n, url: o.url, status: status, t1: t1, ms: Math.round(t1 - o.t0)});
+    if (net.done.length > 200) net.done.shift();
+  };
+  try {
+    const X = XMLHttpRequest.prototype, open = X.open, send = X.send;
+    X.open = function (method, url) { this.__saUrl = url; return open.apply(this, arguments); };
+    X.send = function () {
+      const id = start(this.__saUrl);
+      this.addEventListener('loadend', () => end(id, this.status), {once: true});
+      return send.apply(this, arguments);
+    };
+  } catch (e) {}
+  if (window.fetch) {
+    const f = window.fetch;
+    window.fetch = function (input) {
+      const id = start(typeof input === 'string' ? input : (input && input.url) || String(input));
+      return f.apply(this, arguments).then(r => { end(id, r.status); return r; },
+                                           e => { end(id, 0); throw e; });
+    };
+  }
+}
+"""
+
+# Network status for an optional URL regex and a mark ({id, n}) from an earlier
+# call. `quiet` is ms since the last matching request started or finished.
+_JS_NET_STATUS = _JS_NET_INIT + r"""
+const net = window.__saNet, re = arguments[0] ? new RegExp(arguments[0]) : null;
+const mark = arguments[1];
+const since = mark && mark.id === net.id ? mark.n : 0;
+const match = u => !re || re.test(u);
+const now = performance.now();
+const open = Object.values(net.open).filter(o => match(o.url));
+let last = net.t;
+for (const o of open) last = Math.max(last, o.t0);
+const done = net.done.filter(d => match(d.url));
+for (const d of done) last = Math.max(last, d.t1);
+return {
+  mark: {id: net.id, n: net.n},
+  inflight: open.map(o => o.url),
+  quiet: Math.round(now - last),
+  done: done.filter(d => d.n > since).map(d => ({url: d.url, status: d.status, ms: d.ms})),
+};
+"""
+
+# Kendo DropDownList/ComboBox/MultiSelect instance behind a host element, with
+# its bound data in display order: Angular component (ng.getComponent in dev
+# builds, else the instance found in the host's __ngContext__ LView) or jQuery
+# widget (kendo.widgetInstance). kendoList() is null when no instance is
+# reachable or the data is not complete client-side (server filtering/paging,
+# virtual, an active filter); callers then work on the rendered popup.
+_JS_KENDO_WIDGET_FN = r"""
+function kendoList(host) {
+  const root = host.closest('kendo-multiselect, kendo-dropdownlist, kendo-combobox, kendo-autocomplete, ' +
+    '.k-multiselect, .k-dropdownlist, .k-combobox, .k-dropdown, .k-picker') || host;
+
+  function get(item, field) {
+    if (item == null) return '';
+    if (typeof item !== 'object' || !field) return String(item);
+    let v = item;
+    for (const k of String(field).split('.')) v = v == null ? v : v[k];
+    return v == null ? '' : String(v);
+  }
+  function flatten(items) {
+    // groupBy() results / grouped jQuery views: {field, value, items: [...]}
+    const out = [];
+    for (const it of items || []) {
+      if (it && typeof it === 'object' && Array.isArray(it.items) && 'field' in it && 'value' in it) {
+        out.push(...flatten(it.items));
+      } else out.push(it);
+    }
+    return out;
+  }
+  function ownsRoot(cmp) {
+    for (const k of Object.keys(cmp)) {
+      const v = cmp[k];
+      if (v && typeof v === 'object' && v.nativeElement === root) return true;
+    }
+    return false;
+  }
+  const isKendoList = c => c && typeof c === 'object' && 'textField' in c && 'valueField' in c && 'data' in c;
+
+  function angular() {
+    let cmp = null;
+    try { if (window.ng && ng.getComponent) cmp = ng.getComponent(root); } catch (e) {}
+    if (!isKendoList(cmp)) {
+      cmp = null;
+      for (const el of [root, root.parentElement]) {
+        const ctx = el && el.__ngContext__;
+        if (!Array.isArray(ctx)) continue;
+        cmp = ctx.find(c => isKendoList(c) && ownsRoot(c)) || null;
+        if (cmp) break;
+      }
+    }
+    if (!cmp || !Array.isArray(cmp.data)) return null;
+    if (cmp.filterable && (cmp.text || (cmp.searchbar && cmp.searchbar.value))) return null;
+    const items = flatten(cmp.data);
+    const isDisabled = typeof cmp.itemDisabled === 'function' ? cmp.itemDisabled : null;
+    return {
+      source: 'angular', widget: cmp, root: root, items: items,
+      text: i => get(items[i], cmp.textField),
+      disabled: i => { try { return !!(isDisabled && isDisabled({dataItem: items[i], index: i})); } catch (e) { return false; } },
+    };
+  }
+
+  function jquery() {
+    const $ = window.jQuery, k = window.kendo;
+    if (!$ || !k || !k.widgetInstance) return null;
+    const el = root.matches('[data-role]') ? root : root.querySelector('[data-role]');
+    if (!el) return null;
+    let w = null;
+    try { w = k.widgetInstance($(el)); } catch (e) {}
+    if (!w || !w.dataSource) return null;
+    const ds = w.dataSource, o = ds.options || {};
+    if (o.serverFiltering || o.serverPaging || (w.options && w.options.virtual)) return null;
+    if (ds.filter && ds.filter()) return null;
+    const items = flatten(ds.view());
+    const field = w.options && w.options.dataTextField, valueField = w.options && w.options.dataValueField;
+    return {
+      source: 'jquery', widget: w, root: root, items: items,
+      text: i => get(items[i], field),
+      value: i => valueField && items[i] && typeof items[i] === 'object' ? items[i][valueField] : items[i],
+      disabled: i => false,
+    };
+  }
+
+  return angular() || jquery();
+}
+"""
+
+# Option texts from the bound data (see kendoList), disabled items only on request.
+_JS_KENDO_DATA_ITEMS = _JS_KENDO_WIDGET_FN + r"""
+const list = kendoList(arguments[0]), includeDisabled = arguments[1];
+if (!list) return null;
+const texts = [];
+list.items.forEach((_, i) => { if (includeDisabled || !list.disabled(i)) texts.push(list.text(i)); });
+return {source: list.source, texts: texts};
+"""
+
+# Direct select: index of the first enabled item matching `want` (same
+# exact/contains/startswith, case-insensitive rules as _option_rel_for_text).
+# jQuery widgets are selected through their API (+ change event); for Angular
+# only the index is returned and the caller clicks that one rendered option.
+# Returns null (no widget data), {index: -1} (no match) or {index, text, selected}.
+_JS_KENDO_DIRECT_SELECT = _JS_KENDO_WIDGET_FN + r"""
+const list = kendoList(arguments[0]), want = arguments[1], match = arguments[2], multi = arguments[3];
+if (!list) return null;
+const norm = s => String(s == null ? '' : s).replace(/\s+/g, ' ').trim().toLowerCase();
+const w = norm(want);
+let index = -1;
+for (let i = 0; i < list.items.length && index < 0; i++) {
+  if (list.disabled(i)) continue;
+  const t = norm(list.text(i));
+  if (match === 'contains' ? t.includes(w) : match === 'startswith' ? t.startsWith(w) : t === w) index = i;
+}
+if (index < 0) return {index: -1};
+const res = {index: index, text: list.text(index).trim(), selected: false};
+if (list.source === 'jquery') {
+  const wdg = list.widget;
+  try {
+    if (multi) {
+      const cur = (wdg.value() || []).slice(), v = list.value(index);
+      if (!cur.some(x => x == v)) wdg.value(cur.concat([v]));
+    } else {
+      wdg.select(index);
+    }
+    wdg.trigger('change');
+    res.selected = true;
+  } catch (e) {}
+}
+return res;
+"""
+
+# The rendered option for data index `i` inside an open listbox, scrolled into
+# view; null if it is not rendered or its text is not `want`.
+_JS_KENDO_ITEM_AT = r"""
+const lb = arguments[0], i = arguments[1], want = arguments[2];
+const norm = s => String(s == null ? '' : s).replace(/\s+/g, ' ').trim().toLowerCase();
+const scope = lb.closest('.k-animation-container, .k-popup, kendo-popup') || lb;
+let el = scope.querySelector('[data-offset-index="' + i + '"]');
+if (!el) el = Array.from(scope.querySelectorAll('li.k-list-item, li.k-item, [role="option"]'))[i] || null;
+if (!el || norm(el.textContent) !== norm(want)) return null;
+el.scrollIntoView({block: 'center'});
+return el;
+"""
+
+# State of many Kendo switches in one call. arguments[0] is [[name, selector], ...]
+# (JSON selectors, xpath or css); the state is read like kendo_switch_is_on:
+# aria-checked, input.checked, then k-switch-on/off classes. With arguments[1]
+# the click targets (thumb > track > root) of the named switches are returned.
+_JS_SWITCH_STATES = r"""
+const specs = arguments[0], targetsFor = arguments[1] || null;
+function first(sel) {
+  const s = (sel || '').trim();
+  try {
+    if (s.startsWith('/') || s.startsWith('(') || s.startsWith('./')) {
+      const r = document.evaluate(s, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+      return {el: r.snapshotLength ? r.snapshotItem(0) : null, count: r.snapshotLength};
+    }
+    const all = document.querySelectorAll(s);
+    return {el: all[0] || null, count: all.length};
+  } catch (e) { return {el: null, count: 0}; }
+}
+function switchRoot(el) {
+  return el.closest('.k-switch, kendo-switch') || el.querySelector('.k-switch, kendo-switch') || el;
+}
+function isOn(root) {
+  const nodes = [root, root.querySelector('[role="switch"]')].filter(Boolean);
+  for (const n of nodes) {
+    const a = (n.getAttribute('aria-checked') || '').toLowerCase();
+    if (a === 'true' || a === 'false') return a === 'true';
+  }
+  const inp = root.querySelector('input.k-switch-input, input[type="checkbox"]');
+  if (inp) return !!inp.checked;
+  const cls = root.classList;
+  if (cls.contains('k-switch-on') || cls.contains('k-checked')) return true;
+  if (cls.contains('k-switch-off')) return false;
+  return null;
+}
+function isDisabled(root) {
+  const inp = root.querySelector('input');
+  return root.classList.contains('k-disabled') || root.getAttribute('aria-disabled') === 'true' ||
+    root.hasAttribute('disabled') || !!(inp && inp.disabled);
+}
+const out = {};
+for (const [name, sel] of specs) {
+  const {el, count} = first(sel);
+  if (!el) { out[name] = {found: false, count: 0, on: null, disabled: false}; continue; }
+  const root = switchRoot(el);
+  out[name] = {found: true, count: count, on: isOn(root), disabled: isDisabled(root)};
+  if (targetsFor && targetsFor.includes(name)) {
+    out[name].target = root.querySelector('.k-switch-thumb, .k-switch-handle') ||
+      root.querySelector('.k-switch-track') || root;
+  }
+}
+return out;
+"""
+
+# Dots of the visible angular-calendar month view in one call: the header text
+# (arguments[0], optional xpath/css selector) and, per day cell, its day number,
+# month offset (-1 / 0 / +1 for the leading / in-month / trailing overflow days)
+# and the style of every .drug-dot. A MutationObserver on the view bumps a
+# generation counter; when arguments[1] is the token of the last read and nothing
+# in the view changed since, only {same: true} is returned.
+_JS_CALENDAR_MONTH_DOTS = r"""
+const headerSel = arguments[0], known = arguments[1];
+const view = document.querySelector('mwl-calendar-month-view');
+const cells = Array.from((view || document).querySelectorAll('mwl-calendar-month-cell'));
+if (!cells.length) return null;
+let token = null;
+if (view) {
+  if (!view.__saCalId) {
+    view.__saCalId = Math.random().toString(36).slice(2);
+    view.__saCalGen = 0;
+    new MutationObserver(() => { view.__saCalGen++; })
+      .observe(view, {subtree: true, childList: true, attributes: true, characterData: true});
+  }
+  token = view.__saCalId + ':' + view.__saCalGen;
+}
+let header = null;
+if (headerSel) {
+  let h = null;
+  try {
+    h = /^[(.]?\//.test(headerSel.trim())
+      ? document.evaluate(headerSel, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue
+      : document.querySelector(headerSel);
+  } catch (e) {}
+  header = h ? (h.innerText || h.textContent || '').trim() : null;
+}
+if (token && known === token) return {token: token, same: true, header: header};
+const firstIn = cells.findIndex(c => c.classList.contains('cal-in-month'));
+return {
+  token: token, same: false, header: header,
+  cells: cells.map((c, i) => {
+    const n = c.querySelector('.cal-day-number');
+    return {
+      day: n ? parseInt(n.textContent, 10) : null,
+      offset: c.classList.contains('cal-in-month') ? 0 : (firstIn >= 0 && i < firstIn ? -1 : 1),
+      styles: Array.from(c.querySelectorAll('.drug-dot')).map(d => (d.getAttribute('style') || '').trim()),
+    };
+  }),
+};
+"""
+
+# Cheap grid signature: row count, first/last row text, pager text and whether a
+# loading mask is up. The grid root is looked up from the selector on every call
+# (closest kendo-grid/.k-grid), so a grid re-created by a tab switch is followed.
+_JS_GRID_SIG_FN = r"""
+function gridRoot(spec) {
+  let el = null;
+  try {
+    el = spec[0] === 'xpath'
+      ? document.evaluate(spec[1], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue
+      : document.querySelector(spec[1]);
+  } catch (e) {}
+  if (!el || el.nodeType !== 1) return null;
+  return el.closest('kendo-grid, .k-grid') || el;
+}
+function gridSignature(spec) {
+  const root = gridRoot(spec);
+  if (!root) return {sig: null, rows: 0, loading: false};
+  const norm = s => (s || '').replace(/\s+/g, ' ').trim().slice(0, 120);
+  const rows = Array.from(root.querySelectorAll('tbody tr'));
+  const pager = root.querySelector('.k-pager-info');
+  const loading = !!root.querySelector('.k-loading-mask, .k-loading-panel, .k-i-loading');
+  const first = rows.length ? norm(rows[0].textContent) : '';
+  const last = rows.length ? norm(rows[rows.length - 1].textContent) : '';
+  const sig = [rows.length, first, last, pager ? norm(pager.textContent) : ''].join('\u241e');
+  return {sig: sig, rows: rows.length, loading: loading};
+}
+"""
+
+_JS_GRID_SIGNATURE = _JS_GRID_SIG_FN + "return gridSignature(arguments[0]);"
+
+# Click an enabled pager button (arguments[1] selector) of the grid; returns the
+# grid signature from just before the click, null when there is no such button
+# or it is disabled.
+_JS_GRID_GO_PAGE = _JS_GRID_SIG_FN + r"""
+const root = gridRoot(arguments[0]);
+const btn = root && root.querySelector(arguments[1]);
+if (!btn || btn.disabled || btn.classList.contains('k-disabled') || btn.getAttribute('aria-disabled') === 'true')
+  return null;
+const before = gridSignature(arguments[0]).sig;
+btn.click();
+return before;
+"""
+
+# Async: resolve once the grid signature differs from `before` (any signature
+# if before is null) and has then stayed the same, without a loading mask, for
+# settleMs. Returns {changed, settled, sig, rows, elapsed}.
+_JS_WAIT_GRID_REFRESH = _JS_GRID_SIG_FN + r"""
+const spec = arguments[0], before = arguments[1], settleMs = arguments[2], timeoutMs = arguments[3];
+const done = arguments[arguments.length - 1];
+const t0 = performance.now();
+let lastSig, since = t0, changed = before === null;
+const tick = setInterval(() => {
+  const now = performance.now();
+  const st = gridSignature(spec);
+  if (st.sig !== lastSig) { lastSig = st.sig; since = now; }
+  if (st.sig !== null && st.sig !== before) changed = true;
+  const settled = st.sig !== null && !st.loading && now - since >= settleMs;
+  if ((changed && settled) || now - t0 >= timeoutMs) {
+    clearInterval(tick);
+    done({changed: changed, settled: settled, sig: st.sig, rows: st.rows, elapsed: Math.round(now - t0)});
+  }
+}, 50);
+"""
+
 # ---- Core -------------------------------------------------------------------
 
 class BasePage:
@@ -106,12 +806,19 @@ class BasePage:
     }
     """
     _resolved_cache: Dict[Tuple[str, str], str] = {}
+    race_stats: Dict[str, float] = {"races": 0, "saved_seconds": 0.0}
+    # (page, logical_name, strict, probe) -> (DOM generation, monotonic time) of a confirmed miss;
+    # probe=True entries come from _known_absent (no healing) and are never read by resolve()
+    _absent_cache: Dict[Tuple[str, str, bool, bool], Tuple[str, float]] = {}
 
     def __init__(self, sb, page_name: Optional[str] = None):
         self.sb = sb
         self.driver = sb.driver
         self.page_name = page_name
         self.locators = self._load_page_locators(page_name) if page_name else {}
+        self._install_network_probe()
+        self._scope_roots: Dict[str, Any] = {}  # within= logical name -> container element (see _lookup)
+        self._cal_memo: Optional[Dict[str, Any]] = None  # last calendar month read (see _calendar_month_snapshot)
 
         self.configure_tesseract()
     # ----------------- Locator loading & persistence -------------------------
@@ -132,27 +839,9 @@ class BasePage:
         base = self._healed_dir() if healed else self._locators_dir()
         return os.path.join(base, f"{page}.json")
 
-    def _load_page_locators(self, page_name: str) -> Dict[str, Any]:
-        raw_path = self._page_json_path(page_name, healed=False)
-        healed_path = self._page_json_path(page_name, healed=True)
-
-        if not os.path.exists(raw_path):
-            raise FileNotFoundError(f"Locator file not found: {raw_path}")
-
-        with open(raw_path, "r", encoding="utf-8") as f:
-            base = json.load(f)
-
-        if os.path.exists(healed_path):
-            with open(healed_path, "r", encoding="utf-8") as f:
-                healed = json.load(f)
-            # Deep-merge each locator so we KEEP tag/class/aria-colindex from base
-            for k, v in healed.items():
-                if isinstance(v, dict) and isinstance(base.get(k), dict):
-                    base[k] = {**base[k], **v}
-                else:
-                    base[k] = v
-
-        return base
+    def _load_page_locators(self, page_name: str) -> Mapping[str, Any]:
+        # Shared, read-only view per page; re-read only when base/healed JSON changes
+        return get_locator_registry().get(page_name)
 
     # add near the top of the class (utilities section)
 
@@ -176,35 +865,80 @@ class BasePage:
         return self._by_tuple(sel)
 
     def _find_unique_in(self, root, by, value, *, logical_name: str, timeout: int = 6):
-        """Find exactly ONE match under the given root; raise if 0 or >1."""
-        import time
+        """
+        Find exactly ONE match under the given root; raise if 0 or >1.
+
+        Polls with a growing interval (UNIQUE_POLL_MIN..UNIQUE_POLL_MAX). The same
+        set of several matches staying unchanged for AMBIGUOUS_STABLE seconds is
+        reported right away instead of after the full timeout.
+        """
         end = time.monotonic() + timeout
-        last = []
-        while time.monotonic() < end:
-            els = (root if hasattr(root, "find_elements") else self.driver).find_elements(by, value)
-            last = els
+        finder = root if hasattr(root, "find_elements") else self.driver
+        last, last_ids, stable_since = [], None, None
+        delay = UNIQUE_POLL_MIN
+        while True:
+            els = finder.find_elements(by, value)
             if len(els) == 1:
                 return els[0]
-            time.sleep(0.1)
+            now = time.monotonic()
+            ids = tuple(getattr(e, "id", None) for e in els)
+            if ids != last_ids:
+                last_ids, stable_since, delay = ids, now, UNIQUE_POLL_MIN
+            last = els
+            if len(els) > 1 and now - stable_since >= AMBIGUOUS_STABLE:
+                break
+            if now >= end:
+                break
+            time.sleep(min(delay, max(0.0, end - now)))
+            delay = min(delay * 1.5, UNIQUE_POLL_MAX)
         raise AssertionError(
             f"Locator for '{logical_name}' matched {len(last)} elements under scope (wanted 1): {by}={value}"
+            + self._describe_matches(last)
             )
 
+    def _describe_matches(self, els, limit: int = 5) -> str:
+        """One-round-trip summary of the first matches, for ambiguity errors."""
+        if not els:
+            return ""
+        try:
+            snaps = snapshot(self.driver, els[:limit], ["id", "class", "aria-label"])
+        except Exception:
+            return ""
+        lines = []
+        for i, snap in enumerate(snaps, 1):
+            if not snap:
+                continue
+            a = snap["attrs"]
+            desc = snap["tag"] + "".join(f" {k}={a[k]!r}" for k in ("id", "class", "aria-label") if a.get(k))
+            lines.append(f"\n  [{i}] {desc} displayed={snap['displayed']} text={_norm(snap['text'])[:60]!r}")
+        more = f"\n  ... and {len(els) - limit} more" if len(els) > limit else ""
+        return "".join(lines) + more
+
     def _lookup(self, logical_name: str, *, within=None, strict: bool = False, timeout: int = 6):
         """
         Resolve logical_name to a unique WebElement.
           within: None | WebElement | logical name of a container
           strict: bypass/limit healing to avoid cross-widget jumps
+
+        A logical-name scope is found once and reused by later lookups in it until
+        it goes stale.
         """
         by, value = self._resolve_selector(logical_name, strict=strict)
         # decide scope root
         if within is None:
-            root = self.driver
-        elif hasattr(within, "tag_name"):
-            root = within
-        else:
-            w_by, w_val = self._resolve_selector(within, strict=True)
-            root = self._find_unique_in(self.driver, w_by, w_val, logical_name=f"{within} (scope)", timeout=timeout)
+            return self._find_unique_in(self.driver, by, value, logical_name=logical_name, timeout=timeout)
+        if hasattr(within, "tag_name"):
+            return self._find_unique_in(within, by, value, logical_name=logical_name, timeout=timeout)
+        roots = self._scope_roots
+        root = roots.get(within)
+        if root is not None:
+            try:
+                return self._find_unique_in(root, by, value, logical_name=logical_name, timeout=timeout)
+            except StaleElementReferenceException:
+                roots.pop(within, None)
+        w_by, w_val = self._resolve_selector(within, strict=True)
+        root = roots[within] = self._find_unique_in(self.driver, w_by, w_val,
+                                                    logical_name=f"{within} (scope)", timeout=timeout)
         return self._find_unique_in(root, by, value, logical_name=logical_name, timeout=timeout)
 
     def _healed_path(self, page_name: str) -> str:
@@ -212,42 +946,41 @@ class BasePage:
         return self._page_json_path(page_name, healed=True)
 
     def _load_healed_page(self, page_name: str) -> dict:
-        path = self._healed_path(page_name)
-        if not os.path.exists(path):
-            return {}
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                return json.load(f) or {}
-        except Exception:
-            return {}
+        journal = get_heal_journal()
+        if journal is not None:
+            return journal.effective_healed(page_name)
+        return read_healed(page_name)
 
     def _save_healed_page(self, page_name: str, data: dict) -> None:
-        path = self._healed_path(page_name)
-        if not data:
-            with contextlib.suppress(Exception):
-                os.remove(path)
-            return
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        write_healed(page_name, data)
 
     def unheal(self, logical_name: str) -> bool:
         """Remove a healed locator for the current page & clear caches (safe even if no in-mem store)."""
         page = self.page_name
         healed = self._load_healed_page(page)
         if logical_name in healed:
-            healed.pop(logical_name, None)
-            self._save_healed_page(page, healed)
+            journal = get_heal_journal()
+            if journal is not None:
+                # applied to self_healed/<page>.json when the session compacts the journals
+                journal.append("unheal", page, logical_name)
+            else:
+                healed.pop(logical_name, None)
+                self._save_healed_page(page, healed)
             # clear caches (both tuple and plain key styles)
             try:
                 self._resolved_cache.pop((page or "", logical_name), None)
                 self._resolved_cache.pop(logical_name, None)
             except Exception:
                 pass
+            disk = get_cache()
+            if disk is not None:
+                disk.forget(page or "", logical_name)
             return True
         return False
 
-    # replace your _looks_generic_xpath(...) with a bound method (or @staticmethod) and call it correctly
-    def _looks_generic_xpath(self, xp: str) -> bool:
+    # staticmethod so offline tools (locator_optimizer) can call it without a page instance
+    @staticmethod
+    def _looks_generic_xpath(xp: str) -> bool:
         s = (xp or "").strip()
         # //tag or //tag[1]
         if re.fullmatch(r"//\w+(\[\d+\])?", s):
@@ -259,6 +992,7 @@ class BasePage:
                 return True
         return False
 
+    @traced("runtime")
     def _resolve_runtime(self, logical_name: str, entry: Dict[str, Any]) -> str:
         cands = list(self._candidates_for(entry))
         # If JSON already had an explicit selector, push class-only guesses to the back
@@ -267,17 +1001,53 @@ class BasePage:
             strong = [c for c in cands if not self._looks_generic_xpath(c)]
             cands = strong + generic
 
+        if RESOLVER_MODE == "js":
+            try:
+                healed = self._resolve_runtime_js(cands, entry)
+            except Exception as e:
+                # CSP / script errors: fall back to the WebDriver scoring below
+                print(f"[resolve] in-page resolver failed for '{logical_name}' ({e}); using Python scoring")
+            else:
+                if RESOLVER_PARITY_CHECK:
+                    reference = self._resolve_runtime_py(cands, entry)
+                    if reference != healed:
+                        print(f"[resolve] JS/Python mismatch for '{logical_name}': js={healed!r} py={reference!r}")
+                if healed:
+                    return healed
+                raise Exception(f"No working locator found for '{logical_name}' on page '{self.page_name}'")
+
+        healed = self._resolve_runtime_py(cands, entry)
+        if healed:
+            return healed
+        raise Exception(f"No working locator found for '{logical_name}' on page '{self.page_name}'")
+
+    def _resolve_runtime_py(self, cands: List[str], entry: Dict[str, Any]) -> Optional[str]:
+        """Reference scoring in Python: one snapshot per candidate, scored with difflib."""
         for cand in cands:
             elems = self._query(cand)
             if not elems:
                 continue
-            if len(elems) == 1 and self._score_element(elems[0], entry) > 0:
+            try:
+                snaps = self.snapshot_elements(elems, SCORE_ATTRS)
+            except StaleElementReferenceException:
+                continue
+            if len(snaps) == 1 and self._score_snapshot(snaps[0], entry) > 0:
                 return cand
-            scores = [(i + 1, self._score_element(e, entry)) for i, e in enumerate(elems)]
+            scores = [(i + 1, self._score_snapshot(sn, entry)) for i, sn in enumerate(snaps)]
             best_index, best_score = max(scores, key=lambda t: t[1]) if scores else (None, 0)
             if best_index and best_score > 0 and (cand.strip().startswith("//") or cand.strip().startswith("(")):
                 return _wrap_unique(cand, best_index)
-        raise Exception(f"No working locator found for '{logical_name}' on page '{self.page_name}'")
+        return None
+
+    def _resolve_runtime_js(self, cands: List[str], entry: Dict[str, Any]) -> Optional[str]:
+        """Same walk as _resolve_runtime_py, evaluated and scored in the browser in one round-trip."""
+        want = {a: str(entry[a]) for a in ["tag", "text", *SCORE_ATTRS] if entry.get(a)}
+        opts = {"attrs": SCORE_ATTRS, "simThreshold": SIM_THRESHOLD, "visibleRequired": VISIBLE_REQUIRED}
+        hit = self.driver.execute_script(_JS_RESOLVE_RUNTIME, cands, want, opts)
+        if not hit:
+            return None
+        cand = cands[int(hit["i"])]
+        return cand if hit.get("single") else _wrap_unique(cand, int(hit["n"]))
 
     def unheal_all(self, *logical_names: str) -> None:
         for name in logical_names:
@@ -294,46 +1064,49 @@ class BasePage:
         if is_xpath and self._looks_generic_xpath(s):
             return
 
-        healed = self._load_healed_page(self.page_name)
-        entry = dict(healed.get(logical_name, {}))
-
-        # keep alternates (dedup, cap)
-        alts = list(dict.fromkeys([s] + entry.get("alternates", [])))[:10]
-        entry["alternates"] = alts
-        # store under the right key (prefer xpath; resolve() already tries xpath then css)
-        if is_xpath:
-            entry["xpath"] = s
-            entry.pop("css", None)
-        else:
-            entry["css"] = s
-            entry.pop("xpath", None)
+        journal = get_heal_journal()
+        if journal is not None:
+            # alternates re-persist on every hit; skip records that would change nothing
+            pending = [r for r in journal.pending(self.page_name) if r["name"] == logical_name]
+            if not (pending and pending[-1]["op"] == "heal" and pending[-1]["selector"] == s):
+                journal.append("heal", self.page_name, logical_name, s)
+            return
 
-        healed[logical_name] = entry
+        healed = self._load_healed_page(self.page_name)
+        apply_heal(healed, logical_name, s)
         self._save_healed_page(self.page_name, healed)
 
     # ----------------- Candidate generation ----------------------------------
 
     def _class_has_tokens(self, el, needed: str) -> bool:
+        """`el` is a WebElement or a snapshot_elements() dict."""
         if not needed: return True
-        have = (el.get_attribute("class") or "")
+        snap = el if isinstance(el, dict) else self._snapshot_one(el, ["class"])
+        have = ((snap or {}).get("attrs", {}).get("class") or "")
         have_tokens = set(have.split())
         need_tokens = [t for t in needed.split() if t]
         return all(t in have_tokens for t in need_tokens)
 
     def _candidate_matches_entry(self, el, entry: dict) -> bool:
         """Hard-guard: ensure found element matches key JSON attributes."""
-        # tag guard
         tag = (entry.get("tag") or "").lower().strip()
-        if tag and (el.tag_name or "").lower().strip() != tag:
+        col = entry.get("aria-colindex")
+        cls = entry.get("class") or ""
+        if not (tag or col is not None or cls):
+            return True
+        # one round-trip for all guards instead of tag_name + get_attribute per check
+        snap = el if isinstance(el, dict) else self._snapshot_one(el, ["aria-colindex", "class"])
+        if snap is None:
+            return False
+        # tag guard
+        if tag and (snap["tag"] or "").lower().strip() != tag:
             return False
         # aria-colindex guard
-        col = entry.get("aria-colindex")
         if col is not None:
-            if (el.get_attribute("aria-colindex") or "").strip() != str(col):
+            if (snap["attrs"].get("aria-colindex") or "").strip() != str(col):
                 return False
         # class tokens guard – ONLY for table-ish cells where we really care
-        cls = entry.get("class") or ""
-        if cls and not self._class_has_tokens(el, cls):
+        if cls and not self._class_has_tokens(snap, cls):
             return False
         return True
 
@@ -349,6 +1122,7 @@ class BasePage:
         # default to XPATH
         return (By.XPATH, sel)
 
+    @traced("try")
     def _try_selector(self, sel: str, entry: dict, timeout: int):
         """Return selector if it finds a matching element that passes attribute guard."""
         from selenium.webdriver.support.ui import WebDriverWait
@@ -457,34 +1231,54 @@ class BasePage:
     # ----------------- Resolution & scoring ----------------------------------
 
     def _score_element(self, el, entry: Dict[str, Any]) -> float:
-        score = 0.0
         try:
-            if VISIBLE_REQUIRED and not el.is_displayed():
-                return 0.0
-            tag = (el.tag_name or "").lower()
-            if entry.get("tag") and tag == (entry["tag"] or "").lower():
-                score += 0.35
-            for a in ["type", "placeholder", "aria-label", "name", "id", "class", "title", "role"]:
-                want = entry.get(a)
-                if not want:
-                    continue
-                have = (el.get_attribute(a) or "")
-                if not have:
-                    continue
-                # stronger credit for exact match, some credit for fuzzy
-                if _norm(have) == _norm(want):
-                    score += 0.25
-                else:
-                    score += 0.15 * _sim(have, want)
-            # visible text heuristic for non-inputs
-            if entry.get("text"):
-                text_sim = _sim(el.text or "", entry["text"])
-                if text_sim >= SIM_THRESHOLD:
-                    score += 0.25 * text_sim
+            return self._score_snapshot(self._snapshot_one(el, SCORE_ATTRS), entry)
         except StaleElementReferenceException:
             return 0.0
+
+    def _score_snapshot(self, snap: Optional[Dict[str, Any]], entry: Dict[str, Any]) -> float:
+        score = 0.0
+        if not snap:
+            return 0.0
+        if VISIBLE_REQUIRED and not snap["displayed"]:
+            return 0.0
+        tag = (snap["tag"] or "").lower()
+        if entry.get("tag") and tag == (entry["tag"] or "").lower():
+            score += 0.35
+        for a in SCORE_ATTRS:
+            want = entry.get(a)
+            if not want:
+                continue
+            have = (snap["attrs"].get(a) or "")
+            if not have:
+                continue
+            # stronger credit for exact match, some credit for fuzzy
+            if _norm(have) == _norm(want):
+                score += 0.25
+            else:
+                score += 0.15 * _sim(have, want)
+        # visible text heuristic for non-inputs
+        if entry.get("text"):
+            text_sim = _sim(snap["text"] or "", entry["text"])
+            if text_sim >= SIM_THRESHOLD:
+                score += 0.25 * text_sim
         return score
 
+    # ---------- Bulk element snapshots --------------------------------------
+
+    def snapshot_elements(self, target, attrs: Iterable[str] = (), props: Iterable[str] = (),
+                          within=None) -> List[Optional[Dict[str, Any]]]:
+        """
+        tag/text/displayed/rect plus `attrs` (get_attribute semantics) and `props`
+        for every element in one execute_script. `target` is a list of WebElements
+        or an XPath/CSS selector, evaluated under `within` (a WebElement) if given.
+        """
+        return snapshot(self.driver, target, attrs, props, scope=within)
+
+    def _snapshot_one(self, el, attrs: Iterable[str] = ()) -> Optional[Dict[str, Any]]:
+        snaps = self.snapshot_elements([el], attrs)
+        return snaps[0] if snaps else None
+
     def _query(self, selector: str) -> List:
         # Accept both XPath and CSS
         is_xpath = selector.strip().startswith(("//", "(")) or "[contains(" in selector or "@" in selector
@@ -515,47 +1309,227 @@ class BasePage:
         WebDriverWait(self.driver, timeout).until(EC.presence_of_element_located((by, s)))
         return self.driver.find_element(by, s)
 
+    def _dom_fingerprint(self) -> Optional[str]:
+        """Structural hash of the current view (route + top-level containers); None if unavailable."""
+        try:
+            return self.driver.execute_script(JS_DOM_FINGERPRINT) or None
+        except Exception:
+            return None
+
+    @traced("race")
+    def _race_selectors(self, logical_name: str, sels: List[str], entry: Dict[str, Any],
+                        timeout: int, has_explicit: bool = True) -> Optional[int]:
+        """
+        Index of the highest-priority selector in `sels` that finds a guarded match, or None.
+
+        All selectors are checked together in one execute_script per poll, so a
+        stale explicit selector no longer costs its full timeout before the
+        alternates are even tried. Once a lower tier matches, higher tiers get
+        RACE_GRACE seconds to show up before it wins.
+        """
+        budgets = ([min(timeout, EXPLICIT_TIMEOUT)] if has_explicit else []) + \
+            [ALTERNATE_TIMEOUT] * (len(sels) - (1 if has_explicit else 0))
+        if not RESOLVE_RACE:
+            return self._sequential_selectors(sels, entry, budgets)
+
+        specs = [["xpath" if by == By.XPATH else "css", value]
+                 for by, value in (self._selector_to_by(sel) for sel in sels)]
+        col = entry.get("aria-colindex")
+        want = {"tag": (entry.get("tag") or "").lower().strip(),
+                "col": None if col is None else str(col),
+                "cls": [t for t in (entry.get("class") or "").split() if t]}
+
+        started = time.monotonic()
+        deadline = started + min(timeout, RACE_DEADLINE)
+        settle_until = None
+        best = -1
+        while True:
+            try:
+                best = int(self.driver.execute_script(_JS_RACE_SELECTORS, specs, want))
+            except Exception as e:
+                print(f"[resolve] selector race failed for '{logical_name}' ({e}); trying tiers one by one")
+                return self._sequential_selectors(sels, entry, budgets)
+            now = time.monotonic()
+            if best == 0:
+                break
+            if best > 0:
+                settle_until = settle_until or now + RACE_GRACE
+                if now >= settle_until:
+                    break
+            if now >= deadline:
+                break
+            time.sleep(RACE_POLL)
+
+        # what the one-by-one walk would have spent: full budget for every tier that lost
+        elapsed = time.monotonic() - started
+        lost = budgets[:best] if best >= 0 else budgets
+        saved = max(0.0, sum(lost) - elapsed) if lost else 0.0
+        BasePage.race_stats["races"] += 1
+        BasePage.race_stats["saved_seconds"] += saved
+        if saved >= 0.05:
+            tier = "none" if best < 0 else ("explicit" if best == 0 and has_explicit else f"alternate #{best}")
+            print(f"[resolve] '{logical_name}' -> {tier} in {elapsed:.2f}s "
+                  f"(sequential ≈ {sum(lost):.1f}s, saved {saved:.1f}s)")
+        return best if best >= 0 else None
+
+    def _sequential_selectors(self, sels: List[str], entry: Dict[str, Any], budgets: List[float]) -> Optional[int]:
+        """The original walk: each tier gets its own _try_selector timeout in turn."""
+        for i, (sel, budget) in enumerate(zip(sels, budgets)):
+            if self._try_selector(sel, entry, timeout=budget):
+                return i
+        return None
+
+    # ---------- Negative cache & fast absence probes ----------------------
+
+    def _dom_generation(self) -> Optional[str]:
+        try:
+            return self.driver.execute_script(_JS_DOM_GENERATION)
+        except Exception:
+            return None
+
+    def _probe_selectors(self, logical_name: str, strict: bool = False) -> List[str]:
+        """Selectors already known for logical_name: the last resolution, explicit, and (non-strict) alternates."""
+        entry = self.locators.get(logical_name) or {}
+        sels = [entry.get("xpath"), entry.get("css")]
+        if not strict:
+            sels = [self._resolved_cache.get((self.page_name or "", logical_name))] + sels + \
+                list(entry.get("alternates", []))
+        return list(dict.fromkeys(s for s in sels if s))
+
+    def _mark_absent(self, logical_name: str, gen: Optional[str], strict: bool = False,
+                     probe: bool = False) -> None:
+        if gen:
+            self._absent_cache[(self.page_name or "", logical_name, strict, probe)] = (gen, time.monotonic())
+
+    def _cached_absent(self, logical_name: str, strict: bool = False, gen: Optional[str] = None,
+                       probe: bool = False) -> bool:
+        """
+        True if logical_name was confirmed missing in the current DOM generation:
+        by a failed healing pass (probe=False), or by a known-selector probe (probe=True).
+        """
+        key = (self.page_name or "", logical_name, strict, probe)
+        hit = self._absent_cache.get(key)
+        if not hit:
+            return False
+        if time.monotonic() - hit[1] <= NEGATIVE_TTL and hit[0] == (gen or self._dom_generation()):
+            return True
+        self._absent_cache.pop(key, None)
+        return False
+
+    def _known_absent(self, logical_name: str, strict: bool = False, timeout: float = 0) -> bool:
+        """
+        Fast absence check without candidate healing. With timeout=0 the miss is
+        confirmed once the page is loaded and its DOM has been unchanged for
+        ABSENCE_QUIET seconds, so elements still being rendered are not reported
+        missing; a DOM that keeps changing gets an answer after ABSENCE_QUIET plus
+        one poll, without caching it. With a timeout, the miss is confirmed after it.
+        False means "possibly present" and callers continue with their normal path.
+        Misses are cached under probe keys only: resolve() still heals afterwards.
+        """
+        specs = [["xpath" if by == By.XPATH else "css", value]
+                 for by, value in (self._selector_to_by(sel) for sel in self._probe_selectors(logical_name, strict))]
+        if not specs:
+            return False
+        start = time.monotonic()
+        end = start + (timeout if timeout > 0 else ABSENCE_QUIET + RACE_POLL)
+        last_gen, quiet_since = None, start
+        while True:
+            try:
+                res = self.driver.execute_script(_JS_PRESENCE_PROBE, specs) or {}
+            except Exception:
+                return False
+            if int(res.get("hit", -1)) >= 0:
+                return False
+            now = time.monotonic()
+            gen = res.get("gen")
+            if timeout <= 0 and last_gen is None and gen is not None and (
+                    self._cached_absent(logical_name, strict, gen=gen, probe=True)
+                    or self._cached_absent(logical_name, strict, gen=gen)):
+                return True  # already confirmed in this DOM generation
+            if gen != last_gen or not res.get("ready"):
+                last_gen, quiet_since = gen, now
+            settled = timeout <= 0 and gen is not None and now - quiet_since >= ABSENCE_QUIET
+            if settled or (timeout > 0 and now >= end):
+                self._mark_absent(logical_name, gen, strict, probe=True)
+                return True
+            if now >= end:
+                return True  # DOM still changing: absent right now, not cached
+            time.sleep(RACE_POLL)
+
+    def _remember(self, key, selector: str, tier: str, started: float, disk_key=None) -> str:
+        """Store a resolution in the process cache and, when enabled, the on-disk cache."""
+        self._resolved_cache[key] = selector
+        note_tier(tier)
+        for strict in (False, True):
+            for probe in (False, True):
+                self._absent_cache.pop((key[0], key[1], strict, probe), None)
+        disk = get_cache()
+        if disk is not None and disk_key:
+            fingerprint, entry_sig = disk_key
+            disk.put(key[0], key[1], fingerprint, entry_sig, selector, tier, time.monotonic() - started)
+        return selector
+
+    @traced("resolve")
     def resolve(self, logical_name: str, timeout: int = PRIMARY_TIMEOUT) -> str:
         key = (self.page_name or "", logical_name)
         if key in self._resolved_cache:
+            note_tier("memory")
             return self._resolved_cache[key]
 
         entry = self.locators.get(logical_name)
         if not entry:
             raise KeyError(f"Locator '{logical_name}' not found in {self.page_name}")
+        if self._cached_absent(logical_name):
+            note_tier("cached-miss")
+            raise Exception(f"No working locator found for '{logical_name}' on page '{self.page_name}' "
+                            f"(cached miss, DOM unchanged)")
+
+        started = time.monotonic()
+
+        # 0) Persistent cache, valid only for the same DOM fingerprint + JSON entry
+        disk, disk_key = get_cache(), None
+        if disk is not None:
+            fingerprint = self._dom_fingerprint()
+            if fingerprint:
+                disk_key = (fingerprint, entry_signature(entry))
+                hit = disk.get(key[0], logical_name, *disk_key)
+                if hit:
+                    if self._try_selector(hit["selector"], entry, timeout=2):
+                        self._resolved_cache[key] = hit["selector"]
+                        disk.record_saving(hit["cost"] - (time.monotonic() - started))
+                        note_tier("disk")
+                        return hit["selector"]
+                    disk.forget(key[0], logical_name)
 
         # 1) HARD preference for explicit selectors from JSON
-        # 1) HARD preference for explicit selectors from JSON (attribute-guarded)
+        # 2) then alternates — both attribute-guarded, raced under one deadline
         explicit = entry.get("xpath") or entry.get("css")
-        if explicit:
-            quick = min(timeout, 8)
-            ok = self._try_selector(explicit, entry, timeout=quick)
-            if ok:
-                self._resolved_cache[key] = explicit
-                return explicit
-            # else fall through to alternates / healing
-
-        # 2) Alternates (if any) — also attribute-guarded
-        for alt in entry.get("alternates", []):
-            ok = self._try_selector(alt, entry, timeout=3)
-            if ok:
-                self._resolved_cache[key] = alt
+        tiers = ([explicit] if explicit else []) + [a for a in entry.get("alternates", []) if a != explicit]
+        if tiers:
+            won = self._race_selectors(logical_name, tiers, entry, timeout, has_explicit=bool(explicit))
+            if won is not None:
+                if won == 0 and explicit:
+                    return self._remember(key, explicit, "explicit", started, disk_key)
                 if PERSIST_HEALED:
-                    self._persist_healed(logical_name, alt)
-                return alt
+                    self._persist_healed(logical_name, tiers[won])
+                return self._remember(key, tiers[won], "alternate", started, disk_key)
 
         # 3) Self-healing
-        healed = self._resolve_runtime(logical_name, entry)
         try:
-            self.sb.wait_for_element(healed, timeout=timeout)
+            healed = self._resolve_runtime(logical_name, entry)
+            try:
+                self.sb.wait_for_element(healed, timeout=timeout)
+            except Exception:
+                WebDriverWait(self.driver, timeout).until(
+                    EC.presence_of_element_located((By.XPATH, healed))
+                    )
         except Exception:
-            WebDriverWait(self.driver, timeout).until(
-                EC.presence_of_element_located((By.XPATH, healed))
-                )
-        self._resolved_cache[key] = healed
+            # remember the miss until the DOM changes, so repeated probes don't re-heal
+            self._mark_absent(logical_name, self._dom_generation())
+            raise
         if PERSIST_HEALED:
             self._persist_healed(logical_name, healed)
-        return healed
+        return self._remember(key, healed, "healed", started, disk_key)
 
     # ----------------- Public actions (compatible API) -----------------------
     def convert_date(self, date_str: str) -> str:
@@ -569,19 +1543,44 @@ class BasePage:
                 continue
         raise ValueError(f"Date format not recognized: {date_str}")
 
+    @contextlib.contextmanager
+    def _appearance(self, logical_name: str, timeout: float):
+        """
+        Time resolve + wait for logical_name and record it in the latency store;
+        yields the timeout to use (history-derived when SA_ADAPTIVE_TIMEOUTS=on).
+        """
+        store = get_latency_store()
+        if store is None:
+            yield timeout
+            return
+        page = self.page_name or ""
+        budget = store.timeout_for(page, logical_name, timeout)
+        started = time.monotonic()
+        try:
+            yield budget
+        except Exception:
+            store.record(page, logical_name, time.monotonic() - started, False, timeout, budget)
+            if budget < timeout:
+                print(f"[adaptive-timeouts] {page}/{logical_name}: gave up after learned {budget:.1f}s "
+                      f"(configured {timeout}s)")
+            raise
+        store.record(page, logical_name, time.monotonic() - started, True, timeout, budget)
+
     def wait_for_element(self, logical_name: str, timeout: int = CLICK_TIMEOUT, strict: bool = False):
-        sel = self.resolve_strict(logical_name) if strict else self.resolve(logical_name)
-        self.sb.wait_for_element(sel, timeout=timeout)
+        with self._appearance(logical_name, timeout) as timeout:
+            sel = self.resolve_strict(logical_name) if strict else self.resolve(logical_name)
+            self.sb.wait_for_element(sel, timeout=timeout)
 
     def wait_for_element_rendered(self, logical_name: str, timeout: int = 15, **params):
         xp = self.render_xpath(logical_name, **params)
         self.sb.wait_for_element(xp, timeout=timeout)
 
     def wait_for_text(self, text: str, logical_name: str, timeout: int = CLICK_TIMEOUT, strict: bool = False):
-        sel = self.resolve_strict(logical_name) if strict else self.resolve(logical_name)
+        with self._appearance(logical_name, timeout) as budget:
+            sel = self.resolve_strict(logical_name) if strict else self.resolve(logical_name)
+            self.sb.wait_for_element_present(sel, timeout=budget)
+            self.sb.wait_for_element_visible(sel, timeout=budget)
         text = text.strip()
-        self.sb.wait_for_element_present(sel, timeout=timeout)
-        self.sb.wait_for_element_visible(sel, timeout=timeout)
         self.sb.wait_for_text(text, sel, timeout=timeout)
 
     def find_elements(self, logical_name: str, timeout: int = CLICK_TIMEOUT):
@@ -626,11 +1625,12 @@ class BasePage:
         time.sleep(5)
 
     def click(self, logical_name: str, timeout: int = CLICK_TIMEOUT, strict: bool = False):
-        if strict == False:
-            sel = self.resolve(logical_name)
-        else:
-            sel = self.resolve_strict(logical_name)
-        self.sb.wait_for_element_clickable(sel, timeout=timeout)
+        with self._appearance(logical_name, timeout) as timeout:
+            if strict == False:
+                sel = self.resolve(logical_name)
+            else:
+                sel = self.resolve_strict(logical_name)
+            self.sb.wait_for_element_clickable(sel, timeout=timeout)
         self.sb.highlight(sel)
         self.sb.click(sel)
 
@@ -639,11 +1639,12 @@ class BasePage:
         self.wait_for_page_to_load()
 
     def type(self, logical_name: str, value: str, timeout: int = CLICK_TIMEOUT, strict=False):
-        if strict == False:
-            sel = self.resolve(logical_name)
-        else:
-            sel = self.resolve_strict(logical_name)
-        self.sb.wait_for_element(sel, timeout=timeout)
+        with self._appearance(logical_name, timeout) as timeout:
+            if strict == False:
+                sel = self.resolve(logical_name)
+            else:
+                sel = self.resolve_strict(logical_name)
+            self.sb.wait_for_element(sel, timeout=timeout)
         # self.sb.highlight(sel)
         self.sb.type(sel, value)
 
@@ -652,6 +1653,7 @@ class BasePage:
         for i in range(idle_time // 60):
             time.sleep(60)
             print(f"   ... {i + 1} minute(s) passed")
+        time.sleep(idle_time % 60)
 
     def type_and_trigger(self, logical_name: str, text: str, *,
                          timeout: int = 15, blur: bool = True, clear_first: bool = True, strict: bool = False):
@@ -717,8 +1719,15 @@ class BasePage:
         return self.sb.execute_script("return arguments[0].textContent;", el).strip()
 
 
-    def is_element_present(self, logical_name: str, strict: bool = False, timeout: int = 0) -> bool:
+    def is_element_present(self, logical_name: str, strict: bool = False, timeout: int = 0,
+                           expect_absent: bool = False) -> bool:
+        """
+        expect_absent=True is for negative assertions: a miss of every known
+        selector answers False at once, without healing (see _known_absent).
+        """
         try:
+            if expect_absent and FAST_ABSENCE and self._known_absent(logical_name, strict=strict, timeout=timeout):
+                return False
             locator = self.resolve_strict(logical_name) if strict else self.resolve(logical_name)
 
             if not locator:
@@ -734,8 +1743,10 @@ class BasePage:
         except Exception:
             return False
 
-    def is_element_visible(self, logical_name: str, strict: bool = False) -> bool:
+    def is_element_visible(self, logical_name: str, strict: bool = False, expect_absent: bool = False) -> bool:
         try:
+            if expect_absent and FAST_ABSENCE and self._known_absent(logical_name, strict=strict):
+                return False
             sel = self.resolve_strict(logical_name) if strict else self.resolve(logical_name)
             return self.sb.is_element_visible(sel)
         except Exception:
@@ -752,8 +1763,10 @@ class BasePage:
         sel = self.resolve(logical_name)
         self.sb.select_option_by_text(sel, option_text)
 
-    def element_exists(self, logical_name: str) -> bool:
+    def element_exists(self, logical_name: str, expect_absent: bool = False) -> bool:
         try:
+            if expect_absent and FAST_ABSENCE and self._known_absent(logical_name):
+                return False
             sel = self.resolve(logical_name)
             return self.sb.is_element_present(sel)
         except Exception:
@@ -765,6 +1778,269 @@ class BasePage:
 
     def wait_for_page_to_load(self, timeout=50):
         self.sb.wait_for_ready_state_complete(timeout=timeout)
+        # readyState is always "complete" in the SPA; make sure the XHR/fetch counter is there for the waits
+        with contextlib.suppress(Exception):
+            self.driver.execute_script(_JS_NET_INIT)
+
+    def wait_for_dom_quiet(self, scope=None, quiet_ms: int = DOM_QUIET_MS, timeout: float = 10) -> bool:
+        """
+        Wait until the DOM under `scope` has stopped changing: no mutation for
+        `quiet_ms`. `scope` is None (whole document), a WebElement or a logical
+        name; a logical-name scope that gets re-rendered is re-resolved.
+
+        Meant as the replacement for fixed time.sleep() after actions that
+        re-render part of the page. Returns True once quiet, False after
+        `timeout` seconds (never raises, so worst case equals the old sleep).
+        """
+        end = time.monotonic() + timeout
+        while True:
+            remaining = end - time.monotonic()
+            if remaining <= 0:
+                return False
+            root = None
+            if scope is not None and not isinstance(scope, str):
+                root = scope
+            elif scope is not None:
+                try:
+                    root = self._get_webelement(self.resolve(scope), timeout=min(remaining, PRIMARY_TIMEOUT))
+                except Exception:
+                    root = None  # not rendered (yet): watch the whole document instead
+            try:
+                with self._script_timeout(remaining):
+                    res = self.driver.execute_async_script(
+                        _JS_WAIT_DOM_QUIET, root, int(quiet_ms), int(remaining * 1000)) or {}
+            except StaleElementReferenceException:
+                scope = scope if isinstance(scope, str) else None
+                continue
+            except Exception as e:
+                print(f"[dom-quiet] observer unavailable ({e}); polling DOM generation")
+                return self._poll_dom_quiet(quiet_ms, end)
+            if res.get("detached"):
+                # scope was replaced: follow the new one (logical name) or fall back to the document
+                scope = scope if isinstance(scope, str) else None
+                continue
+            if not res.get("quiet"):
+                print(f"[dom-quiet] still changing after {timeout}s "
+                      f"({res.get('mutations', '?')} mutations{'; ' + res['error'] if res.get('error') else ''})")
+            return bool(res.get("quiet"))
+
+    # ---------- Grid refresh ---------------------------------------------
+
+    def _grid_spec(self, grid_logical_name: str) -> List[str]:
+        by, value = self._selector_to_by(self.resolve(grid_logical_name))
+        return ["xpath" if by == By.XPATH else "css", value]
+
+    def grid_signature(self, grid_logical_name: str) -> Optional[str]:
+        """Row count + first/last row + pager text of the grid containing grid_logical_name (None if absent)."""
+        try:
+            return (self.driver.execute_script(_JS_GRID_SIGNATURE, self._grid_spec(grid_logical_name)) or {}).get("sig")
+        except Exception:
+            return None
+
+    def snapshot_grid(self, grid_logical_name: Optional[str] = None) -> GridSnapshot:
+        """
+        Headers (text, aria-sort), every row's cell texts by aria-colindex, row keys
+        and pager text of the grid containing grid_logical_name - the first grid on
+        the page if None - in one round-trip. See common_utilities.grid_snapshot.
+        """
+        return read_grid(self.driver, self._grid_spec(grid_logical_name) if grid_logical_name else None)
+
+    def _grid_go_page(self, grid_logical_name: str, button: str, timeout: float) -> bool:
+        """Click the pager's `button` (PAGER_NEXT / PAGER_FIRST) and wait for the new page; False if not possible."""
+        try:
+            before = self.driver.execute_script(_JS_GRID_GO_PAGE, self._grid_spec(grid_logical_name), button)
+        except Exception as e:
+            print(f"[grid] pager click failed for '{grid_logical_name}': {e}")
+            return False
+        if before is None:
+            return False
+        return self.wait_for_grid_refresh(grid_logical_name, before=before, timeout=timeout)
+
+    def iter_grid_rows(self, grid_logical_name: str, *, from_first: bool = False, max_pages: Optional[int] = None,
+                       prefetch: bool = True, timeout: float = CLICK_TIMEOUT) -> Iterator[GridRow]:
+        """
+        Lazily yield GridRow(page, index, key, record) for every row of the grid,
+        page after page, until the pager shows no next page (or max_pages). Each page
+        is one snapshot; the move to the next page is detected from the grid
+        signature, not a sleep.
+
+        With prefetch the next page is requested before the current page's rows are
+        handed out, so the app loads it while the caller works - the grid has then
+        already moved on when the caller stops early. Use prefetch=False (as
+        find_first does) to leave the grid on the page of the last row yielded.
+        """
+        if from_first:
+            self._grid_go_page(grid_logical_name, PAGER_FIRST, timeout)
+        pages = 0
+        while True:
+            snap = self.snapshot_grid(grid_logical_name)
+            page = snap.page or pages + 1
+            pages += 1
+            more = snap.has_next and (max_pages is None or pages < max_pages)
+            requested = None
+            if more and prefetch:
+                requested = self.driver.execute_script(
+                    _JS_GRID_GO_PAGE, self._grid_spec(grid_logical_name), PAGER_NEXT)
+            yield from snap.grid_rows(page)
+            if not more:
+                return
+            if prefetch:
+                moved = requested is not None and self.wait_for_grid_refresh(
+                    grid_logical_name, before=requested, timeout=timeout)
+            else:
+                moved = self._grid_go_page(grid_logical_name, PAGER_NEXT, timeout)
+            if not moved:
+                print(f"[grid] '{grid_logical_name}' did not move past page {page}; stopping")
+                return
+
+    def find_first(self, grid_logical_name: str, predicate: Callable[[Dict[str, str]], bool], *,
+                   from_first: bool = False, max_pages: Optional[int] = None,
+                   timeout: float = CLICK_TIMEOUT) -> Optional[GridRow]:
+        """
+        First row across the grid's pages whose record ({header: text}) satisfies
+        `predicate`; paging stops there and the grid is left on that page. None if
+        no page has one.
+        """
+        rows = self.iter_grid_rows(grid_logical_name, from_first=from_first, max_pages=max_pages,
+                                   prefetch=False, timeout=timeout)
+        try:
+            return next((row for row in rows if predicate(row.record)), None)
+        finally:
+            rows.close()
+
+    def wait_for_grid_refresh(self, grid_logical_name: str, before: Optional[str] = None,
+                              timeout: float = CLICK_TIMEOUT, settle_ms: int = GRID_SETTLE_MS) -> bool:
+        """
+        Wait until the grid's signature differs from `before` (a grid_signature()
+        taken before the action) and has settled for settle_ms with no loading
+        mask. Without `before`, only waits for the grid to be rendered and settled.
+
+        Returns True once refreshed, False after `timeout` (e.g. the action gave the
+        same rows back); never raises.
+        """
+        try:
+            spec = self._grid_spec(grid_logical_name)
+            with self._script_timeout(timeout):
+                res = self.driver.execute_async_script(
+                    _JS_WAIT_GRID_REFRESH, spec, before, int(settle_ms), int(timeout * 1000)) or {}
+        except Exception as e:
+            print(f"[grid] in-page refresh wait failed for '{grid_logical_name}' ({e}); waiting for DOM quiet")
+            return self.wait_for_dom_quiet(quiet_ms=settle_ms, timeout=timeout)
+        ok = bool(res.get("changed") and res.get("settled"))
+        if not ok:
+            print(f"[grid] '{grid_logical_name}' {'unchanged' if not res.get('changed') else 'still loading'} "
+                  f"after {timeout}s ({res.get('rows')} rows)")
+        return ok
+
+    @contextlib.contextmanager
+    def expect_grid_refresh(self, grid_logical_name: str, timeout: float = CLICK_TIMEOUT,
+                            settle_ms: int = GRID_SETTLE_MS):
+        """
+        with page.expect_grid_refresh("tbody_patient"):
+            page.type("input_search_patient", name)
+        """
+        before = self.grid_signature(grid_logical_name)
+        yield
+        self.wait_for_grid_refresh(grid_logical_name, before=before, timeout=timeout, settle_ms=settle_ms)
+
+    # ---------- Network idle ---------------------------------------------
+
+    def _install_network_probe(self) -> None:
+        """Register the XHR/fetch counter for every new document (Chrome CDP), once per driver."""
+        if getattr(self.driver, "_sa_net_probe", False):
+            return
+        with contextlib.suppress(Exception):
+            self.driver._sa_net_probe = True
+            self.driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": _JS_NET_INIT})
+
+    def _network_status(self, url_filter: Optional[str] = None, since=None) -> Optional[Dict[str, Any]]:
+        try:
+            return self.driver.execute_script(_JS_NET_STATUS, url_filter, since)
+        except Exception:
+            return None
+
+    def net_mark(self) -> Optional[Dict[str, Any]]:
+        """Take a mark before an action; pass it as `since` to wait for requests that action triggers."""
+        st = self._network_status()
+        return st["mark"] if st else None
+
+    def wait_for_network_idle(self, idle_ms: int = NET_IDLE_MS, timeout: float = 30,
+                              url_filter: Optional[str] = None, since=None) -> bool:
+        """
+        Wait until no XHR/fetch (matching the `url_filter` regex, if given) is in
+        flight and none has started or finished for `idle_ms`. With `since`
+        (a net_mark() taken before the action) at least one matching request must
+        also have finished after the mark, so an action whose request has not
+        started yet does not count as idle.
+
+        Returns True when idle, False after `timeout` (never raises). Falls back to
+        wait_for_dom_quiet when the counter cannot be installed.
+        """
+        end = time.monotonic() + timeout
+        st = None
+        while time.monotonic() < end:
+            st = self._network_status(url_filter, since)
+            if st is None:
+                return self.wait_for_dom_quiet(quiet_ms=idle_ms, timeout=max(0.0, end - time.monotonic()))
+            if not st["inflight"] and st["quiet"] >= idle_ms and (since is None or st["done"]):
+                return True
+            time.sleep(0.1)
+        if st:
+            print(f"[net-idle] not idle after {timeout}s: in flight {st['inflight'][:5]}"
+                  f"{'' if since is None or st['done'] else '; no matching request finished since the mark'}")
+        return False
+
+    def wait_for_api_call(self, url_filter: str, timeout: float = 30, since=None) -> Optional[Dict[str, Any]]:
+        """
+        Wait for one request matching the `url_filter` regex to finish after `since`
+        (default: now; take net_mark() before the action to not miss fast calls).
+        Returns {url, status, ms} of the first such request, or None on timeout.
+        """
+        if since is None:
+            since = self.net_mark()
+        end = time.monotonic() + timeout
+        while time.monotonic() < end:
+            st = self._network_status(url_filter, since)
+            if st and st["done"]:
+                return st["done"][0]
+            time.sleep(0.1)
+        print(f"[net-idle] no request matching {url_filter!r} finished within {timeout}s")
+        return None
+
+    @contextlib.contextmanager
+    def _script_timeout(self, seconds: float):
+        """
+        Let an execute_async_script wait run for `seconds`: the driver's script
+        timeout is raised for the block (never lowered) and restored afterwards.
+        """
+        previous = None
+        with contextlib.suppress(Exception):
+            if self.driver.timeouts.script < seconds + 2:
+                previous = self.driver.timeouts.script
+                self.driver.set_script_timeout(seconds + 2)
+        try:
+            yield
+        finally:
+            if previous is not None:
+                with contextlib.suppress(Exception):
+                    self.driver.set_script_timeout(previous)
+
+    def _poll_dom_quiet(self, quiet_ms: int, end: float) -> bool:
+        """Fallback for wait_for_dom_quiet: poll the document-wide DOM generation counter."""
+        last_gen, since = None, time.monotonic()
+        while time.monotonic() < end:
+            gen = self._dom_generation()
+            now = time.monotonic()
+            if gen is None:
+                # no observers at all: nothing to measure, spend the remaining budget like the old sleep
+                time.sleep(max(0.0, end - now))
+                return False
+            if gen != last_gen:
+                last_gen, since = gen, now
+            elif (now - since) * 1000 >= quiet_ms:
+                return True
+            time.sleep(0.1)
+        return False
 
     def verify_page_title(self, title, timeout=50):
         WebDriverWait(self.sb.driver, timeout).until(EC.title_contains(title))
@@ -994,6 +2270,8 @@ class BasePage:
         timeout: int = CLICK_TIMEOUT,
         mode: str = "auto",           # "auto" | "invisible" | "stale" | "detached"
         poll_frequency: float = 0.2,
+        every: bool = False,
+        expect_absent: bool = False,
     ) -> bool:
         """
         Wait until the element is considered "gone".
@@ -1004,13 +2282,57 @@ class BasePage:
           - "detached":   no matching nodes remain in DOM
           - "auto":       try invisible -> stale -> detached (in that order)
 
-        Returns True on success; raises TimeoutException otherwise.
+        "invisible" looks at the first matching node, like
+        EC.invisibility_of_element_located; every=True requires all matches hidden.
+        expect_absent=True returns at once when no known selector matches (no healing).
+
+        Returns True on success; raises TimeoutException otherwise (with the last
+        state seen). Waits in-page in one async script; WebDriver polling is the
+        fallback when scripts cannot run.
         """
+        # nothing known matches -> already gone in every mode; skip resolve()/healing entirely
+        if expect_absent and FAST_ABSENCE and self._known_absent(logical_name):
+            return True
         selector = self.resolve(logical_name)
         by = self._by_tuple(selector)
+        res = self._wait_gone_in_page([selector], mode, timeout, every=every)
+        if res is not None:
+            if res.get("ok"):
+                return True
+            st = res.get("state") or {}
+            raise TimeoutException(
+                f"'{logical_name}' not gone ({mode}) after {timeout}s: {st.get('matches')} match(es), "
+                f"{st.get('visible')} visible, first seen node still attached={st.get('initialConnected')}; "
+                f"{st.get('sample')}")
+        return self._wait_gone_polling(selector, by, timeout, mode, poll_frequency, every)
+
+    def _wait_gone_in_page(self, selectors: List[str], mode: str, timeout: float,
+                           every: bool = False) -> Optional[Dict[str, Any]]:
+        """Run _JS_WAIT_GONE for `selectors`; None when the script could not run (caller polls instead)."""
+        mode = "detached" if mode in ("absent", "removed") else mode
+        specs = [["xpath" if by == By.XPATH else "css", value]
+                 for by, value in (self._selector_to_by(sel) for sel in selectors)]
+        try:
+            with self._script_timeout(timeout):
+                return self.driver.execute_async_script(_JS_WAIT_GONE, specs, mode, int(timeout * 1000), every)
+        except Exception as e:
+            print(f"[wait-gone] in-page wait unavailable ({e}); polling")
+            return None
+
+    def _wait_gone_polling(self, selector: str, by, timeout: float, mode: str, poll_frequency: float,
+                           every: bool = False) -> bool:
+        """The WebDriver polling implementation of wait_for_gone."""
         wait = WebDriverWait(self.driver, timeout, poll_frequency=poll_frequency)
 
         if mode == "invisible":
+            if every:
+                def all_hidden(_):
+                    for e in self._query(selector):
+                        with contextlib.suppress(StaleElementReferenceException):
+                            if e.is_displayed():
+                                return False
+                    return True
+                return wait.until(all_hidden)
             return wait.until(EC.invisibility_of_element_located(by))
 
         if mode == "stale":
@@ -1042,7 +2364,7 @@ class BasePage:
     # Convenience aliases
     def wait_for_absent(self, logical_name: str, timeout: int = CLICK_TIMEOUT) -> bool:
         """Strictly 'removed from DOM' (no matching nodes remain)."""
-        return self.wait_for_gone(logical_name, timeout=timeout, mode="detached")
+        return self.wait_for_gone(logical_name, timeout=timeout, mode="detached", expect_absent=True)
 
     def wait_for_invisible(self, logical_name: str, timeout: int = CLICK_TIMEOUT) -> bool:
         """Element may remain in DOM but must not be visible."""
@@ -1748,6 +3070,12 @@ class BasePage:
             ".modal-backdrop.show",  # Bootstrap
             ".k-animation-container[style*='display: block'] .k-dialog",  # visible dialogs
             ]
+        res = self._wait_gone_in_page(css_list, "invisible", timeout, every=True)
+        if res is not None:
+            if not res.get("ok"):
+                st = res.get("state") or {}
+                print(f"[overlays] still {st.get('visible')} visible after {timeout}s: {st.get('sample')}")
+            return bool(res.get("ok"))
         end = time.monotonic() + timeout
         while time.monotonic() < end:
             any_visible = False
@@ -1842,26 +3170,43 @@ class BasePage:
             d += timedelta(days=1)
         return out
 
-    # ------- DOM helpers for the month view -------------------------------------
-    def _month_cell_for_day(self, day: int, timeout: int = 6):
+    # ------- Month view snapshot -------------------------------------------------
+    def _calendar_month_snapshot(self, header_logical: Optional[str] = None, *,
+                                 timeout: int = 6) -> Dict[str, Any]:
         """
-        Return the <mwl-calendar-month-cell> for the DAY NUMBER that is
-        'in-month' (not the out-of-month overflow cells).
+        {"header", "cells": {(offset, day): [style, ...]}} of the visible month view,
+        from one script call. Memoized until the view re-renders (or another month
+        is shown): an unchanged calendar answers with a token check only.
+        Raises TimeoutException if no month view appears within `timeout`.
         """
-        xp = ("//mwl-calendar-month-cell"
-              "[contains(@class,'cal-in-month')]"
-              f"[.//span[contains(@class,'cal-day-number') and normalize-space()='{day}']]")
-        return WebDriverWait(self.driver, timeout).until(
-            EC.presence_of_element_located((By.XPATH, xp))
-            )
-
-    def _dot_styles_in_cell(self, cell) -> List[str]:
-        """
-        Return all style strings for 'drug-dot' elements inside a calendar cell.
-        Multiple dots are supported.
-        """
-        dots = cell.find_elements(By.CSS_SELECTOR, ".drug-dots-preview .drug-dot, .drug-dot")
-        return [(d.get_attribute("style") or "").strip() for d in dots]
+        header_sel = self.resolve(header_logical) if header_logical else None
+        known = (self._cal_memo or {}).get("token")
+        res = WebDriverWait(self.driver, timeout, poll_frequency=0.2).until(
+            lambda d: d.execute_script(_JS_CALENDAR_MONTH_DOTS, header_sel, known))
+        if res.get("same") and self._cal_memo:
+            if header_sel:
+                self._cal_memo["header"] = res.get("header")  # the memo may come from a header-less read
+            return self._cal_memo
+        cells: Dict[Tuple[int, int], List[str]] = {}
+        for c in res.get("cells") or []:
+            if c.get("day"):
+                cells[(c["offset"], c["day"])] = c.get("styles") or []
+        self._cal_memo = {"token": res.get("token"), "header": res.get("header"), "cells": cells}
+        return self._cal_memo
+
+    def calendar_month_dots(self, header_logical: str, *, in_month_only: bool = True,
+                            timeout: int = 6) -> Dict[date, List[str]]:
+        """{date: [dot style, ...]} for every day cell of the visible month (one script call)."""
+        snap = self._calendar_month_snapshot(header_logical, timeout=timeout)
+        y, m = self._parse_calendar_header(snap["header"] or "")
+        out: Dict[date, List[str]] = {}
+        for (offset, day), styles in snap["cells"].items():
+            if in_month_only and offset:
+                continue
+            yy, mm = divmod((y * 12 + m - 1) + offset, 12)
+            with contextlib.suppress(ValueError):
+                out[date(yy, mm + 1, day)] = styles
+        return out
 
     # ------- Public API ----------------------------------------------------------
     def calendar_collect_dot_styles(
@@ -1874,18 +3219,16 @@ class BasePage:
             ) -> Dict[date, List[str]]:
         """
         For all expected dates (based on start/weeks/mode), collect the 'style'
-        attributes from '.drug-dot' inside each visible month cell.
+        attributes from '.drug-dot' inside the visible month's in-month cells,
+        matched by day number, from one snapshot of the month.
         Returns { date: [style, ...], ... }  (empty list if no dots found).
         """
-        result: Dict[date, List[str]] = {}
-        for d in self.calendar_expected_dates(start, weeks=weeks, mode=mode):
-            try:
-                cell = self._month_cell_for_day(d.day, timeout=timeout_per_cell)
-                styles = self._dot_styles_in_cell(cell)
-            except Exception:
-                styles = []  # cell not visible or structure changed
-            result[d] = styles
-        return result
+        try:
+            cells = self._calendar_month_snapshot(timeout=timeout_per_cell)["cells"]
+        except TimeoutException:
+            cells = {}  # calendar not visible or structure changed
+        return {d: cells.get((0, d.day), [])
+                for d in self.calendar_expected_dates(start, weeks=weeks, mode=mode)}
 
     def calendar_verify_dots(
             self,
@@ -1928,8 +3271,11 @@ class BasePage:
         except Exception:
             pass  # fall through to raise the descriptive RuntimeError below
         hdr = self._get_webelement(header_sel, timeout=timeout)
-        text = (hdr.text or "").strip()
+        return self._parse_calendar_header(hdr.text or "")
+
+    def _parse_calendar_header(self, text: str) -> tuple[int, int]:
         # expect "August 2025" or similar
+        text = text.strip()
         parts = text.split()
         if len(parts) < 2:
             raise RuntimeError(f"Cannot parse month+year from header: {text!r}")
@@ -1977,21 +3323,58 @@ class BasePage:
 
         raise RuntimeError(f"Could not reach {target_year}-{target_month:02d} using calendar navigation")
 
-    # --- Find a cell for a day number within the visible month -------------------
-    def _month_cell_for_day(self, day: int, *, timeout: int = 6, in_month_only: bool = True):
-        pred_month = " and contains(@class,'cal-in-month')" if in_month_only else ""
-        xp = ("//mwl-calendar-month-cell"
-              f"[contains(@class,'cal-day-cell'){pred_month}]"
-              f"[.//span[contains(@class,'cal-day-number') and normalize-space()='{day}']]")
-        return WebDriverWait(self.driver, timeout).until(
-            EC.presence_of_element_located((By.XPATH, xp))
-            )
+    # --- Multi-month collector ----------------------------------------------------
+    def _calendar_dots_for_dates(self, dates: List[date], *, header_logical: str, next_btn_logical: str,
+                                 prev_btn_logical: str, accept: Callable[[List[str]], bool],
+                                 timeout_per_cell: int = 6, nav_timeout: int = 10) -> Dict[date, List[str]]:
+        """
+        Dot styles for `dates`, one month snapshot per month visited. The visible
+        month is read first; overflow days of the neighbouring months count when
+        their dots pass `accept`, so a month is only navigated to for dates still
+        unresolved. An in-month day that fails `accept` is read once more after the
+        view settles (dots can render after the header has changed).
+        """
+        pending = set(dates)
+        result: Dict[date, List[str]] = {}
 
-    def _dot_styles_in_cell(self, cell) -> list[str]:
-        dots = cell.find_elements(By.CSS_SELECTOR, ".drug-dots-preview .drug-dot, .drug-dot")
-        return [(d.get_attribute("style") or "").strip() for d in dots]
+        def take(snap) -> None:
+            y, m = self._parse_calendar_header(snap["header"] or "")
+            for (offset, day), styles in snap["cells"].items():
+                yy, mm = divmod((y * 12 + m - 1) + offset, 12)
+                try:
+                    d = date(yy, mm + 1, day)
+                except ValueError:
+                    continue
+                if d in pending and (offset == 0 or accept(styles)):
+                    result[d] = styles
+                    pending.discard(d)
+
+        def read() -> Dict[str, Any]:
+            snap = self._calendar_month_snapshot(header_logical, timeout=timeout_per_cell)
+            y, m = self._parse_calendar_header(snap["header"] or "")
+            if any(d.year == y and d.month == m and not accept(snap["cells"].get((0, d.day), []))
+                   for d in pending):
+                self.wait_for_dom_quiet(quiet_ms=300, timeout=timeout_per_cell)
+                snap = self._calendar_month_snapshot(header_logical, timeout=timeout_per_cell)
+            return snap
+
+        try:
+            take(read())
+        except (TimeoutException, RuntimeError) as e:
+            print(f"[calendar] could not read the visible month ({e})")
+        for y, m in sorted({(d.year, d.month) for d in pending}):
+            if not any((d.year, d.month) == (y, m) for d in pending):
+                continue
+            self.calendar_goto_year_month(header_logical, next_btn_logical, prev_btn_logical, y, m,
+                                          timeout=nav_timeout)
+            try:
+                take(read())
+            except (TimeoutException, RuntimeError) as e:
+                print(f"[calendar] could not read {y}-{m:02d} ({e})")
+        for d in pending:
+            result[d] = []  # no cell for that day
+        return dict(sorted(result.items()))
 
-    # --- Multi-month collector ----------------------------------------------------
     def calendar_collect_dot_styles_multi_month(
             self,
             start, *,
@@ -2002,22 +3385,11 @@ class BasePage:
             prev_btn_logical: str,
             timeout_per_cell: int = 6,
             ) -> dict[date, list[str]]:
-        """Navigate across months and collect styles for all expected dates."""
-        expected = self.calendar_expected_dates(start, weeks=weeks, mode=mode)
-        groups = defaultdict(list)
-        for d in expected:
-            groups[(d.year, d.month)].append(d)
-
-        styles_map: dict[date, list[str]] = {}
-        for (yy, mm), dates in sorted(groups.items()):
-            self.calendar_goto_year_month(header_logical, next_btn_logical, prev_btn_logical, yy, mm)
-            for d in dates:
-                try:
-                    cell = self._month_cell_for_day(d.day, timeout=timeout_per_cell, in_month_only=True)
-                    styles_map[d] = self._dot_styles_in_cell(cell)
-                except Exception:
-                    styles_map[d] = []
-        return styles_map
+        """Collect styles for all expected dates, navigating only to the months that need it."""
+        return self._calendar_dots_for_dates(
+            self.calendar_expected_dates(start, weeks=weeks, mode=mode),
+            header_logical=header_logical, next_btn_logical=next_btn_logical,
+            prev_btn_logical=prev_btn_logical, accept=bool, timeout_per_cell=timeout_per_cell)
 
     def calendar_verify_dots_multi_month(
             self,
@@ -2031,40 +3403,20 @@ class BasePage:
             expect_color_substring: str | None = None,  # eg "rgb(195, 34, 150)"
             timeout_per_cell: int = 6,
             ):
-        """Verify dot styles across month boundaries by grouping expected dates
-        per (year, month), navigating once per group, then checking those days.
+        """Verify dot styles across month boundaries: one snapshot per month
+        visited, and only months whose dates are not already visible are visited.
         Returns (missing_dates, styles_map).
         """
-        # 1) build expected dates
-        exp = self.calendar_expected_dates(start, weeks=weeks, mode=mode)
-
-        # 2) group by (year, month)
-        groups = {}
-        for d in exp:
-            groups.setdefault((d.year, d.month), []).append(d)
-
-        styles_map = {}
-        missing = []
-
-        # 3) visit each month once, verify days in that month
-        for (y, m) in sorted(groups.keys()):
-            self.calendar_goto_year_month(
-                header_logical, next_btn_logical, prev_btn_logical, y, m, timeout=8
-                )
-
-            for d in groups[(y, m)]:
-                try:
-                    cell = self._month_cell_for_day(d.day, timeout=timeout_per_cell)
-                    styles = self._dot_styles_in_cell(cell)
-                except Exception:
-                    styles = []
-
-                styles_map[d] = styles
-                if not styles:
-                    missing.append(d)
-                elif expect_color_substring and not any(expect_color_substring in s for s in styles):
-                    missing.append(d)
+        def ok(styles: List[str]) -> bool:
+            if not styles:
+                return False
+            return not expect_color_substring or any(expect_color_substring in s for s in styles)
 
+        styles_map = self._calendar_dots_for_dates(
+            self.calendar_expected_dates(start, weeks=weeks, mode=mode),
+            header_logical=header_logical, next_btn_logical=next_btn_logical,
+            prev_btn_logical=prev_btn_logical, accept=ok, timeout_per_cell=timeout_per_cell, nav_timeout=8)
+        missing = [d for d, styles in styles_map.items() if not ok(styles)]
         return missing, styles_map
 
     def clear_heal_cache(self, logical_name: str | None = None):
@@ -2287,13 +3639,91 @@ class BasePage:
     #
     #     return texts
 
+    def _kendo_data_texts(self, host, *, include_disabled: bool = False, dedup: bool = False) -> Optional[List[str]]:
+        """Option texts from the widget's bound data (see _JS_KENDO_DATA_ITEMS), normalised like the scrape paths."""
+        if KENDO_LIST_MODE != "data":
+            return None
+        try:
+            res = self.driver.execute_script(_JS_KENDO_DATA_ITEMS, host, include_disabled)
+        except Exception:
+            return None
+        if not res:
+            return None
+        out = [t.strip() for t in res.get("texts") or [] if t and t.strip()]
+        if dedup:
+            out = list(dict.fromkeys(out))
+        return out
+
+    def _kendo_direct_select(self, logical_name: str, host, text: str, match: str, *,
+                             multi: bool, timeout: int) -> bool:
+        """
+        Select `text` by its index in the widget's data: jQuery widgets through their
+        API, Angular by clicking just that option (scrolled into view in one script).
+        Verified like a user would see it; False means "use the popup path".
+        """
+        if KENDO_LIST_MODE != "data":
+            return False
+        try:
+            res = self.driver.execute_script(_JS_KENDO_DIRECT_SELECT, host, text, match, multi)
+        except Exception:
+            return False
+        if not res or res.get("index", -1) < 0:
+            return False
+        chosen = res["text"]
+        if not res.get("selected"):
+            try:
+                root = self._ms_root(host) if multi else self._dd_root(host)
+                inp = self._ms_input(root) if multi else self._dd_combobox_input(root)
+                listbox = self._open_kendo_and_get_listbox(root, inp, timeout=min(timeout, 6))
+                option = self.driver.execute_script(_JS_KENDO_ITEM_AT, listbox, res["index"], chosen)
+                if option is None:
+                    return False
+                try:
+                    option.click()
+                except Exception:
+                    self.driver.execute_script("arguments[0].click();", option)
+            except Exception as e:
+                print(f"[kendo-select] direct select of {chosen!r} in '{logical_name}' failed ({e}); using the popup")
+                return False
+        want = _norm(chosen).lower()
+        try:
+            if multi:
+                root = self._ms_root(host)
+                WebDriverWait(self.driver, 3).until(lambda d: any(
+                    want in _norm(c.text).lower()
+                    for c in root.find_elements(By.CSS_SELECTOR, ".k-chip-list .k-chip .k-chip-content")))
+            else:
+                WebDriverWait(self.driver, 3).until(
+                    lambda d: _norm(self.kendo_dd_get_selected_text(logical_name)).lower() == want)
+        except TimeoutException:
+            print(f"[kendo-select] '{logical_name}' does not show {chosen!r} after direct select; using the popup")
+            return False
+        return True
+
+    def _kendo_list_parity(self, logical_name: str, data: List[str], scraped: List[str]) -> None:
+        if data != scraped:
+            print(f"[kendo-list] PARITY MISMATCH {self.page_name}/{logical_name}: "
+                  f"data-only={[t for t in data if t not in scraped][:10]} "
+                  f"scrape-only={[t for t in scraped if t not in data][:10]} "
+                  f"same-order={[t for t in data if t in scraped] == [t for t in scraped if t in data]}")
+
     def kendo_dd_get_all_texts(self, logical_name: str, timeout: int = 15) -> list[str]:
         """
-        Return all visible option texts from a Kendo DropDownList or ComboBox.
-        Handles stale elements by re-locating the listbox when needed.
+        Return all option texts from a Kendo DropDownList or ComboBox.
+        Read from the widget's bound data when reachable (SA_KENDO_LIST_MODE=data),
+        otherwise from the opened popup; disabled items are listed either way.
         """
         sel = self.resolve(logical_name)
         root = self._get_webelement(sel, timeout=timeout)
+        texts = self._kendo_data_texts(root, include_disabled=True)  # the popup renders them too
+        if texts is not None:
+            if KENDO_LIST_PARITY:
+                self._kendo_list_parity(logical_name, texts, self._kendo_dd_scrape_texts(logical_name, root, timeout))
+            return texts
+        return self._kendo_dd_scrape_texts(logical_name, root, timeout)
+
+    def _kendo_dd_scrape_texts(self, logical_name: str, root, timeout: int) -> list[str]:
+        """Open the popup and read the rendered items; handles stale elements by re-locating the listbox."""
         self._dd_open(root, timeout)
 
         end = time.monotonic() + timeout
@@ -2327,6 +3757,9 @@ class BasePage:
     def kendo_dd_select_text(self, logical_name: str, text: str, *, match: str = "exact", timeout: int = 25) -> bool:
         sel = self.resolve(logical_name)
         host = self._get_webelement(sel, timeout=timeout)
+        # by index in the widget's data; paging through the popup is the fallback
+        if self._kendo_direct_select(logical_name, host, text, match, multi=False, timeout=timeout):
+            return True
         root = self._dd_root(host)
         inp = self._dd_combobox_input(root)
         listbox = self._open_kendo_and_get_listbox(root, inp, timeout=timeout)
@@ -2409,6 +3842,8 @@ class BasePage:
     def kendo_ms_select_text(self, logical_name: str, text: str, *, match: str = "exact", timeout: int = 25) -> bool:
         sel = self.resolve(logical_name)
         host = self._get_webelement(sel, timeout=timeout)
+        if self._kendo_direct_select(logical_name, host, text, match, multi=True, timeout=timeout):
+            return True
         root = self._ms_root(host)
         inp = self._ms_input(root)
 
@@ -2752,6 +4187,21 @@ class BasePage:
 
         sel = self.resolve(logical_name)
         host = self._get_webelement(sel, timeout=timeout)
+        # the widget's own data: one script, no popup, no scrolling (same order/dedup as the scrape)
+        if filter_text is None:
+            texts = self._kendo_data_texts(host, include_disabled=include_disabled, dedup=True)
+            if texts is not None:
+                if KENDO_LIST_PARITY:
+                    self._kendo_list_parity(logical_name, texts, self._kendo_ms_scrape_texts(
+                        host, filter_text=None, include_disabled=include_disabled,
+                        timeout=timeout, scroll_pause=scroll_pause))
+                return texts
+        return self._kendo_ms_scrape_texts(host, filter_text=filter_text, include_disabled=include_disabled,
+                                           timeout=timeout, scroll_pause=scroll_pause)
+
+    def _kendo_ms_scrape_texts(self, host, *, filter_text: str | None, include_disabled: bool,
+                               timeout: int, scroll_pause: float) -> list[str]:
+        """Open the popup and collect item texts while scrolling until two rounds add nothing new."""
         # root & input
         try:
             root = self._dd_root(host)
@@ -2796,26 +4246,24 @@ class BasePage:
             except Exception:
                 pass
 
-            # current visible batch
+            # current visible batch (tag/text/class of every item in one round-trip)
             try:
-                items = [e for e in listbox.find_elements(By.XPATH, items_rel) if e.is_displayed()]
+                items = [sn for sn in self.snapshot_elements(items_rel, ["class"], within=listbox)
+                         if sn and sn["displayed"]]
             except StaleElementReferenceException:
                 listbox = self._ensure_open_listbox(root, inp, listbox, timeout=2)
                 continue
 
             added_this_round = 0
             for it in items:
-                try:
-                    disabled = "k-disabled" in (it.get_attribute("class") or "")
-                    if (not include_disabled) and disabled:
-                        continue
-                    txt = (it.text or "").strip()
-                    if txt and txt not in seen:
-                        seen.add(txt)
-                        out.append(txt)
-                        added_this_round += 1
-                except StaleElementReferenceException:
+                disabled = "k-disabled" in (it["attrs"].get("class") or "")
+                if (not include_disabled) and disabled:
                     continue
+                txt = (it["text"] or "").strip()
+                if txt and txt not in seen:
+                    seen.add(txt)
+                    out.append(txt)
+                    added_this_round += 1
 
             if added_this_round == 0:
                 stable_cycles += 1
@@ -3030,6 +4478,114 @@ class BasePage:
             time.sleep(poll)
         raise TimeoutError(f"Kendo switch '{logical_name}' did not reach state {expected} in {timeout}s")
 
+    def _switch_specs(self, logical_names: Iterable[str]) -> List[List[str]]:
+        """[name, literal JSON selector] for each known name (the strict selectors, no healing)."""
+        specs = []
+        for name in logical_names:
+            entry = self.locators.get(name) or {}
+            sel = entry.get("xpath") or entry.get("css")
+            if sel:
+                specs.append([name, sel])
+        return specs
+
+    def kendo_switch_states(self, logical_names: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Read many switches in one script: name -> {found, count, on, disabled}.
+        Names without a locator entry come back as not found.
+        """
+        names = list(logical_names)
+        states = self.driver.execute_script(_JS_SWITCH_STATES, self._switch_specs(names), None) or {}
+        return {n: states.get(n) or {"found": False, "count": 0, "on": None, "disabled": False} for n in names}
+
+    def kendo_switch_reconcile(self, desired: Dict[str, bool], *, name_format: str = "{}", timeout: int = 20,
+                               rounds: int = 2) -> Dict[str, Any]:
+        """
+        Bring a set of switches to the desired ON/OFF states with as few round-trips
+        as possible: one read of every switch, a click on only those that differ,
+        then one wait for all of them to show the new state and for the requests
+        the clicks triggered to finish (the save). Switches that did not flip are
+        clicked again, up to `rounds` times in total.
+
+        `desired` keys are formatted with `name_format` into logical names, e.g.
+        {"Pill Count": True} with "kendo-switch_{}". Returns, keyed like `desired`:
+        {"changed": {key: {"from", "to"}}, "unchanged": [...], "missing": [...],
+        "failed": {key: reason}}.
+        """
+        from selenium.common.exceptions import StaleElementReferenceException
+        logical = {key: name_format.format(key) for key in desired}
+        want = {logical[key]: on for key, on in desired.items()}
+        names = list(want)
+
+        # the list may still be rendering: wait until at least one switch is there
+        before: Dict[str, Dict[str, Any]] = {}
+
+        def _rendered(d):
+            nonlocal before
+            before = self.kendo_switch_states(names)
+            return any(st["found"] for st in before.values())
+        with contextlib.suppress(TimeoutException):
+            WebDriverWait(self.driver, PRIMARY_TIMEOUT, poll_frequency=0.2).until(_rendered)
+
+        diff: Dict[str, Any] = {"changed": {}, "unchanged": [], "missing": [], "failed": {}}
+        pending = []
+        for key in desired:
+            st = before.get(logical[key]) or {}
+            if not st.get("found"):
+                diff["missing"].append(key)
+            elif st["on"] == desired[key]:
+                diff["unchanged"].append(key)
+            elif st["disabled"]:
+                diff["failed"][key] = "disabled"
+            else:
+                pending.append(logical[key])
+        if not pending:
+            return diff
+
+        mark = self.net_mark()
+        states: Dict[str, Any] = {}
+        for _ in range(rounds):
+            specs = self._switch_specs(pending)
+            targets = self.driver.execute_script(_JS_SWITCH_STATES, specs, pending) or {}
+            for name in pending:
+                target = (targets.get(name) or {}).get("target")
+                if target is None:
+                    continue
+                try:
+                    target.click()
+                except StaleElementReferenceException:
+                    # the list re-rendered after an earlier save; fetch this one again
+                    fresh = self.driver.execute_script(_JS_SWITCH_STATES, self._switch_specs([name]), [name]) or {}
+                    target = (fresh.get(name) or {}).get("target")
+                    if target is not None:
+                        with contextlib.suppress(Exception):
+                            self.driver.execute_script("arguments[0].click();", target)
+                except Exception:
+                    with contextlib.suppress(Exception):
+                        self.driver.execute_script("arguments[0].click();", target)
+
+            def _settled(d):
+                nonlocal states
+                states = d.execute_script(_JS_SWITCH_STATES, specs, None) or {}
+                return all((states.get(n) or {}).get("on") == want[n] for n in pending)
+            with contextlib.suppress(TimeoutException):
+                WebDriverWait(self.driver, timeout, poll_frequency=0.1).until(_settled)
+            self.wait_for_network_idle(timeout=timeout, since=mark)
+            # read after the save: the server may have rejected a change
+            states = self.driver.execute_script(_JS_SWITCH_STATES, specs, None) or {}
+            pending = [n for n in pending if (states.get(n) or {}).get("on") != want[n]]
+            if not pending:
+                break
+
+        for key in desired:
+            name = logical[key]
+            if key in diff["missing"] or key in diff["unchanged"] or key in diff["failed"]:
+                continue
+            if name in pending:
+                diff["failed"][key] = f"still {'ON' if (states.get(name) or {}).get('on') else 'OFF'}"
+            else:
+                diff["changed"][key] = {"from": before[name]["on"], "to": desired[key]}
+        return diff
+
     # =========================
     # Kendo Expander / ExpansionPanel helpers
     # =========================
@@ -3568,173 +5124,42 @@ class BasePage:
     def get_current_url(self):
         return self.sb.get_current_url()
 
-    def normalize_values(self, values: list[str]):
+    def is_sorted(self, final_values, sorted_as: str):
         """
-        Convert values into comparable formats:
-        - Phone numbers (10 digits) => keep as strings (preserve leading zeros)
-        - Pure numerics => floats
-        - Otherwise => strings
+        Assert `final_values` (cell texts or already-parsed numbers) are sorted
+        `sorted_as` ("ascending" / "descending"). The column type is inferred once
+        and checked in one pass (see common_utilities.column_sort); the failure
+        names the first out-of-order row.
         """
-        cleaned = [v for v in values if v is not None]
-        if not cleaned:
-            return cleaned
-
-        # Phone numbers: keep as strings
-        if all(str(v).isdigit() and len(str(v)) == 10 for v in cleaned):
-            return [str(v) for v in cleaned]
-
-        # Try numeric conversion (all must be numeric)
-        numeric = []
-        for v in cleaned:
-            s = str(v).strip()
-            try:
-                numeric.append(float(s.replace(",", "")))
-            except ValueError:
-                return [str(x) for x in cleaned]  # fallback to strings
-
-        return numeric
-
-    # def try_parse_datetime(self, value: str):
-    #     formats = [
-    #         "%b %d %H:%M:%S",
-    #         "%b %d %Y %H:%M:%S",
-    #         ]
-    #     for fmt in formats:
-    #         try:
-    #             dt = datetime.strptime(value, fmt)
-    #             if "%Y" not in fmt:
-    #                 dt = dt.replace(year=datetime.now().year)
-    #             return dt
-    #         except ValueError:
-    #             pass
-    #     return None
-
-    def try_parse_datetime(self, value: str):
-        formats = [
-            "%b %d %H:%M:%S",  # Dec 10 19:53:15
-            "%b %d %Y %H:%M:%S",  # Dec 10 2025 19:53:15
-            ]
-
-        value = (value or "").strip()
-        now = datetime.now()
-
-        for fmt in formats:
-            try:
-                dt = datetime.strptime(value, fmt)
-
-                # If year not provided, infer it
-                if "%Y" not in fmt:
-                    dt = dt.replace(year=now.year)
-
-                    # ✅ If it ends up in the future, it belongs to last year
-                    if dt > now:
-                        dt = dt.replace(year=now.year - 1)
-
-                return dt
-            except ValueError:
-                pass
-
-        return None
-
-    def is_sorted(self, final_values, sorted_as: str):
         if not final_values:
             return
-
-        reverse = (sorted_as == "descending")
-
-        # 1) datetime?
-        parsed = []
-        date_mode = True
-        for v in final_values:
-            dt = self.try_parse_datetime(str(v).strip())
-            if dt is None:
-                date_mode = False
-                break
-            parsed.append(dt)
-
-        if date_mode:
-            expected = sorted(parsed, reverse=reverse)
-            if parsed != expected:
-                print("ACTUAL datetimes :", parsed)
-                print("EXPECTED datetimes:", expected)
-                raise AssertionError(f"Date column NOT sorted {sorted_as}")
-            return
-
-        # 2) numeric?
-        if isinstance(final_values[0], (int, float)):
-            expected = sorted(final_values, reverse=reverse)
-            if final_values != expected:
-                print("ACTUAL :", final_values)
-                print("EXPECTED:", expected)
-                raise AssertionError(f"Column NOT sorted {sorted_as}")
-            return
-
-        # 3) strings: try BOTH lexicographic and natural (Kendo varies by column)
-        if self.is_email_column(final_values):
-            expected_lex = sorted(final_values, key=lambda s: str(s).casefold(), reverse=reverse)
-            if final_values != expected_lex:
-                print("ACTUAL :", final_values)
-                print("EXPECTED (LEX):", expected_lex)
-                raise AssertionError(f"Email column NOT sorted {sorted_as}")
-            return
-
-        locale.setlocale(locale.LC_ALL, '')
-        expected_lex = sorted(
-            final_values,
-            key=lambda s: locale.strxfrm(str(s).split()[0].lower()),
-            reverse=reverse
-            )
-        expected_nat = sorted(
-            final_values,
-            key=lambda s: self.natural_key(str(s).split()[0]),
-            reverse=reverse
-            )
-
-        # expected_lex = sorted(
-        #     final_values,
-        #     key=lambda s: str(s).split()[0].casefold(),
-        #     reverse=reverse
-        #     )
-        # expected_nat = sorted(
-        #     final_values,
-        #     key=lambda s: self.natural_key(str(s).split()[0]),
-        #     reverse=reverse
-        #     )
-        # expected_lex = sorted(final_values, key=lambda s: str(s).casefold(), reverse=reverse)
-        # expected_nat = sorted(final_values, key=self.natural_key, reverse=reverse)
-
-        if final_values == expected_lex or final_values == expected_nat:
-            return  # ✅ matches at least one valid Kendo-like ordering
-
-
-        print("ACTUAL :", final_values)
-        print("EXPECTED (LEX):", expected_lex)
-        print("EXPECTED (NAT):", expected_nat)
-        raise AssertionError(f"Column NOT sorted {sorted_as}")
+        result = check_sorted(final_values, descending=(sorted_as == "descending"))
+        if not result.ok:
+            raise AssertionError(describe_failure(list(final_values), result, sorted_as))
 
     def _get_column_values(self, col_index: int) -> list[str]:
         """
-        Reads values from a Kendo table column (1-based index).
-        Uses k-table-row + k-table-td (your DOM).
-        Skips the first row if it contains 0 cells (header-like row).
+        Non-empty values of a Kendo table column (1-based aria-colindex) of the
+        first grid on the page, read from one grid snapshot.
         """
-        rows = self.find_elements_raw("//*[contains(@class,'k-table-row')]", by="xpath")
-        print(f"DEBUG: found {len(rows)} rows for column {col_index}")
-
-        values = []
-        for i, row in enumerate(rows, start=1):
-            cells = row.find_elements(By.XPATH, ".//*[contains(@class,'k-table-td')]")
-            # print(f"  Row {i}: {len(cells)} cells")  # very noisy
-
-            if len(cells) < col_index:
-                continue
-
-            txt = (cells[col_index - 1].text or "").strip()
-            if txt:
-                values.append(txt)
-
+        values = [v for v in self.snapshot_grid().column(int(col_index)) if v]
+        print(f"DEBUG: found {len(values)} cells for column {col_index}")
         return values
 
+    def check_grid_sort(self, grid: GridSnapshot, column: ColumnKey) -> Optional[str]:
+        """
+        is_sorted on one column of a grid snapshot, in the direction its header's
+        aria-sort shows. Returns that direction, or None when the column is not sorted.
+        """
+        sort_type = grid.sort_state(column)
+        if sort_type not in ("ascending", "descending"):
+            return None
+        values = [v for v in grid.column(column) if v]
+        print(f"Column {column} sort type: {sort_type}, Row counts: {len(values)} values: {values}")
+        if len(values) >= 2:
+            self.is_sorted(values, sort_type)
+        return sort_type
+
     def kendo_multiselect_clear_all(self, input_logical_name: str, timeout: int = 15) -> None:
         sel = self.resolve(input_logical_name)
         inp = self._get_webelement(sel, timeout=timeout)
@@ -3873,13 +5298,6 @@ class BasePage:
         print(f"[ELEMENT TEXTS → {logical_name}] {values}")
         return values
 
-    def natural_key(self, s):
-        return [int(x) if x.isdigit() else x.casefold()
-                for x in re.split(r"(\d+)", str(s))]
-
-    def is_email_column(self, values):
-        return values and all("@" in str(v) for v in values)
-
     def _parse_ui_timestamp(self, timestamp_text: str) -> datetime:
         """
         Expects text like: 'KB Kankana Bordoloi | Thu - Jan 15, 2026 - 05:58 PM'
@@ -0,0 +1,209 @@
+"""
+Grid column sort verification
+=============================
+Checks that a column read from a Kendo grid is in the order its header claims,
+the way BasePage.is_sorted does, but with:
+
+- the column type (datetime / number / email / text) inferred once from a
+  sample instead of per value;
+- the whole column parsed in one vectorized pass (pandas, imported lazily;
+  a plain-Python pass when pandas is not installed);
+- an O(n) monotonicity check with one comparison key per Kendo collation mode
+  (locale-aware first word, natural first word) instead of full sorted copies;
+- the first out-of-order position reported on failure.
+"""
+
+import locale
+import math
+import re
+from datetime import datetime
+from typing import Any, List, NamedTuple, Optional, Sequence
+
+# formats seen in the grids' date columns ("Dec 10 19:53:15", "Dec 10 2025 19:53:15")
+DATE_FORMATS = ["%b %d %H:%M:%S", "%b %d %Y %H:%M:%S"]
+SAMPLE_SIZE = 20
+
+_collation_ready = False
+
+
+class SortCheck(NamedTuple):
+    ok: bool
+    kind: str                   # "datetime" | "number" | "email" | "text"
+    index: Optional[int]        # first position that is out of order (None when ok)
+    mode: str                   # collation mode that matched, or got furthest
+
+
+def _pandas():
+    try:
+        import pandas as pd
+    except ImportError:
+        return None
+    return pd
+
+
+def _ensure_collation() -> None:
+    """locale.setlocale once per process (it is process-wide and not cheap)."""
+    global _collation_ready
+    if not _collation_ready:
+        try:
+            locale.setlocale(locale.LC_ALL, "")
+        except locale.Error:
+            pass
+        _collation_ready = True
+
+
+def natural_key(s: Any) -> list:
+    return [int(x) if x.isdigit() else x.casefold() for x in re.split(r"(\d+)", str(s))]
+
+
+def _first_word(s: Any) -> str:
+    parts = str(s).split()
+    return parts[0] if parts else ""
+
+
+def _is_number(s: str) -> bool:
+    """Finite numbers only: "nan" / "inf" cell texts are text, on both parsing paths."""
+    try:
+        return math.isfinite(float(s.replace(",", "")))
+    except ValueError:
+        return False
+
+
+def _parses_as_date(v: str) -> bool:
+    for fmt in DATE_FORMATS:
+        try:
+            datetime.strptime(v, fmt)
+            return True
+        except ValueError:
+            continue
+    return False
+
+
+def infer_kind(values: Sequence[Any], sample_size: int = SAMPLE_SIZE) -> str:
+    """Column type from the first `sample_size` values."""
+    if all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in values):
+        return "number"
+    sample = [str(v).strip() for v in values[:sample_size]]
+    if all(_parses_as_date(s) for s in sample):
+        return "datetime"
+    # 10-digit phone numbers stay text (leading zeros, compared as strings)
+    if all(s.isdigit() and len(s) == 10 for s in sample):
+        return "text"
+    if all(_is_number(s) for s in sample):
+        return "number"
+    if all("@" in s for s in sample):
+        return "email"
+    return "text"
+
+
+def _parse_dates(texts: List[str]):
+    """
+    Whole column, each value in whichever DATE_FORMAT fits (the grids drop the year
+    for recent dates); year-less dates get the current year, or last year if that
+    would be in the future. None if any value is not a date.
+    """
+    now = datetime.now()
+    pd = _pandas()
+    if pd is not None:
+        series = pd.Series(texts)
+        parsed = None
+        for fmt in DATE_FORMATS:
+            part = pd.to_datetime(series, format=fmt, errors="coerce")
+            if "%Y" not in fmt:
+                part = part + pd.DateOffset(years=now.year - 1900)
+                part = part.where(part <= now, part - pd.DateOffset(years=1))
+            parsed = part if parsed is None else parsed.fillna(part)
+        return None if parsed.isna().any() else parsed
+    out = []
+    for t in texts:
+        for fmt in DATE_FORMATS:
+            try:
+                dt = datetime.strptime(t, fmt)
+            except ValueError:
+                continue
+            if "%Y" not in fmt:
+                dt = dt.replace(year=now.year)
+                if dt > now:
+                    dt = dt.replace(year=now.year - 1)
+            out.append(dt)
+            break
+        else:
+            return None
+    return out
+
+
+def _parse_numbers(values: Sequence[Any]) -> Optional[list]:
+    if all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in values):
+        return list(values)
+    pd = _pandas()
+    if pd is not None:
+        parsed = pd.to_numeric(pd.Series([str(v).strip().replace(",", "") for v in values]), errors="coerce")
+        return None if parsed.isna().any() or parsed.isin([math.inf, -math.inf]).any() else parsed
+    try:
+        out = [float(str(v).strip().replace(",", "")) for v in values]
+    except ValueError:
+        return None
+    return out if all(math.isfinite(x) for x in out) else None
+
+
+def first_out_of_order(keys, descending: bool = False) -> Optional[int]:
+    """Index of the first key that breaks the order (ties allowed), None if monotonic. O(n)."""
+    pd = _pandas()
+    if pd is not None and isinstance(keys, pd.Series):
+        keys = keys.reset_index(drop=True)
+        prev = keys.shift(1)
+        bad = (keys > prev) if descending else (keys < prev)
+        return int(bad.idxmax()) if bad.any() else None
+    for i in range(1, len(keys)):
+        if (keys[i] > keys[i - 1]) if descending else (keys[i] < keys[i - 1]):
+            return i
+    return None
+
+
+def _text_modes(kind: str) -> List[tuple]:
+    if kind == "email":
+        return [("casefold", lambda s: str(s).casefold())]
+    _ensure_collation()
+    return [
+        ("locale", lambda s: locale.strxfrm(_first_word(s).lower())),
+        ("natural", lambda s: natural_key(_first_word(s))),
+    ]
+
+
+def check_sorted(values: Sequence[Any], descending: bool = False) -> SortCheck:
+    """
+    Whether `values` are sorted (ascending, or descending) under the inferred
+    column type; text passes if any Kendo collation mode accepts it.
+    """
+    values = list(values)
+    if len(values) < 2:
+        return SortCheck(True, "text", None, "")
+    kind = infer_kind(values)
+    keys = None
+    if kind == "datetime":
+        keys = _parse_dates([str(v).strip() for v in values])
+    elif kind == "number":
+        keys = _parse_numbers(values)
+    if keys is not None:
+        bad = first_out_of_order(keys, descending)
+        return SortCheck(bad is None, kind, bad, kind)
+    if kind not in ("email", "text"):
+        kind = "text"       # the sample matched, the whole column did not
+    best = SortCheck(False, kind, -1, "")
+    for mode, key in _text_modes(kind):
+        bad = first_out_of_order([key(v) for v in values], descending)
+        if bad is None:
+            return SortCheck(True, kind, None, mode)
+        if bad > best.index:
+            best = SortCheck(False, kind, bad, mode)
+    return best
+
+
+def describe_failure(values: Sequence[Any], result: SortCheck, sorted_as: str, window: int = 2) -> str:
+    """One-line failure message around the first out-of-order position."""
+    i = result.index or 0
+    lo, hi = max(0, i - window), min(len(values), i + window + 1)
+    around = ", ".join(f"[{j}] {values[j]!r}" for j in range(lo, hi))
+    how = result.kind if result.mode in (result.kind, "") else f"{result.kind}, {result.mode} order"
+    return (f"Column NOT sorted {sorted_as} ({how}): "
+            f"row {i} {values[i]!r} is out of order after {values[i - 1]!r}; around it: {around}")
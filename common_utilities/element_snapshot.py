@@ -0,0 +1,165 @@
+"""
+Bulk element snapshots
+======================
+Reads tag, visible text, displayed state, bounding box and any attributes /
+properties for many elements in ONE execute_script, instead of one WebDriver
+round-trip per get_attribute/.text/.is_displayed call.
+
+Kept free of seleniumbase imports so the crawlers can use it with a plain driver.
+
+Usage:
+    python -m common_utilities.element_snapshot bench --url https://... [--selector "//input"]
+"""
+
+import argparse
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+# attributes the crawlers record for every element
+CRAWL_ATTRS = ["id", "name", "placeholder", "aria-label", "class", "type", "data-icon"]
+
+# arguments: target (selector string or list of elements), attrs, props, scope element (or null)
+# returns: one dict (or null for non-elements) per target element, in document order
+JS_SNAPSHOT = r"""
+const target = arguments[0], attrs = arguments[1] || [], props = arguments[2] || [];
+const scope = arguments[3] || document;
+
+function attr(el, name) {
+  // same precedence as Selenium's get_attribute: property first, then attribute; null when absent
+  const prop = name === 'class' ? 'className' : name;
+  let p;
+  try { p = el[prop]; } catch (e) {}
+  const v = (p == null || typeof p === 'object') ? el.getAttribute(name) : p;
+  return v == null ? null : String(v);
+}
+
+function displayed(el) {
+  if (!el.isConnected) return false;
+  const st = getComputedStyle(el);
+  if (st.display === 'none' || st.visibility === 'hidden' || st.visibility === 'collapse') return false;
+  if (parseFloat(st.opacity) === 0) return false;
+  const r = el.getBoundingClientRect();
+  return r.width > 0 && r.height > 0;
+}
+
+function query(sel) {
+  const t = sel.trim();
+  const isXpath = t.startsWith('/') || t.startsWith('(') || t.startsWith('.') && t.includes('/') ||
+    sel.includes('[contains(') || sel.includes('@');
+  try {
+    if (!isXpath) return Array.from(scope.querySelectorAll(sel));
+    const snap = document.evaluate(sel, scope, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    const out = [];
+    for (let i = 0; i < snap.snapshotLength; i++) out.push(snap.snapshotItem(i));
+    return out;
+  } catch (e) { return []; }
+}
+
+const els = typeof target === 'string' ? query(target) : Array.from(target || []);
+return els.map(el => {
+  if (!el || el.nodeType !== 1) return null;
+  const shown = displayed(el);
+  const r = el.getBoundingClientRect();
+  const a = {}, p = {};
+  for (const n of attrs) a[n] = attr(el, n);
+  for (const n of props) {
+    let v;
+    try { v = el[n]; } catch (e) {}
+    p[n] = (v == null || typeof v === 'object' || typeof v === 'function') ? null : v;
+  }
+  return {
+    tag: el.tagName.toLowerCase(),
+    // like WebElement.text: rendered text only, empty for hidden elements
+    text: shown ? (el.innerText || el.textContent || '') : '',
+    displayed: shown,
+    rect: {x: r.x, y: r.y, width: r.width, height: r.height},
+    attrs: a,
+    props: p,
+  };
+});
+"""
+
+
+def snapshot(driver, target: Union[str, Sequence[Any]], attrs: Iterable[str] = (),
+             props: Iterable[str] = (), scope=None) -> List[Optional[Dict[str, Any]]]:
+    """
+    One round-trip snapshot of `target`: an XPath/CSS selector (evaluated under
+    `scope`, default the document) or a list of WebElements. Stale elements make
+    the whole call raise StaleElementReferenceException, like a single get_attribute would.
+    """
+    if not isinstance(target, str):
+        target = list(target)
+        if not target:
+            return []
+    return driver.execute_script(JS_SNAPSHOT, target, list(attrs), list(props), scope) or []
+
+
+# ---- Benchmark --------------------------------------------------------------
+
+class _RoundTrips:
+    """Counts WebDriver commands issued through one driver instance."""
+
+    def __init__(self, driver):
+        self.count = 0
+        original = driver.execute
+
+        def execute(*args, **kwargs):
+            self.count += 1
+            return original(*args, **kwargs)
+        driver.execute = execute
+
+
+def _bench(url: str, selector: str, limit: int, headless: bool) -> None:
+    from selenium import webdriver
+    from selenium.webdriver.common.by import By
+
+    options = webdriver.ChromeOptions()
+    if headless:
+        options.add_argument("--headless=new")
+    driver = webdriver.Chrome(options=options)
+    try:
+        driver.get(url)
+        counter = _RoundTrips(driver)
+        by = By.XPATH if selector.lstrip().startswith(("/", "(")) else By.CSS_SELECTOR
+        elements = driver.find_elements(by, selector)[:limit]
+        n = len(elements)
+
+        def per_element():
+            # the shape of the old loops: _score_element / extract_locators / kendo item reads
+            out = []
+            for el in elements:
+                row = {"tag": el.tag_name, "displayed": el.is_displayed(), "text": el.text}
+                row.update({a: el.get_attribute(a) for a in CRAWL_ATTRS})
+                out.append(row)
+            return out
+
+        def bulk():
+            return snapshot(driver, elements, CRAWL_ATTRS)
+
+        print(f"{n} element(s) matching {selector!r} on {url}")
+        print(f"{'operation':<34}{'round-trips':>12}{'per element':>13}{'ms':>10}")
+        for label, fn in (("per-element get_attribute loop", per_element), ("snapshot (one execute_script)", bulk)):
+            counter.count = 0
+            t0 = time.perf_counter()
+            fn()
+            ms = (time.perf_counter() - t0) * 1000
+            print(f"{label:<34}{counter.count:>12}{counter.count / max(n, 1):>13.2f}{ms:>10.1f}")
+    finally:
+        driver.quit()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    b = sub.add_parser("bench", help="round-trips per element: get_attribute loop vs snapshot")
+    b.add_argument("--url", required=True)
+    b.add_argument("--selector", default="//input | //button | //a")
+    b.add_argument("--limit", type=int, default=200)
+    b.add_argument("--headed", action="store_true")
+    args = parser.parse_args(argv)
+    _bench(args.url, args.selector, args.limit, headless=not args.headed)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
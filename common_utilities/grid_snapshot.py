@@ -0,0 +1,244 @@
+"""
+Kendo grid snapshots
+====================
+Reads a whole Kendo grid - header texts and sort state, every row's cell texts
+with their aria-colindex, row keys and the pager text - in ONE execute_script,
+and returns it as a small in-memory table (GridSnapshot) with column lookup by
+header name or aria-colindex. Replaces per-row find_elements + per-cell .text
+loops, which cost two or more round-trips per row.
+
+Like element_snapshot, kept free of seleniumbase imports.
+"""
+
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Union
+
+# pager buttons, shared with BasePage's page navigation script
+PAGER_NEXT = '.k-pager-nav[aria-label*="next" i], .k-pager-nav[title*="next" i], .k-pager-next'
+PAGER_FIRST = '.k-pager-nav[aria-label*="first" i], .k-pager-nav[title*="first" i], .k-pager-first'
+
+# arguments: [kind, selector] of any element inside the grid ("xpath" | "css"),
+#            or null for the first grid on the page; the PAGER_NEXT selector
+# returns: {found, headers: [{text, colindex, sort}], rows: [{key, cells: [{text, colindex}]}],
+#           pager: {info, page, pages, total, hasNext}, loading}
+#          - locked (frozen) columns are merged in front of the scrollable ones
+JS_GRID_SNAPSHOT = r"""
+const spec = arguments[0], nextSel = arguments[1];
+let el = null;
+try {
+  if (!spec) el = document.querySelector('kendo-grid, .k-grid');
+  else if (spec[0] === 'xpath')
+    el = document.evaluate(spec[1], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+  else el = document.querySelector(spec[1]);
+} catch (e) {}
+if (!el || el.nodeType !== 1) return {found: false, headers: [], rows: [], pager: null, loading: false};
+const root = el.closest('kendo-grid, .k-grid') || el.closest('table') || el;
+
+const text = n => (n.innerText || n.textContent || '').replace(/\s+/g, ' ').trim();
+const colindex = n => { const v = parseInt(n.getAttribute('aria-colindex'), 10); return isNaN(v) ? null : v; };
+const own = (scope, sel) => Array.from(scope.querySelectorAll(sel)).filter(n => n.closest('kendo-grid, .k-grid') === root ||
+  !root.matches('kendo-grid, .k-grid'));
+
+// leaf header cells: by aria-colindex (later header rows win over group headers,
+// locked and scrollable header tables merge), else the last header row in order
+const ths = own(root, 'thead th');
+const header = (th, ci) => ({text: text(th.querySelector('.k-column-title') || th), colindex: ci,
+  sort: th.getAttribute('aria-sort') || ''});
+let headers;
+if (ths.some(th => colindex(th) !== null)) {
+  const byIndex = new Map();
+  for (const th of ths) { const ci = colindex(th); if (ci !== null) byIndex.set(ci, th); }
+  headers = Array.from(byIndex.entries()).sort((a, b) => a[0] - b[0]).map(([ci, th]) => header(th, ci));
+} else {
+  const headerRows = own(root, 'thead tr');
+  const leaf = headerRows.length ? headerRows[headerRows.length - 1] : null;
+  headers = (leaf ? Array.from(leaf.querySelectorAll('th')) : []).map(th => header(th, null));
+}
+
+function bodyRows(scope) {
+  return own(scope, 'tbody tr').filter(tr =>
+    !tr.matches('.k-grouping-row, .k-detail-row, .k-grid-norecords, .k-no-records, .k-filter-row'));
+}
+const locked = root.querySelector('.k-grid-content-locked');
+const main = root.querySelector('.k-grid-content') || root;
+const lockedRows = locked ? bodyRows(locked) : [];
+const rows = bodyRows(main).filter(tr => !locked || !locked.contains(tr)).map((tr, i) => {
+  const tds = (lockedRows[i] ? Array.from(lockedRows[i].children) : []).concat(Array.from(tr.children))
+    .filter(c => c.tagName === 'TD');
+  const key = tr.getAttribute('data-kendo-grid-item-index') || tr.getAttribute('aria-rowindex') ||
+    tr.getAttribute('data-uid') || String(i);
+  return {key: key, cells: tds.map(td => ({text: text(td), colindex: colindex(td)}))};
+});
+
+// pager: "1 - 10 of 58 items" + the selected page button + whether "next" is enabled
+function pagerState() {
+  const pager = root.querySelector('kendo-pager, kendo-datapager, .k-pager, .k-pager-wrap');
+  const st = {info: null, page: null, pages: null, total: null, hasNext: false};
+  if (!pager) return st;
+  const infoEl = pager.querySelector('.k-pager-info');
+  st.info = infoEl ? text(infoEl) : null;
+  const num = v => parseInt(String(v).replace(/,/g, ''), 10);
+  const m = st.info && st.info.match(/(\d[\d,]*)\s*[-\u2013]\s*(\d[\d,]*)\D+(\d[\d,]*)/);
+  const selected = pager.querySelector('.k-pager-numbers .k-selected, .k-pager-numbers [aria-current="page"]');
+  const select = pager.querySelector('select[aria-label="Select page"], select.k-dropdown');
+  if (selected) st.page = num(text(selected)) || null;
+  else if (select && select.value) st.page = num(select.value) || null;
+  let lastPage = false;
+  if (m) {
+    const from = num(m[1]), to = num(m[2]);
+    st.total = num(m[3]);
+    lastPage = to >= st.total;
+    const size = to - from + 1;
+    if (!lastPage && size > 0) {
+      st.pages = Math.ceil(st.total / size);
+      if (st.page === null) st.page = Math.ceil(to / size);
+    } else if (lastPage && st.page !== null) st.pages = st.page;
+  }
+  const next = pager.querySelector(nextSel);
+  const enabled = !!next && !(next.classList.contains('k-disabled') || next.disabled ||
+    next.getAttribute('aria-disabled') === 'true');
+  st.hasNext = enabled && !lastPage;
+  return st;
+}
+
+return {
+  found: true,
+  headers: headers,
+  rows: rows,
+  pager: pagerState(),
+  loading: !!root.querySelector('.k-loading-mask, .k-loading-panel, .k-i-loading'),
+};
+"""
+
+ColumnKey = Union[int, str]
+
+
+def _fold(s: str) -> str:
+    return " ".join((s or "").split()).casefold()
+
+
+class GridRow(NamedTuple):
+    """One row met while paging through a grid (see BasePage.iter_grid_rows)."""
+    page: int                   # 1-based pager page the row was on
+    index: int                  # row index within that page
+    key: str                    # row key from the snapshot
+    record: Dict[str, str]      # {header text: cell text}
+
+    def cell(self, header: str) -> str:
+        """Cell text by header text, matched like GridSnapshot.colindex (exact, then unique prefix)."""
+        want = _fold(header)
+        for name, text in self.record.items():
+            if _fold(name) == want:
+                return text
+        prefixed = [text for name, text in self.record.items() if _fold(name).startswith(want)]
+        if len(prefixed) == 1:
+            return prefixed[0]
+        raise KeyError(f"No column {header!r} in row (headers: {list(self.record)})")
+
+
+class GridSnapshot:
+    """
+    Immutable read of one grid. Columns are addressed by header text (case- and
+    whitespace-insensitive; a unique prefix also matches) or by 1-based
+    aria-colindex, which is also the position of the cell in its row when the
+    grid does not render aria-colindex.
+    """
+
+    def __init__(self, data: Dict[str, Any]):
+        self.found: bool = bool(data.get("found"))
+        self.headers: List[str] = [h.get("text") or "" for h in data.get("headers") or []]
+        self.sort_states: List[str] = [h.get("sort") or "" for h in data.get("headers") or []]
+        self._header_colindex: List[int] = [h.get("colindex") or i + 1
+                                            for i, h in enumerate(data.get("headers") or [])]
+        self.row_keys: List[str] = []
+        self._rows: List[Dict[int, str]] = []
+        for r in data.get("rows") or []:
+            self.row_keys.append(str(r.get("key")))
+            self._rows.append({(c.get("colindex") or i + 1): c.get("text") or ""
+                               for i, c in enumerate(r.get("cells") or [])})
+        pager = data.get("pager") or {}
+        self.pager: Optional[str] = pager.get("info")      # "1 - 10 of 58 items"
+        self.page: Optional[int] = pager.get("page")
+        self.pages: Optional[int] = pager.get("pages")
+        self.total: Optional[int] = pager.get("total")
+        self.has_next: bool = bool(pager.get("hasNext"))
+        self.loading: bool = bool(data.get("loading"))
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __iter__(self) -> Iterator[Dict[str, str]]:
+        return iter(self.records())
+
+    def __repr__(self) -> str:
+        return f"GridSnapshot({len(self)} rows, headers={self.headers})"
+
+    # -- columns --
+    def colindex(self, key: ColumnKey) -> int:
+        """aria-colindex for a header text or colindex; KeyError if no such column."""
+        if isinstance(key, int):
+            return key
+        want = _fold(key)
+        folded = [_fold(h) for h in self.headers]
+        if want in folded:
+            return self._header_colindex[folded.index(want)]
+        prefixed = [i for i, h in enumerate(folded) if h.startswith(want)]
+        if len(prefixed) == 1:
+            return self._header_colindex[prefixed[0]]
+        raise KeyError(f"No column {key!r} in grid (headers: {self.headers})")
+
+    def column(self, key: ColumnKey) -> List[str]:
+        """Cell texts of one column, top to bottom ("" where a row has no such cell)."""
+        ci = self.colindex(key)
+        return [row.get(ci, "") for row in self._rows]
+
+    def sort_state(self, key: ColumnKey) -> str:
+        """The header's aria-sort ("ascending" / "descending" / "none" / "")."""
+        ci = self.colindex(key)
+        if ci in self._header_colindex:
+            return self.sort_states[self._header_colindex.index(ci)]
+        return ""
+
+    # -- rows --
+    def cell(self, row: int, key: ColumnKey) -> str:
+        return self._rows[row].get(self.colindex(key), "")
+
+    def record(self, row: int) -> Dict[str, str]:
+        """One row as {header text: cell text}."""
+        cells = self._rows[row]
+        return {h: cells.get(ci, "") for h, ci in zip(self.headers, self._header_colindex)}
+
+    def records(self) -> List[Dict[str, str]]:
+        return [self.record(i) for i in range(len(self._rows))]
+
+    def row_texts(self, row: int) -> List[str]:
+        """All cell texts of a row in colindex order (including cells without a header)."""
+        cells = self._rows[row]
+        return [cells[ci] for ci in sorted(cells)]
+
+    def find_rows(self, predicate: Callable[[Dict[str, str]], bool]) -> List[int]:
+        """Indexes of the rows whose record() satisfies `predicate`."""
+        return [i for i in range(len(self._rows)) if predicate(self.record(i))]
+
+    def grid_rows(self, page: Optional[int] = None) -> List[GridRow]:
+        """The rows as GridRow tuples, labelled with `page` (default: the pager's page, else 1)."""
+        page = page or self.page or 1
+        return [GridRow(page, i, self.row_keys[i], self.record(i)) for i in range(len(self._rows))]
+
+    def find_rows_containing(self, needle: str, columns: Sequence[ColumnKey] = ()) -> List[int]:
+        """Rows where any cell (or any of `columns`) contains `needle`, case-insensitively."""
+        want = _fold(needle)
+        cols = [self.colindex(c) for c in columns]
+        out = []
+        for i, cells in enumerate(self._rows):
+            texts = [cells.get(ci, "") for ci in cols] if cols else cells.values()
+            if any(want in _fold(t) for t in texts):
+                out.append(i)
+        return out
+
+
+def read_grid(driver, spec: Optional[Sequence[str]] = None) -> GridSnapshot:
+    """
+    One round-trip snapshot of the grid containing the element `spec`
+    (["xpath" | "css", selector]); the first grid on the page when spec is None.
+    """
+    return GridSnapshot(driver.execute_script(JS_GRID_SNAPSHOT, list(spec) if spec else None, PAGER_NEXT) or {})
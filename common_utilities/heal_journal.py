@@ -0,0 +1,268 @@
+"""
+Healed-locator journal
+======================
+Heal/unheal events are appended to a per-worker JSON-lines journal instead of
+rewriting self_healed/<page>.json inside the test. The journals are compacted
+into the healed JSON files once, at session end, with an atomic rename.
+
+Usage:
+    python -m common_utilities.heal_journal status             # pending journals/records
+    python -m common_utilities.heal_journal replay             # print what compaction would do
+    python -m common_utilities.heal_journal compact [--run ID] # apply journals to self_healed/*.json
+"""
+
+import argparse
+import contextlib
+import glob
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional
+
+from common_utilities.locator_store import HEALED_DIR, page_paths
+from common_utilities.path_settings import PathSettings
+
+JOURNAL_ENABLED = os.environ.get("SA_HEAL_JOURNAL", "1") == "1"
+JOURNAL_DIR = os.path.join(PathSettings.CACHE_DIR, "heal_journal")
+
+
+def is_xpath(selector: str) -> bool:
+    return selector.strip().startswith(("//", "(", ".//"))
+
+
+def apply_heal(healed: Dict[str, Any], name: str, selector: str) -> None:
+    """Record `selector` as the healed locator for `name` (same shape _persist_healed always wrote)."""
+    s = selector.strip()
+    entry = dict(healed.get(name, {}))
+    # keep alternates (dedup, cap)
+    entry["alternates"] = list(dict.fromkeys([s] + entry.get("alternates", [])))[:10]
+    # store under the right key (prefer xpath; resolve() already tries xpath then css)
+    if is_xpath(s):
+        entry["xpath"] = s
+        entry.pop("css", None)
+    else:
+        entry["css"] = s
+        entry.pop("xpath", None)
+    healed[name] = entry
+
+
+def apply_record(healed: Dict[str, Any], rec: Dict[str, Any]) -> None:
+    if rec["op"] == "heal":
+        apply_heal(healed, rec["name"], rec["selector"])
+    elif rec["op"] == "unheal":
+        healed.pop(rec["name"], None)
+
+
+def read_healed(page: str) -> Dict[str, Any]:
+    _, path = page_paths(page)
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f) or {}
+    except Exception:
+        return {}
+
+
+def write_healed(page: str, data: Dict[str, Any]) -> None:
+    """Atomically replace self_healed/<page>.json (or remove it when empty)."""
+    _, path = page_paths(page)
+    if not data:
+        with contextlib.suppress(Exception):
+            os.remove(path)
+        return
+    os.makedirs(HEALED_DIR, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f".{page}.", suffix=".tmp", dir=HEALED_DIR)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        os.replace(tmp, path)
+    except Exception:
+        with contextlib.suppress(Exception):
+            os.remove(tmp)
+        raise
+
+
+class HealJournal:
+    """Append-only journal for this process; also remembers its own pending ops per page."""
+
+    def __init__(self, directory: str = JOURNAL_DIR):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._pending: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+
+    def _path(self) -> str:
+        run_id = os.environ.get("SA_RUN_ID", "norun")
+        worker = os.environ.get("PYTEST_XDIST_WORKER", "master")
+        return os.path.join(self.directory, f"{run_id}-{worker}-{os.getpid()}.jsonl")
+
+    def append(self, op: str, page: str, name: str, selector: Optional[str] = None) -> None:
+        with self._lock:
+            self._seq += 1
+            rec = {"op": op, "page": page, "name": name, "ts": time.time(), "seq": self._seq}
+            if selector is not None:
+                rec["selector"] = selector
+            os.makedirs(self.directory, exist_ok=True)
+            # one line per record; the file is private to this process, so no file lock
+            with open(self._path(), "a", encoding="utf-8") as f:
+                f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+            self._pending[page].append(rec)
+
+    def pending(self, page: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._pending.get(page, ()))
+
+    def generation(self, page: str) -> int:
+        """Changes whenever this process journals something for `page` (registry cache key)."""
+        with self._lock:
+            return len(self._pending.get(page, ()))
+
+    def effective_healed(self, page: str) -> Dict[str, Any]:
+        """Healed JSON as it will look after compaction of this process' journal."""
+        healed = read_healed(page)
+        for rec in self.pending(page):
+            apply_record(healed, rec)
+        return healed
+
+
+class HealOverlay(Mapping):
+    """Locator view with this process' not-yet-compacted heal/unheal ops applied on top."""
+
+    def __init__(self, view: Mapping, page: str, ops: List[Dict[str, Any]]):
+        self._view = view
+        self._page = page
+        self._ops: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for rec in ops:
+            self._ops[rec["name"]].append(rec)
+        self._entries: Dict[str, Any] = {}
+        self._base: Optional[Dict[str, Any]] = None
+        self._healed: Optional[Dict[str, Any]] = None
+
+    def __getitem__(self, name: str):
+        if name not in self._ops:
+            return self._view[name]
+        if name not in self._entries:
+            # rebuild the entry exactly as load_page_json() will after compaction
+            if self._base is None:
+                raw_path, _ = page_paths(self._page)
+                with open(raw_path, "r", encoding="utf-8") as f:
+                    self._base = json.load(f)
+                self._healed = read_healed(self._page)
+            healed = {name: self._healed[name]} if name in self._healed else {}
+            for rec in self._ops[name]:
+                apply_record(healed, rec)
+            base, override = self._base.get(name), healed.get(name)
+            if isinstance(base, dict) and isinstance(override, dict):
+                entry = {**base, **override}
+            else:
+                entry = override if override is not None else base
+            if entry is None:
+                raise KeyError(name)
+            self._entries[name] = entry
+        return self._entries[name]
+
+    def __iter__(self) -> Iterator[str]:
+        seen = set()
+        for name in self._view:
+            seen.add(name)
+            yield name
+        for name in self._ops:
+            if name not in seen and name in self:
+                yield name
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __contains__(self, name) -> bool:
+        try:
+            self[name]
+            return True
+        except KeyError:
+            return False
+
+
+_journal = HealJournal()
+
+
+def get_journal() -> Optional[HealJournal]:
+    """Process-wide journal (None when disabled via SA_HEAL_JOURNAL=0)."""
+    return _journal if JOURNAL_ENABLED else None
+
+
+# ---- Compaction -------------------------------------------------------------
+
+def journal_files(run_id: Optional[str] = None, directory: str = JOURNAL_DIR) -> List[str]:
+    pattern = f"{run_id}-*.jsonl" if run_id else "*.jsonl"
+    return sorted(glob.glob(os.path.join(directory, pattern)))
+
+
+def read_records(files: List[str]) -> List[Dict[str, Any]]:
+    """All records from `files`, in event order. A torn last line (crashed worker) is skipped."""
+    records = []
+    for path in files:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    print(f"[heal-journal] skipping unreadable line in {os.path.basename(path)}")
+    records.sort(key=lambda r: (r.get("ts", 0), r.get("seq", 0)))
+    return records
+
+
+def compact(run_id: Optional[str] = None, directory: str = JOURNAL_DIR, dry_run: bool = False) -> Dict[str, int]:
+    """Fold journals into self_healed/<page>.json; returns {page: records applied}."""
+    files = journal_files(run_id, directory)
+    by_page: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for rec in read_records(files):
+        by_page[rec["page"]].append(rec)
+
+    for page, recs in by_page.items():
+        healed = read_healed(page)
+        for rec in recs:
+            apply_record(healed, rec)
+        if dry_run:
+            print(f"{page}: {len(recs)} record(s) -> {len(healed)} healed locator(s)")
+            for rec in recs:
+                print(f"   {rec['op']:<7} {rec['name']}  {rec.get('selector', '')}")
+        else:
+            write_healed(page, healed)
+
+    if not dry_run:
+        for path in files:
+            with contextlib.suppress(Exception):
+                os.remove(path)
+    return {page: len(recs) for page, recs in by_page.items()}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("cmd", choices=["status", "replay", "compact"])
+    parser.add_argument("--run", help="only journals from this SA_RUN_ID")
+    parser.add_argument("--dir", default=JOURNAL_DIR, help="journal directory")
+    args = parser.parse_args(argv)
+
+    files = journal_files(args.run, args.dir)
+    if args.cmd == "status":
+        for path in files:
+            with open(path, "r", encoding="utf-8") as f:
+                print(f"{os.path.basename(path)}: {sum(1 for _ in f)} record(s)")
+        print(f"{len(files)} journal file(s) in {args.dir}")
+    elif args.cmd == "replay":
+        compact(args.run, args.dir, dry_run=True)
+    else:
+        done = compact(args.run, args.dir)
+        print(f"compacted {sum(done.values())} record(s) into {len(done)} page(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,85 @@
+"""
+Kendo dropdown select microbenchmark
+====================================
+Times kendo_dd_select_text (direct select by index in the widget's data, popup
+paging as fallback) against kendo_dd_select_text_old (filter box + paging) on
+a live dropdown, and counts the WebDriver round-trips each selection costs.
+
+Logs in with the configured settings (settings.cfg / DIMAGIQA_*), opens --url,
+clicks the --click logical names in order (e.g. to open a form) and then selects
+the --values alternately, so every selection is an actual change.
+
+Usage:
+    python -m common_utilities.kendo_select_bench --page patients --name <logical_name> \
+        --values "Option A" "Option B" [--url URL] [--click NAME ...] [--reps 3] [--headed]
+"""
+
+import argparse
+import statistics
+import time
+from typing import Callable, Dict, List
+
+from common_utilities.element_snapshot import _RoundTrips
+
+
+def _bench(args) -> None:
+    from seleniumbase import SB
+
+    from common_utilities.load_settings import load_settings
+    from common_utilities.base_page import BasePage
+    from testPages.login_page.login_page import LoginPage
+
+    settings = load_settings()
+    with SB(headless=not args.headed) as sb:
+        login = LoginPage(sb, "login")
+        login.launch_browser(settings["url"])
+        login.login(settings["login_username"], settings["login_password"])
+        page = BasePage(sb, args.page)
+        if args.url:
+            page.launch_url(args.url)
+            page.wait_for_page_to_load()
+        for name in args.click or []:
+            page.click(name)
+        counter = _RoundTrips(sb.driver)
+
+        variants: Dict[str, Callable[[str], bool]] = {
+            "kendo_dd_select_text": lambda v: page.kendo_dd_select_text(args.name, v),
+            "kendo_dd_select_text_old": lambda v: page.kendo_dd_select_text_old(args.name, v),
+        }
+        results: Dict[str, Dict[str, List[float]]] = {k: {"ms": [], "rt": []} for k in variants}
+        for _ in range(args.reps):
+            for label, fn in variants.items():
+                for value in args.values:
+                    counter.count = 0
+                    t0 = time.perf_counter()
+                    fn(value)
+                    results[label]["ms"].append((time.perf_counter() - t0) * 1000)
+                    results[label]["rt"].append(counter.count)
+                    got = page.kendo_dd_get_selected_text(args.name)
+                    if got.strip().lower() != value.strip().lower():
+                        print(f"[kendo-bench] {label}: selected {got!r}, expected {value!r}")
+
+        n = args.reps * len(args.values)
+        print(f"{n} selection(s) per variant on '{args.page}/{args.name}'")
+        print(f"{'variant':<28}{'median ms':>11}{'max ms':>10}{'round-trips':>13}")
+        for label, r in results.items():
+            print(f"{label:<28}{statistics.median(r['ms']):>11.0f}{max(r['ms']):>10.0f}"
+                  f"{statistics.median(r['rt']):>13.0f}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--page", required=True, help="locator page the dropdown is defined on")
+    parser.add_argument("--name", required=True, help="logical name of the dropdown")
+    parser.add_argument("--values", nargs="+", required=True, help="option texts to select in turn")
+    parser.add_argument("--url", help="page to open after login (default: the dashboard)")
+    parser.add_argument("--click", nargs="*", help="logical names to click before selecting")
+    parser.add_argument("--reps", type=int, default=3)
+    parser.add_argument("--headed", action="store_true")
+    args = parser.parse_args(argv)
+    _bench(args)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,278 @@
+"""
+Locator-file optimizer
+======================
+Offline analyzer/rewriter for the crawler output in self_healing_locators/*.json.
+
+  * generic   - entries whose selectors are all generic (BasePage._looks_generic_xpath:
+                //div, //p[1], class-only) and that carry nothing else the healer can
+                anchor on (id/name/aria-label/short text/...). They can never resolve
+                uniquely and only send resolve() down the slow healing path.
+  * duplicate - several logical names sharing one primary selector; unreferenced copies
+                are merged into one survivor (alternates folded in).
+  * capped    - contains(normalize-space(...), '<whole page text>') predicates; the
+                literal is cut to its first line / --text-cap chars. Multi-line literals
+                can never match normalize-space() output anyway.
+
+Names referenced from testPages/ (string literals and f-string prefixes) or present in
+self_healed/ are never removed, only flagged.
+
+Usage:
+    python -m common_utilities.locator_optimizer                 # report only
+    python -m common_utilities.locator_optimizer -v login        # list flagged names
+    python -m common_utilities.locator_optimizer --write         # rewrite the JSON files
+"""
+
+import argparse
+import ast
+import json
+import os
+import re
+import tempfile
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from common_utilities.locator_store import LOCATORS_DIR, list_pages, page_paths
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_REF_DIRS = [os.path.join(REPO_ROOT, "testPages")]
+TEXT_CAP = 60
+
+# attributes _candidates_for() builds real candidates from (class alone is not enough)
+ANCHOR_ATTRS = ["id", "data-testid", "name", "type", "placeholder", "aria-label", "title",
+                "role", "data-id", "data-value", "aria-colindex", "label"]
+
+_TEXT_PREDICATE = re.compile(
+    r"contains\(\s*normalize-space\(\s*(text\(\))?\s*\)\s*,\s*('([^']*)'|\"([^\"]*)\")\s*\)", re.S)
+_GENERIC_CSS = re.compile(r"^[A-Za-z][\w-]*$|^[A-Za-z]*(\.[\w-]+)+$")
+
+
+def _generic_xpath(xp: str) -> bool:
+    # imported lazily: base_page pulls in selenium/seleniumbase
+    from common_utilities.base_page import BasePage
+    return BasePage._looks_generic_xpath(xp)
+
+
+def _xpath_literal(s: str) -> str:
+    from common_utilities.base_page import _xpath_literal
+    return _xpath_literal(s)
+
+
+# ---- References -------------------------------------------------------------
+
+class References:
+    """String literals (and constant f-string prefixes) found in the page-object sources."""
+
+    def __init__(self, dirs: Iterable[str]):
+        self.names: Set[str] = set()
+        self.prefixes: Set[str] = set()
+        for d in dirs:
+            for root, _, files in os.walk(d):
+                for fn in files:
+                    if fn.endswith(".py"):
+                        self._scan(os.path.join(root, fn))
+
+    def _scan(self, path: str) -> None:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                tree = ast.parse(f.read(), filename=path)
+        except (SyntaxError, UnicodeDecodeError) as e:
+            print(f"[optimizer] skipping {path}: {e}")
+            return
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Constant) and isinstance(node.value, str):
+                self.names.add(node.value)
+            elif isinstance(node, ast.JoinedStr) and node.values:
+                head = node.values[0]
+                # f"kendo-switch_{flag}" -> anything starting with "kendo-switch_"
+                if isinstance(head, ast.Constant) and isinstance(head.value, str) and len(head.value) >= 3:
+                    self.prefixes.add(head.value)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.names or any(name.startswith(p) for p in self.prefixes)
+
+
+# ---- Rules ------------------------------------------------------------------
+
+def _selectors(entry: Dict[str, Any]) -> List[str]:
+    sels = [entry.get("xpath"), entry.get("css"), *entry.get("alternates", [])]
+    return [s for s in sels if s]
+
+
+def _is_generic_selector(sel: str) -> bool:
+    s = sel.strip()
+    if s.startswith(("//", "(", ".//")):
+        return _generic_xpath(s)
+    return bool(_GENERIC_CSS.match(s))
+
+
+def is_unusable(entry: Dict[str, Any], text_cap: int = TEXT_CAP) -> bool:
+    """All selectors generic and no attribute the healer could build a unique candidate from."""
+    if not isinstance(entry, dict):
+        return False
+    sels = _selectors(entry)
+    if not sels or not all(_is_generic_selector(s) for s in sels):
+        return False
+    if any(entry.get(a) for a in ANCHOR_ATTRS):
+        return False
+    text = re.sub(r"\s+", " ", entry.get("text") or "").strip()
+    return not (text and len(text) <= text_cap)
+
+
+def _cap_text(text: str, cap: int) -> str:
+    first = next((ln for ln in text.splitlines() if ln.strip()), text)
+    s = re.sub(r"\s+", " ", first).strip()
+    if len(s) > cap:
+        s = s[:cap].rsplit(" ", 1)[0] or s[:cap]
+    return s
+
+
+def cap_text_predicates(xpath: str, cap: int = TEXT_CAP) -> str:
+    """Shorten contains(normalize-space(...), '...') literals that are multi-line or longer than cap."""
+    def _sub(m: re.Match) -> str:
+        lit = m.group(3) if m.group(3) is not None else m.group(4)
+        if "\n" not in lit and len(lit) <= cap:
+            return m.group(0)
+        fn = "normalize-space(text())" if m.group(1) else "normalize-space()"
+        return f"contains({fn}, {_xpath_literal(_cap_text(lit, cap))})"
+    return _TEXT_PREDICATE.sub(_sub, xpath)
+
+
+class PageReport:
+    def __init__(self, page: str):
+        self.page = page
+        self.before_bytes = self.after_bytes = 0
+        self.before_count = self.after_count = 0
+        self.referenced = 0
+        self.generic: List[str] = []          # removed
+        self.generic_kept: List[str] = []     # flagged but referenced/healed
+        self.merged: List[Tuple[str, str]] = []
+        self.dup_kept: List[Tuple[str, str]] = []
+        self.capped: List[str] = []
+
+
+def optimize_page(page: str, refs: References, text_cap: int = TEXT_CAP) -> Tuple[Dict[str, Any], PageReport]:
+    raw_path, healed_path = page_paths(page)
+    with open(raw_path, "r", encoding="utf-8") as f:
+        raw = f.read()
+    data: Dict[str, Any] = json.loads(raw)
+    healed: Dict[str, Any] = {}
+    if os.path.exists(healed_path):
+        with open(healed_path, "r", encoding="utf-8") as f:
+            healed = json.load(f) or {}
+
+    rep = PageReport(page)
+    rep.before_bytes, rep.before_count = len(raw.encode("utf-8")), len(data)
+    protected = {n for n in data if n in refs or n in healed}
+    rep.referenced = sum(1 for n in data if n in refs)
+
+    out: Dict[str, Any] = {}
+    for name, entry in data.items():
+        if is_unusable(entry, text_cap):
+            if name in protected:
+                rep.generic_kept.append(name)
+            else:
+                rep.generic.append(name)
+                continue
+        if isinstance(entry, dict):
+            entry = dict(entry)
+            if entry.get("xpath"):
+                capped = cap_text_predicates(entry["xpath"], text_cap)
+                if capped != entry["xpath"]:
+                    entry["xpath"] = capped
+                    rep.capped.append(name)
+            if entry.get("alternates"):
+                entry["alternates"] = list(dict.fromkeys(cap_text_predicates(a, text_cap)
+                                                         for a in entry["alternates"]))
+        out[name] = entry
+
+    # duplicates: group by primary selector; protected names win, else first in file order
+    groups: Dict[str, List[str]] = {}
+    for name, entry in out.items():
+        if isinstance(entry, dict):
+            primary = (entry.get("xpath") or entry.get("css") or "").strip()
+            if primary:
+                groups.setdefault(primary, []).append(name)
+    for names in groups.values():
+        if len(names) < 2:
+            continue
+        keep = next((n for n in names if n in protected), names[0])
+        for n in names:
+            if n == keep:
+                continue
+            if n in protected:
+                rep.dup_kept.append((n, keep))
+                continue
+            alts = out[keep].get("alternates", []) + out[n].get("alternates", [])
+            if alts:
+                out[keep]["alternates"] = list(dict.fromkeys(alts))[:10]
+            del out[n]
+            rep.merged.append((n, keep))
+
+    rep.after_count = len(out)
+    rep.after_bytes = len(json.dumps(out, indent=2).encode("utf-8"))
+    return out, rep
+
+
+def write_page(page: str, data: Dict[str, Any]) -> None:
+    raw_path, _ = page_paths(page)
+    fd, tmp = tempfile.mkstemp(prefix=f".{page}.", suffix=".tmp", dir=LOCATORS_DIR)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp, raw_path)
+    except Exception:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+# ---- CLI --------------------------------------------------------------------
+
+def _print_details(rep: PageReport) -> None:
+    for n in rep.generic:
+        print(f"   - generic   {n}")
+    for n in rep.generic_kept:
+        print(f"   ! generic   {n}  (kept: referenced/healed)")
+    for n, keep in rep.merged:
+        print(f"   - duplicate {n} -> {keep}")
+    for n, keep in rep.dup_kept:
+        print(f"   ! duplicate {n} == {keep}  (kept: referenced/healed)")
+    for n in rep.capped:
+        print(f"   ~ capped    {n}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("pages", nargs="*", help="page names (default: all)")
+    parser.add_argument("--write", action="store_true", help="rewrite the JSON files in place")
+    parser.add_argument("--text-cap", type=int, default=TEXT_CAP, help="max chars kept in a text predicate")
+    parser.add_argument("--refs", action="append", help="extra source dir scanned for logical names")
+    parser.add_argument("-v", "--verbose", action="store_true", help="list flagged names per page")
+    args = parser.parse_args(argv)
+
+    refs = References(DEFAULT_REF_DIRS + (args.refs or []))
+    reports = []
+    print(f"{'page':<28}{'entries':>13}{'referenced':>11}{'generic':>9}{'dups':>6}{'capped':>8}{'size KB':>19}")
+    for page in args.pages or list_pages():
+        data, rep = optimize_page(page, refs, args.text_cap)
+        reports.append(rep)
+        print(f"{page:<28}{rep.before_count:>6} -> {rep.after_count:<5}{rep.referenced:>10}"
+              f"{len(rep.generic):>9}{len(rep.merged):>6}{len(rep.capped):>8}"
+              f"{rep.before_bytes / 1024:>9.1f} -> {rep.after_bytes / 1024:<7.1f}")
+        if args.verbose:
+            _print_details(rep)
+        if args.write and (rep.after_count != rep.before_count or rep.capped):
+            write_page(page, data)
+
+    before = sum(r.before_bytes for r in reports)
+    after = sum(r.after_bytes for r in reports)
+    print(f"{'TOTAL':<28}{sum(r.before_count for r in reports):>6} -> {sum(r.after_count for r in reports):<5}"
+          f"{sum(r.referenced for r in reports):>10}{sum(len(r.generic) for r in reports):>9}"
+          f"{sum(len(r.merged) for r in reports):>6}{sum(len(r.capped) for r in reports):>8}"
+          f"{before / 1024:>9.1f} -> {after / 1024:<7.1f}")
+    print(f"{'written' if args.write else 'dry run (use --write to apply)'}; "
+          f"{len(refs.names)} literals / {len(refs.prefixes)} f-string prefixes scanned for references")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,84 @@
+"""Process-wide registry of merged page locators, reloaded only when the JSON changes."""
+
+import os
+import threading
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Tuple
+
+from common_utilities.heal_journal import HealOverlay, get_journal
+from common_utilities.locator_store import get_store, load_page_json, page_paths
+
+
+def _file_sig(path: str) -> Tuple[int, int]:
+    try:
+        st = os.stat(path)
+        return st.st_mtime_ns, st.st_size
+    except OSError:
+        return 0, 0
+
+
+class LocatorRegistry:
+    """
+    Memoizes one read-only locator view per page for the whole process, so
+    identical page objects (LoginPage(self, "login") in every test) share it.
+
+    A page is reloaded only when the base or self_healed/<page>.json mtime/size
+    changes, or this process journals a heal/unheal for it (those ops are
+    overlaid until the session compacts them into self_healed/). Loads happen
+    under a lock, so threads in a worker never load the same page twice or
+    observe a half-built view.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._pages: Dict[str, Tuple[Tuple, Mapping[str, Any]]] = {}
+        self.loads = 0
+        self.hits = 0
+
+    def _load(self, page: str) -> Mapping[str, Any]:
+        store = get_store()
+        if store is not None:
+            try:
+                view = store.page_view(page)
+            except FileNotFoundError:
+                raise
+            except Exception as e:
+                print(f"[locators] compiled store unavailable for '{page}' ({e}); reading JSON")
+                view = MappingProxyType(load_page_json(page))
+        else:
+            view = MappingProxyType(load_page_json(page))
+        journal = get_journal()
+        ops = journal.pending(page) if journal is not None else []
+        return HealOverlay(view, page, ops) if ops else view
+
+    def get(self, page: str) -> Mapping[str, Any]:
+        raw_path, healed_path = page_paths(page)
+        journal = get_journal()
+        sig = (_file_sig(raw_path), _file_sig(healed_path), journal.generation(page) if journal is not None else 0)
+        with self._lock:
+            cached = self._pages.get(page)
+            if cached and cached[0] == sig:
+                self.hits += 1
+                return cached[1]
+            view = self._load(page)
+            self._pages[page] = (sig, view)
+            self.loads += 1
+            return view
+
+    def invalidate(self, page: str = None) -> None:
+        with self._lock:
+            if page is None:
+                self._pages.clear()
+            else:
+                self._pages.pop(page, None)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"loads": self.loads, "hits": self.hits, "pages": len(self._pages)}
+
+
+_registry = LocatorRegistry()
+
+
+def get_registry() -> LocatorRegistry:
+    return _registry
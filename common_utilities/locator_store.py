@@ -0,0 +1,258 @@
+"""
+Compiled locator store
+======================
+Compiles self_healing_locators/<page>.json (+ self_healed/<page>.json) into one
+indexed SQLite file so page objects don't json.load and deep-merge megabytes of
+JSON every time they're constructed. Entries are fetched lazily per logical name.
+
+Usage:
+    python -m common_utilities.locator_store build           # (re)compile changed pages
+    python -m common_utilities.locator_store bench -n 20     # JSON vs store startup cost
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from common_utilities.path_settings import PathSettings
+
+STORE_ENABLED = os.environ.get("SA_LOCATOR_STORE", "1") == "1"
+STORE_PATH = os.path.join(PathSettings.CACHE_DIR, "locators.sqlite3")
+LOCATORS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "self_healing_locators")
+HEALED_DIR = os.path.join(LOCATORS_DIR, "self_healed")
+
+
+def page_paths(page: str) -> Tuple[str, str]:
+    return os.path.join(LOCATORS_DIR, f"{page}.json"), os.path.join(HEALED_DIR, f"{page}.json")
+
+
+def _mtime(path: str) -> float:
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return 0.0
+
+
+def load_page_json(page: str) -> Dict[str, Any]:
+    """Parse the base JSON and deep-merge the healed overrides on top (the uncompiled path)."""
+    raw_path, healed_path = page_paths(page)
+    if not os.path.exists(raw_path):
+        raise FileNotFoundError(f"Locator file not found: {raw_path}")
+
+    with open(raw_path, "r", encoding="utf-8") as f:
+        base = json.load(f)
+
+    if os.path.exists(healed_path):
+        with open(healed_path, "r", encoding="utf-8") as f:
+            healed = json.load(f)
+        # Deep-merge each locator so we KEEP tag/class/aria-colindex from base
+        for k, v in healed.items():
+            if isinstance(v, dict) and isinstance(base.get(k), dict):
+                base[k] = {**base[k], **v}
+            else:
+                base[k] = v
+
+    return base
+
+
+def list_pages() -> List[str]:
+    return sorted(f[:-5] for f in os.listdir(LOCATORS_DIR) if f.endswith(".json"))
+
+
+class LocatorStore:
+    """Thin, thread-safe wrapper over the compiled SQLite file."""
+
+    def __init__(self, path: str = STORE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS pages (
+                    page TEXT PRIMARY KEY, base_mtime REAL, healed_mtime REAL)
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS locators (
+                    page TEXT NOT NULL, name TEXT NOT NULL, data TEXT NOT NULL,
+                    PRIMARY KEY (page, name)) WITHOUT ROWID
+            """)
+            self._conn = conn
+        return self._conn
+
+    def is_current(self, page: str) -> bool:
+        raw_path, healed_path = page_paths(page)
+        with self._lock:
+            row = self._db().execute(
+                "SELECT base_mtime, healed_mtime FROM pages WHERE page=?", (page,)).fetchone()
+        return bool(row) and row[0] == _mtime(raw_path) and row[1] == _mtime(healed_path)
+
+    def compile_page(self, page: str) -> int:
+        """Merge and (re)write one page; returns the number of logical names stored."""
+        raw_path, healed_path = page_paths(page)
+        # stat before reading so a concurrent heal shows up as stale on the next check
+        base_mtime, healed_mtime = _mtime(raw_path), _mtime(healed_path)
+        merged = load_page_json(page)
+        rows = [(page, name, json.dumps(entry, ensure_ascii=False)) for name, entry in merged.items()]
+        with self._lock:
+            db = self._db()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                db.execute("DELETE FROM locators WHERE page=?", (page,))
+                db.executemany("INSERT INTO locators VALUES (?, ?, ?)", rows)
+                db.execute("INSERT OR REPLACE INTO pages VALUES (?, ?, ?)", (page, base_mtime, healed_mtime))
+                db.execute("COMMIT")
+            except Exception:
+                db.execute("ROLLBACK")
+                raise
+        return len(rows)
+
+    def build(self, pages: Optional[List[str]] = None, force: bool = False) -> Dict[str, int]:
+        """Compile every page whose source files changed since the last build."""
+        done = {}
+        for page in pages or list_pages():
+            if force or not self.is_current(page):
+                done[page] = self.compile_page(page)
+        return done
+
+    def names(self, page: str) -> List[str]:
+        with self._lock:
+            return [r[0] for r in self._db().execute(
+                "SELECT name FROM locators WHERE page=? ORDER BY name", (page,))]
+
+    def fetch(self, page: str, name: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._db().execute(
+                "SELECT data FROM locators WHERE page=? AND name=?", (page, name)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def page_view(self, page: str) -> "LazyLocators":
+        """Lazy mapping for one page, recompiling it first if its JSON changed."""
+        raw_path, _ = page_paths(page)
+        if not os.path.exists(raw_path):
+            raise FileNotFoundError(f"Locator file not found: {raw_path}")
+        if not self.is_current(page):
+            self.compile_page(page)
+        return LazyLocators(self, page)
+
+
+class LazyLocators(Mapping):
+    """Read-only, dict-like view of one page; entries are decoded on first access."""
+
+    def __init__(self, store: LocatorStore, page: str):
+        self._store = store
+        self._page = page
+        self._entries: Dict[str, Any] = {}
+        self._missing = set()
+        self._names: Optional[List[str]] = None
+
+    def __getitem__(self, name: str) -> Dict[str, Any]:
+        if name in self._entries:
+            return self._entries[name]
+        if name in self._missing:
+            raise KeyError(name)
+        entry = self._store.fetch(self._page, name)
+        if entry is None:
+            self._missing.add(name)
+            raise KeyError(name)
+        self._entries[name] = entry
+        return entry
+
+    def __contains__(self, name) -> bool:
+        try:
+            self[name]
+            return True
+        except KeyError:
+            return False
+
+    def __iter__(self) -> Iterator[str]:
+        if self._names is None:
+            self._names = self._store.names(self._page)
+        return iter(self._names)
+
+    def __len__(self) -> int:
+        if self._names is None:
+            self._names = self._store.names(self._page)
+        return len(self._names)
+
+    def __repr__(self) -> str:
+        return f"<LazyLocators page={self._page!r} loaded={len(self._entries)}>"
+
+
+_store: Optional[LocatorStore] = None
+
+
+def get_store() -> Optional[LocatorStore]:
+    """Process-wide store (None when disabled via SA_LOCATOR_STORE=0)."""
+    global _store
+    if not STORE_ENABLED:
+        return None
+    if _store is None:
+        _store = LocatorStore()
+    return _store
+
+
+# ---- CLI --------------------------------------------------------------------
+
+def _bench(repeat: int, lookups: int) -> None:
+    """Time page-locator setup the way BasePage.__init__ does it, JSON vs compiled store."""
+    store = LocatorStore()
+    store.build()
+    print(f"{'page':<32}{'names':>7}{'json ms':>10}{'store ms':>10}{'speedup':>9}")
+    tot_json = tot_store = 0.0
+    for page in list_pages():
+        names = list(load_page_json(page))[:lookups]
+
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            locs = load_page_json(page)
+            for n in names:
+                locs.get(n)
+        t_json = (time.perf_counter() - t0) / repeat
+
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            locs = store.page_view(page)
+            for n in names:
+                locs.get(n)
+        t_store = (time.perf_counter() - t0) / repeat
+
+        tot_json += t_json
+        tot_store += t_store
+        print(f"{page:<32}{len(store.names(page)):>7}{t_json * 1000:>10.2f}{t_store * 1000:>10.2f}"
+              f"{t_json / t_store if t_store else 0:>8.1f}x")
+    print(f"{'TOTAL (one of every page)':<39}{tot_json * 1000:>10.2f}{tot_store * 1000:>10.2f}"
+          f"{tot_json / tot_store if tot_store else 0:>8.1f}x")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    b = sub.add_parser("build", help="compile locator JSON into the store")
+    b.add_argument("--force", action="store_true", help="recompile every page")
+    bench = sub.add_parser("bench", help="compare page-object locator setup cost")
+    bench.add_argument("-n", "--repeat", type=int, default=20)
+    bench.add_argument("--lookups", type=int, default=8, help="logical names touched per page object")
+    args = parser.parse_args(argv)
+
+    if args.cmd == "build":
+        done = LocatorStore().build(force=args.force)
+        for page, count in done.items():
+            print(f"compiled {page}: {count} locators")
+        print(f"{len(done)} page(s) compiled -> {STORE_PATH}")
+    else:
+        _bench(args.repeat, args.lookups)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
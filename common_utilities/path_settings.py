@@ -19,6 +19,9 @@ class PathSettings:
     else:
         ROOT = os.path.abspath(os.pardir)
 
+    # Local run artefacts shared across runs/xdist workers (resolution cache, etc.)
+    CACHE_DIR = os.environ.get("SA_CACHE_DIR") or os.path.join(BASE_DIR, ".sa_cache")
+
     @staticmethod
     def _get_tesseract_path():
         # 1. ENV override (highest priority)
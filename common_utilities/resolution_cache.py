@@ -0,0 +1,159 @@
+"""On-disk cache of resolved selectors, shared across runs and xdist workers."""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from common_utilities.path_settings import PathSettings
+
+CACHE_ENABLED = os.environ.get("SA_RESOLUTION_CACHE", "1") == "1"
+CACHE_PATH = os.path.join(PathSettings.CACHE_DIR, "resolution_cache.sqlite3")
+
+# Cheap structural fingerprint of the current view: route (ids collapsed) plus
+# tag#id of the top-level containers under <body>. Kendo popups/overlays are
+# skipped because they come and go without the page changing.
+JS_DOM_FINGERPRINT = r"""
+const path = location.pathname.replace(/[0-9a-f]{8}-[0-9a-f-]{27,}|\d+/gi, ':id');
+const parts = [path];
+const skip = /k-animation-container|k-overlay|cdk-overlay|k-popup/;
+(function walk(node, depth) {
+  for (const el of node.children) {
+    if (skip.test(typeof el.className === 'string' ? el.className : '')) continue;
+    parts.push(depth + el.tagName.toLowerCase() + (el.id ? '#' + el.id : ''));
+    if (depth < 3) walk(el, depth + 1);
+  }
+})(document.body || document.documentElement, 0);
+let h = 0x811c9dc5;
+const s = parts.join('|');
+for (let i = 0; i < s.length; i++) { h ^= s.charCodeAt(i); h = Math.imul(h, 0x01000193) >>> 0; }
+return h.toString(16);
+"""
+
+
+def entry_signature(entry: Dict[str, Any]) -> str:
+    """Hash of the JSON entry, so edited locators invalidate their cached resolution."""
+    raw = json.dumps(dict(entry or {}), sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+class ResolutionCache:
+    """
+    SQLite store keyed by (page, logical_name) holding the DOM fingerprint the
+    selector was resolved under. A lookup under a different fingerprint (or a
+    changed JSON entry) deletes the row and counts as a miss.
+
+    WAL mode lets every xdist worker read concurrently; writes are tiny and
+    serialised by SQLite's own locking (busy_timeout covers contention).
+    """
+
+    def __init__(self, path: str = CACHE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.hits = 0
+        self.misses = 0
+        self.invalidated = 0
+        self.saved_seconds = 0.0
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS resolved (
+                    page TEXT NOT NULL, name TEXT NOT NULL, fingerprint TEXT NOT NULL,
+                    entry_sig TEXT NOT NULL, selector TEXT NOT NULL, tier TEXT,
+                    cost REAL DEFAULT 0, updated REAL,
+                    PRIMARY KEY (page, name))
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS stats (
+                    run_id TEXT NOT NULL, worker TEXT NOT NULL, hits INTEGER, misses INTEGER,
+                    invalidated INTEGER, saved_seconds REAL,
+                    PRIMARY KEY (run_id, worker))
+            """)
+            self._conn = conn
+        return self._conn
+
+    def get(self, page: str, name: str, fingerprint: str, entry_sig: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            try:
+                row = self._db().execute(
+                    "SELECT fingerprint, entry_sig, selector, cost FROM resolved WHERE page=? AND name=?",
+                    (page, name)).fetchone()
+                if row and (row[0] != fingerprint or row[1] != entry_sig):
+                    self._db().execute("DELETE FROM resolved WHERE page=? AND name=?", (page, name))
+                    self.invalidated += 1
+                    row = None
+            except sqlite3.Error as e:
+                print(f"[resolution-cache] read failed: {e}")
+                row = None
+            if not row:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return {"selector": row[2], "cost": row[3] or 0.0}
+
+    def put(self, page: str, name: str, fingerprint: str, entry_sig: str,
+            selector: str, tier: str, cost: float) -> None:
+        with self._lock:
+            try:
+                self._db().execute(
+                    "INSERT OR REPLACE INTO resolved VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (page, name, fingerprint, entry_sig, selector, tier, float(cost), time.time()))
+            except sqlite3.Error as e:
+                print(f"[resolution-cache] write failed: {e}")
+
+    def forget(self, page: str, name: Optional[str] = None) -> None:
+        with self._lock:
+            try:
+                if name is None:
+                    self._db().execute("DELETE FROM resolved WHERE page=?", (page,))
+                else:
+                    self._db().execute("DELETE FROM resolved WHERE page=? AND name=?", (page, name))
+            except sqlite3.Error as e:
+                print(f"[resolution-cache] delete failed: {e}")
+
+    def record_saving(self, seconds: float) -> None:
+        self.saved_seconds += max(0.0, seconds)
+
+    def flush_stats(self, run_id: str, worker: str) -> None:
+        """Persist this process' counters so the xdist controller can aggregate them."""
+        if not (self.hits or self.misses or self.invalidated):
+            return
+        with self._lock:
+            try:
+                self._db().execute(
+                    "INSERT OR REPLACE INTO stats VALUES (?, ?, ?, ?, ?, ?)",
+                    (run_id, worker, self.hits, self.misses, self.invalidated, self.saved_seconds))
+            except sqlite3.Error as e:
+                print(f"[resolution-cache] stats write failed: {e}")
+
+    def session_stats(self, run_id: str) -> Dict[str, float]:
+        with self._lock:
+            try:
+                row = self._db().execute(
+                    "SELECT COALESCE(SUM(hits),0), COALESCE(SUM(misses),0), COALESCE(SUM(invalidated),0), "
+                    "COALESCE(SUM(saved_seconds),0) FROM stats WHERE run_id=?", (run_id,)).fetchone()
+            except sqlite3.Error:
+                row = (0, 0, 0, 0.0)
+        return {"hits": row[0], "misses": row[1], "invalidated": row[2], "saved_seconds": row[3]}
+
+
+_cache: Optional[ResolutionCache] = None
+
+
+def get_cache() -> Optional[ResolutionCache]:
+    """Process-wide cache instance (None when disabled via SA_RESOLUTION_CACHE=0)."""
+    global _cache
+    if not CACHE_ENABLED:
+        return None
+    if _cache is None:
+        _cache = ResolutionCache()
+    return _cache
@@ -0,0 +1,304 @@
+"""
+Locator resolution telemetry
+============================
+Structured timing events for BasePage.resolve and the steps under it
+(selector race, _try_selector, _resolve_runtime), aggregated into a
+per-session hot-spot report: slowest logical names, heal rate per page JSON
+and time lost to healing.
+
+Enabled with SA_TELEMETRY=1 (off by default); when off the decorators return
+the original methods untouched, so there is no per-call cost. The WebDriver
+command counter is installed from the pytest_configure hook (Telemetry.install),
+not on import, and events are appended to the run's file every
+SA_TELEMETRY_FLUSH events instead of being held for the whole session.
+
+Usage:
+    python -m common_utilities.resolution_telemetry report [--run ID] [--out NAME]
+"""
+
+import argparse
+import functools
+import glob
+import html
+import json
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Optional
+
+from common_utilities.path_settings import PathSettings
+
+TELEMETRY_ENABLED = os.environ.get("SA_TELEMETRY", "0") == "1"
+TELEMETRY_DIR = os.path.join(PathSettings.CACHE_DIR, "telemetry")
+TOP_N = int(os.environ.get("SA_TELEMETRY_TOP", "25"))
+FLUSH_EVERY = int(os.environ.get("SA_TELEMETRY_FLUSH", "500"))   # buffered events before an append to disk
+
+# tiers that mean the JSON selector (or cache) did not do its job
+HEAL_TIERS = ("healed", "failed")
+
+
+class Telemetry:
+    """Collects events for this process; one event per traced call."""
+
+    def __init__(self):
+        self.events: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._tls = threading.local()
+        self.run_id = ""
+        self.worker = "master"
+        self._installed = False
+
+    def install(self, run_id: str, worker: str) -> None:
+        """Name this process' event file and count WebDriver commands (called from pytest_configure)."""
+        self.run_id, self.worker = run_id, worker
+        if self._installed:
+            return
+        self._installed = True
+        # every WebDriver/WebElement command goes through WebDriver.execute
+        try:
+            from selenium.webdriver.remote.webdriver import WebDriver
+        except ImportError:
+            return
+        if getattr(WebDriver.execute, "_sa_counted", False):
+            return
+        original = WebDriver.execute
+        telemetry = self
+
+        @functools.wraps(original)
+        def execute(driver, *args, **kwargs):
+            telemetry.count_call()
+            return original(driver, *args, **kwargs)
+        execute._sa_counted = True
+        WebDriver.execute = execute
+
+    # -- WebDriver command counter (per thread) --
+    def count_call(self) -> None:
+        self._tls.calls = getattr(self._tls, "calls", 0) + 1
+
+    def calls(self) -> int:
+        return getattr(self._tls, "calls", 0)
+
+    def _stack(self) -> List[Dict[str, Any]]:
+        stack = getattr(self._tls, "stack", None)
+        if stack is None:
+            stack = self._tls.stack = []
+        return stack
+
+    def run(self, kind: str, page_obj, fn, args, kwargs):
+        stack = self._stack()
+        parent = stack[-1] if stack else None
+        arg0 = args[0] if args and isinstance(args[0], str) else ""
+        rec: Dict[str, Any] = {
+            "kind": kind,
+            "page": getattr(page_obj, "page_name", None) or "",
+            # _try_selector gets a selector, not a name: attribute it to the enclosing resolve
+            "name": parent["name"] if kind == "try" and parent else arg0,
+            "test": (os.environ.get("PYTEST_CURRENT_TEST") or "").rsplit(" ", 1)[0],
+            "ts": time.time(),
+        }
+        if kind == "try":
+            rec["selector"] = arg0
+        calls0, t0 = self.calls(), time.perf_counter()
+        stack.append(rec)
+        try:
+            result = fn(page_obj, *args, **kwargs)
+            rec["ok"] = result is not None
+            return result
+        except Exception:
+            rec["ok"] = False
+            if kind == "resolve":
+                rec.setdefault("tier", "failed")
+            raise
+        finally:
+            rec["dur"] = round(time.perf_counter() - t0, 4)
+            rec["calls"] = self.calls() - calls0
+            stack.pop()
+            with self._lock:
+                self.events.append(rec)
+                full = len(self.events) >= FLUSH_EVERY
+            if full and self._installed:
+                self.flush()
+
+    def note(self, **fields) -> None:
+        """Attach fields (e.g. tier) to the innermost running resolve."""
+        for rec in reversed(self._stack()):
+            if rec["kind"] == "resolve":
+                rec.update(fields)
+                return
+
+    def flush(self, run_id: Optional[str] = None, worker: Optional[str] = None,
+              directory: str = TELEMETRY_DIR) -> Optional[str]:
+        """Append the buffered events to <run_id>-<worker>.jsonl (defaults: the values given to install)."""
+        with self._lock:
+            events, self.events = self.events, []
+        if not events:
+            return None
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{run_id or self.run_id}-{worker or self.worker}.jsonl")
+        with open(path, "a", encoding="utf-8") as f:
+            for ev in events:
+                f.write(json.dumps(ev, ensure_ascii=False) + "\n")
+        return path
+
+
+_telemetry = Telemetry()
+
+
+def get_telemetry() -> Optional[Telemetry]:
+    """Process-wide collector (None when disabled via SA_TELEMETRY=0)."""
+    return _telemetry if TELEMETRY_ENABLED else None
+
+
+def traced(kind: str):
+    """Method decorator: record a `kind` event around each call (identity when disabled)."""
+    def deco(fn):
+        if not TELEMETRY_ENABLED:
+            return fn
+
+        @functools.wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            return _telemetry.run(kind, self, fn, args, kwargs)
+        return wrapper
+    return deco
+
+
+if TELEMETRY_ENABLED:
+    def note_tier(tier: str) -> None:
+        _telemetry.note(tier=tier)
+else:
+    def note_tier(tier: str) -> None:
+        pass
+
+
+# ---- Aggregation ------------------------------------------------------------
+
+def load_events(run_id: Optional[str] = None, directory: str = TELEMETRY_DIR) -> List[Dict[str, Any]]:
+    pattern = f"{run_id}-*.jsonl" if run_id else "*.jsonl"
+    events = []
+    for path in sorted(glob.glob(os.path.join(directory, pattern))):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    try:
+                        events.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        continue
+    return events
+
+
+def aggregate(events: List[Dict[str, Any]], top_n: int = TOP_N) -> Dict[str, Any]:
+    resolves = [e for e in events if e["kind"] == "resolve"]
+    per_name: Dict[tuple, Dict[str, Any]] = {}
+    per_page: Dict[str, Counter] = defaultdict(Counter)
+    for e in resolves:
+        tier = e.get("tier", "unknown")
+        key = (e["page"], e["name"])
+        row = per_name.setdefault(key, {"page": e["page"], "name": e["name"], "count": 0, "total_s": 0.0,
+                                        "max_s": 0.0, "calls": 0, "tiers": Counter()})
+        row["count"] += 1
+        row["total_s"] += e["dur"]
+        row["max_s"] = max(row["max_s"], e["dur"])
+        row["calls"] += e.get("calls", 0)
+        row["tiers"][tier] += 1
+        # process-cache hits are free and would drown the rates
+        if tier != "memory":
+            per_page[e["page"]][tier] += 1
+            per_page[e["page"]]["_seconds"] += e["dur"]
+
+    slowest = sorted(per_name.values(), key=lambda r: r["total_s"], reverse=True)[:top_n]
+    for r in slowest:
+        r["mean_s"] = round(r["total_s"] / r["count"], 4)
+        r["calls_per_resolve"] = round(r["calls"] / r["count"], 1)
+        r["total_s"] = round(r["total_s"], 3)
+        r["tiers"] = dict(r["tiers"])
+
+    pages = []
+    for page, c in sorted(per_page.items()):
+        resolved = sum(v for k, v in c.items() if not k.startswith("_"))
+        healed = sum(c[t] for t in HEAL_TIERS)
+        pages.append({"page": page, "resolutions": resolved, "healed": c["healed"], "failed": c["failed"],
+                      "heal_rate": round(healed / resolved, 3) if resolved else 0.0,
+                      "seconds": round(c["_seconds"], 3)})
+    pages.sort(key=lambda p: p["heal_rate"], reverse=True)
+
+    lost = sum(e["dur"] for e in resolves if e.get("tier") in HEAL_TIERS)
+    in_runtime = sum(e["dur"] for e in events if e["kind"] == "runtime")
+    tiers = Counter(e.get("tier", "unknown") for e in resolves)
+    return {
+        "resolutions": len(resolves),
+        "tiers": dict(tiers),
+        "resolve_seconds": round(sum(e["dur"] for e in resolves), 3),
+        "healing_lost_seconds": round(lost, 3),
+        "runtime_scoring_seconds": round(in_runtime, 3),
+        "webdriver_calls": sum(e.get("calls", 0) for e in resolves),
+        "slowest": slowest,
+        "pages": pages,
+    }
+
+
+def render_html(report: Dict[str, Any], title: str = "Locator resolution report") -> str:
+    esc = html.escape
+
+    def table(headers, rows):
+        head = "".join(f"<th>{esc(h)}</th>" for h in headers)
+        body = "".join("<tr>" + "".join(f"<td>{esc(str(c))}</td>" for c in row) + "</tr>" for row in rows)
+        return f"<table><thead><tr>{head}</tr></thead><tbody>{body}</tbody></table>"
+
+    tiers = ", ".join(f"{k}={v}" for k, v in sorted(report["tiers"].items()))
+    slow_rows = [(r["page"], r["name"], r["count"], r["total_s"], r["mean_s"], r["max_s"], r["calls_per_resolve"],
+                  ", ".join(f"{k}={v}" for k, v in sorted(r["tiers"].items()))) for r in report["slowest"]]
+    page_rows = [(p["page"], p["resolutions"], p["healed"], p["failed"], f"{p['heal_rate']:.1%}", p["seconds"])
+                 for p in report["pages"]]
+    return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{esc(title)}</title>
+<style>
+body {{ font-family: sans-serif; margin: 24px; }}
+table {{ border-collapse: collapse; margin-bottom: 24px; }}
+th, td {{ border: 1px solid #ccc; padding: 4px 8px; text-align: left; font-size: 13px; }}
+th {{ background: #f0f0f0; }}
+</style></head><body>
+<h1>{esc(title)}</h1>
+<p>{report['resolutions']} resolutions ({esc(tiers)}) in {report['resolve_seconds']}s,
+{report['webdriver_calls']} WebDriver calls.<br>
+Time lost to healing: <b>{report['healing_lost_seconds']}s</b>
+(of which in-page/runtime scoring {report['runtime_scoring_seconds']}s).</p>
+<h2>Slowest logical names</h2>
+{table(["page", "name", "count", "total s", "mean s", "max s", "calls/resolve", "tiers"], slow_rows)}
+<h2>Heal rate per page JSON</h2>
+{table(["page", "resolutions", "healed", "failed", "heal rate", "seconds"], page_rows)}
+</body></html>
+"""
+
+
+def write_report(run_id: Optional[str], basename: str, directory: str = TELEMETRY_DIR) -> Optional[Dict[str, Any]]:
+    """Aggregate the run's events into <basename>.json and <basename>.html; None if nothing was recorded."""
+    events = load_events(run_id, directory)
+    if not events:
+        return None
+    report = aggregate(events)
+    report["run_id"] = run_id
+    with open(f"{basename}.json", "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    with open(f"{basename}.html", "w", encoding="utf-8") as f:
+        f.write(render_html(report))
+    return report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("cmd", choices=["report"])
+    parser.add_argument("--run", help="SA_RUN_ID to report on (default: every recorded run)")
+    parser.add_argument("--out", default="sa_resolution_report", help="output basename (.json/.html)")
+    args = parser.parse_args(argv)
+    report = write_report(args.run, args.out)
+    if report is None:
+        print(f"no telemetry events in {TELEMETRY_DIR}")
+        return 1
+    print(f"{report['resolutions']} resolutions, {report['healing_lost_seconds']}s lost to healing "
+          f"-> {args.out}.json / {args.out}.html")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,84 @@
+"""
+Unit tests for common_utilities.column_sort, run once with pandas (skipped when
+it is not installed) and once on the plain-Python path.
+
+    python -m pytest -o addopts= common_utilities/tests
+"""
+
+import pytest
+
+from common_utilities import column_sort
+from common_utilities.column_sort import check_sorted, infer_kind
+
+
+@pytest.fixture(params=["pandas", "python"])
+def parser(request, monkeypatch):
+    if request.param == "pandas":
+        pytest.importorskip("pandas")
+    else:
+        monkeypatch.setattr(column_sort, "_pandas", lambda: None)
+    return request.param
+
+
+# -- dates ---------------------------------------------------------------------
+
+def test_mixed_yearless_and_dated_values(parser):
+    # year-less dates are this year, or last year when that would be in the future
+    values = ["Dec 10 2020 19:53:15", "Jan 01 00:00:00", "Jun 01 2023 08:00:00"]
+    assert infer_kind(values) == "datetime"
+    assert check_sorted(values) == (False, "datetime", 2, "datetime")
+    ascending = ["Dec 10 2020 19:53:15", "Jun 01 2023 08:00:00", "Jan 01 00:00:00"]
+    assert check_sorted(ascending).ok
+    assert check_sorted(list(reversed(ascending)), descending=True).ok
+
+
+def test_yearless_date_in_the_future_belongs_to_last_year(parser):
+    assert check_sorted(["Dec 31 23:59:59", "Jan 01 00:00:00"]).ok
+
+
+def test_date_column_with_a_non_date_falls_back_to_text(parser):
+    values = ["Jan 01 2020 00:00:00"] * 20 + ["-"]
+    assert check_sorted(values).kind == "text"
+
+
+# -- numbers / phone numbers -----------------------------------------------------
+
+def test_numbers_compare_numerically(parser):
+    result = check_sorted(["2", "30", "1,000"])
+    assert result.ok and result.kind == "number"
+    assert check_sorted(["2", "1,000", "30"]).index == 2
+
+
+def test_ten_digit_phone_numbers_stay_text(parser):
+    phones = ["0123456789", "0987654321", "1000000000"]
+    assert infer_kind(phones) == "text"
+    assert check_sorted(phones).ok
+    assert not check_sorted(phones, descending=True).ok
+
+
+def test_nan_text_is_not_a_number(parser):
+    result = check_sorted(["1", "nan", "0"])
+    assert result.kind == "text" and not result.ok and result.index == 2
+
+
+# -- text ------------------------------------------------------------------------
+
+def test_emails_compare_case_insensitively(parser):
+    result = check_sorted(["a@x.com", "B@x.com", "c@x.com"])
+    assert result == (True, "email", None, "casefold")
+    assert check_sorted(["b@x.com", "A@x.com"]).index == 1
+
+
+def test_natural_order_accepted_when_locale_order_fails(parser):
+    result = check_sorted(["item2", "item10"])
+    assert result.ok and result.mode == "natural"
+
+
+def test_locale_order_on_first_word(parser):
+    result = check_sorted(["apple pie", "Banana split", "cherry"])
+    assert result.ok and result.mode == "locale"
+
+
+def test_first_out_of_order_position_is_reported(parser):
+    result = check_sorted(["alpha", "charlie", "bravo", "delta"])
+    assert not result.ok and result.index == 2
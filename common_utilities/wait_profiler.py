@@ -0,0 +1,318 @@
+"""
+Wait/sleep profiler
+===================
+pytest plugin (registered from testCases/conftest.py) that measures the time
+tests spend blocked in the repository's time.sleep calls and the BasePage wait
+helpers, per test and per source line. Each process writes its share to the cache dir; the xdist
+controller (or the single process) merges them into a ranked terminal report
+and sa_wait_profile_<env>.json with the idle/active split of every test.
+
+Nested waits are counted once, at the outermost call (a wait_for_element that
+sleeps internally is one wait_for_element). The call site is the innermost
+frame inside this repository.
+
+The stdlib is left alone: only the `time` / `sleep` names bound in this
+repository's own modules are swapped for timed ones, so seleniumbase, the
+driver threads and xdist sleep untouched (a bare WebDriverWait outside the
+BasePage helpers is therefore not counted).
+
+Enabled with SA_WAIT_PROFILE=1 (off by default).
+
+Usage:
+    python -m common_utilities.wait_profiler report [--run ID] [--out NAME]
+"""
+
+import argparse
+import functools
+import glob
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from common_utilities.path_settings import PathSettings
+
+PROFILE_ENABLED = os.environ.get("SA_WAIT_PROFILE", "0") == "1"
+PROFILE_DIR = os.path.join(PathSettings.CACHE_DIR, "wait_profile")
+TOP_N = int(os.environ.get("SA_WAIT_PROFILE_TOP", "25"))
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# BasePage methods timed as one blocking wait each
+WAIT_METHODS = ["wait_for_element", "wait_for_gone", "kendo_switch_wait", "_find_unique_in",
+                "wait_for_page_to_load", "wait_for_dom_quiet", "wait_for_network_idle", "wait_for_api_call"]
+
+
+def _call_site(frame) -> str:
+    """Innermost frame in repo code (not this file, not site-packages): 'path:line (function)'."""
+    here = os.path.abspath(__file__)
+    fallback = None
+    while frame is not None:
+        path = os.path.abspath(frame.f_code.co_filename)
+        if path != here:
+            if fallback is None:
+                fallback = frame
+            if path.startswith(REPO_ROOT + os.sep) and "site-packages" not in path:
+                rel = os.path.relpath(path, REPO_ROOT)
+                return f"{rel}:{frame.f_lineno} ({frame.f_code.co_name})"
+        frame = frame.f_back
+    if fallback is None:
+        return "<unknown>"
+    return f"{fallback.f_code.co_filename}:{fallback.f_lineno} ({fallback.f_code.co_name})"
+
+
+class _TimedTime:
+    """Stands in for the `time` module inside repo modules: a timed sleep, everything else delegated."""
+
+    def __init__(self, sleep):
+        self.sleep = sleep
+
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+
+class WaitProfiler:
+    """Collects blocked time for this process; also the pytest plugin object."""
+
+    def __init__(self):
+        self._tls = threading.local()
+        self._lock = threading.Lock()
+        self._test: Optional[Dict[str, Any]] = None
+        self._test_thread: Optional[int] = None
+        self.sites: Dict[tuple, Dict[str, Any]] = {}
+        self.tests: List[Dict[str, Any]] = []
+        self._installed = False
+        self._sleep = self._timed("sleep", time.sleep)
+        self._time = _TimedTime(self._sleep)
+        self._seen_modules: set = set()
+
+    # -- instrumentation --
+    def _timed(self, kind: str, fn):
+        profiler = self
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            tls = profiler._tls
+            if getattr(tls, "depth", 0):
+                return fn(*args, **kwargs)
+            site = _call_site(sys._getframe(1))
+            tls.depth = 1
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                tls.depth = 0
+                profiler._add(kind, site, time.perf_counter() - t0)
+        wrapper._sa_wait_profiled = True
+        return wrapper
+
+    def install(self) -> None:
+        if self._installed:
+            return
+        self._installed = True
+        self.instrument_repo_modules()
+        from common_utilities.base_page import BasePage
+        for name in WAIT_METHODS:
+            fn = getattr(BasePage, name, None)
+            if fn is not None and not getattr(fn, "_sa_wait_profiled", False):
+                setattr(BasePage, name, self._timed(name, fn))
+
+    def instrument_repo_modules(self) -> None:
+        """Time sleeps in repo modules imported since the last call (test modules load after install)."""
+        here = os.path.abspath(__file__)
+        for name, mod in list(sys.modules.items()):
+            if name in self._seen_modules or mod is None:
+                continue
+            self._seen_modules.add(name)
+            path = os.path.abspath(getattr(mod, "__file__", None) or "")
+            if not path.startswith(REPO_ROOT + os.sep) or "site-packages" in path or path == here:
+                continue
+            g = vars(mod)
+            for key, value in list(g.items()):
+                if value is time:
+                    g[key] = self._time
+                elif value is time.sleep:
+                    g[key] = self._sleep
+
+    def _add(self, kind: str, site: str, seconds: float) -> None:
+        test = self._test if threading.get_ident() == self._test_thread else None
+        nodeid = test["test"] if test else "<session>"
+        with self._lock:
+            row = self.sites.setdefault((site, kind), {"site": site, "kind": kind, "seconds": 0.0,
+                                                       "count": 0, "max_s": 0.0, "tests": set()})
+            row["seconds"] += seconds
+            row["count"] += 1
+            row["max_s"] = max(row["max_s"], seconds)
+            row["tests"].add(nodeid)
+            if test:
+                test["idle"] += seconds
+                test["kinds"][kind] += seconds
+                test["sites"][f"{site} [{kind}]"] += seconds
+
+    # -- pytest hooks --
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        self.instrument_repo_modules()
+        rec = {"test": item.nodeid, "idle": 0.0, "kinds": Counter(), "sites": Counter()}
+        self._test, self._test_thread = rec, threading.get_ident()
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            rec["duration"] = time.perf_counter() - t0
+            self._test = None
+            with self._lock:
+                self.tests.append(rec)
+
+    def pytest_sessionfinish(self, session, exitstatus):
+        worker = getattr(session.config, "workerinput", {}).get("workerid", "master")
+        self.flush(os.environ.get("SA_RUN_ID", ""), worker)
+
+    def pytest_terminal_summary(self, terminalreporter, exitstatus, config):
+        if hasattr(config, "workerinput"):
+            return
+        env = os.environ.get("DIMAGIQA_ENV", "default_env")
+        try:
+            report = write_report(os.environ.get("SA_RUN_ID", ""), f"sa_wait_profile_{env}")
+        except Exception as e:
+            terminalreporter.write_line(f"[wait-profile] could not write report: {e}")
+            return
+        if not report:
+            return
+        t = report["totals"]
+        terminalreporter.write_sep("-", "time spent waiting")
+        terminalreporter.write_line(
+            f"{t['tests']} tests, {t['duration_s']:.1f}s total, {t['idle_s']:.1f}s blocked "
+            f"({t['idle_share']:.0%} idle); details in sa_wait_profile_{env}.json")
+        for row in report["sites"][:10]:
+            terminalreporter.write_line(
+                f"  {row['seconds']:>7.1f}s  x{row['count']:<4} {row['kind']:<22} {row['site']}")
+        terminalreporter.write_line("most idle tests:")
+        for row in report["tests"][:5]:
+            terminalreporter.write_line(
+                f"  {row['idle_s']:>7.1f}s of {row['duration_s']:.1f}s ({row['idle_share']:.0%})  {row['test']}")
+
+    # -- persistence --
+    def flush(self, run_id: str, worker: str, directory: str = PROFILE_DIR) -> Optional[str]:
+        with self._lock:
+            tests, self.tests = self.tests, []
+            sites, self.sites = self.sites, {}
+        if not tests and not sites:
+            return None
+        data = {
+            "tests": [{"test": r["test"], "duration": r["duration"], "idle": r["idle"],
+                       "kinds": dict(r["kinds"]), "sites": dict(r["sites"])} for r in tests],
+            "sites": [{**row, "tests": sorted(row["tests"])} for row in sites.values()],
+        }
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{run_id}-{worker}-{os.getpid()}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        return path
+
+
+_profiler = WaitProfiler()
+
+
+def get_profiler() -> Optional[WaitProfiler]:
+    """Process-wide profiler (None when disabled via SA_WAIT_PROFILE=0)."""
+    return _profiler if PROFILE_ENABLED else None
+
+
+# ---- Aggregation ------------------------------------------------------------
+
+def load_profiles(run_id: Optional[str] = None, directory: str = PROFILE_DIR) -> List[Dict[str, Any]]:
+    pattern = f"{run_id}-*.json" if run_id else "*.json"
+    out = []
+    for path in sorted(glob.glob(os.path.join(directory, pattern))):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                out.append(json.load(f))
+        except (OSError, json.JSONDecodeError):
+            print(f"[wait-profile] skipping unreadable {os.path.basename(path)}")
+    return out
+
+
+def aggregate(profiles: List[Dict[str, Any]], top_n: int = TOP_N) -> Dict[str, Any]:
+    sites: Dict[tuple, Dict[str, Any]] = {}
+    for prof in profiles:
+        for s in prof.get("sites", []):
+            row = sites.setdefault((s["site"], s["kind"]), {"site": s["site"], "kind": s["kind"], "seconds": 0.0,
+                                                            "count": 0, "max_s": 0.0, "tests": set()})
+            row["seconds"] += s["seconds"]
+            row["count"] += s["count"]
+            row["max_s"] = max(row["max_s"], s["max_s"])
+            row["tests"].update(s["tests"])
+    ranked_sites = sorted(sites.values(), key=lambda r: r["seconds"], reverse=True)
+    for r in ranked_sites:
+        r["mean_s"] = round(r["seconds"] / r["count"], 3) if r["count"] else 0.0
+        r["seconds"] = round(r["seconds"], 3)
+        r["max_s"] = round(r["max_s"], 3)
+        r["tests"] = len(r["tests"])
+
+    tests = []
+    for prof in profiles:
+        for t in prof.get("tests", []):
+            dur = t["duration"]
+            tests.append({
+                "test": t["test"],
+                "duration_s": round(dur, 3),
+                "idle_s": round(t["idle"], 3),
+                "active_s": round(max(0.0, dur - t["idle"]), 3),
+                "idle_share": round(t["idle"] / dur, 3) if dur else 0.0,
+                "kinds": {k: round(v, 3) for k, v in sorted(t["kinds"].items(), key=lambda kv: -kv[1])},
+                "top_sites": [{"site": s, "seconds": round(v, 3)}
+                              for s, v in Counter(t["sites"]).most_common(5)],
+            })
+    tests.sort(key=lambda t: t["idle_s"], reverse=True)
+
+    duration = sum(t["duration_s"] for t in tests)
+    idle = sum(t["idle_s"] for t in tests)
+    kinds = Counter()
+    for r in ranked_sites:
+        kinds[r["kind"]] += r["seconds"]
+    return {
+        "totals": {"tests": len(tests), "duration_s": round(duration, 3), "idle_s": round(idle, 3),
+                   "active_s": round(duration - idle, 3), "idle_share": round(idle / duration, 3) if duration else 0.0,
+                   "by_kind": {k: round(v, 3) for k, v in kinds.most_common()}},
+        "sites": ranked_sites[:top_n],
+        "tests": tests,
+    }
+
+
+def write_report(run_id: Optional[str], basename: str, directory: str = PROFILE_DIR) -> Optional[Dict[str, Any]]:
+    """Merge every process' profile for the run into <basename>.json; None if nothing was recorded."""
+    profiles = load_profiles(run_id, directory)
+    if not profiles:
+        return None
+    report = aggregate(profiles)
+    report["run_id"] = run_id
+    with open(f"{basename}.json", "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    return report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("cmd", choices=["report"])
+    parser.add_argument("--run", help="SA_RUN_ID to report on (default: every recorded run)")
+    parser.add_argument("--out", default="sa_wait_profile", help="output basename (.json)")
+    args = parser.parse_args(argv)
+    report = write_report(args.run, args.out)
+    if report is None:
+        print(f"no wait profiles in {PROFILE_DIR}")
+        return 1
+    t = report["totals"]
+    print(f"{t['tests']} tests, {t['idle_s']:.1f}s of {t['duration_s']:.1f}s blocked ({t['idle_share']:.0%})")
+    for row in report["sites"][:TOP_N]:
+        print(f"  {row['seconds']:>8.1f}s  x{row['count']:<4} {row['kind']:<22} {row['site']}")
+    print(f"-> {args.out}.json")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,18 +1,11 @@
 import time
 
 
-def build_resilient_xpath(el):
-    tag = el.tag_name
-    attrs = {
-        "id": el.get_attribute("id"),
-        "name": el.get_attribute("name"),
-        "placeholder": el.get_attribute("placeholder"),
-        "aria-label": el.get_attribute("aria-label"),
-        "class": el.get_attribute("class"),
-        "type": el.get_attribute("type"),
-        "data-icon": el.get_attribute("data-icon"),
-        }
-    text = el.text.strip()
+def build_resilient_xpath(snap):
+    """`snap` is one element_snapshot.snapshot() entry (no WebDriver calls here)."""
+    tag = snap["tag"]
+    attrs = {a: snap["attrs"].get(a) for a in CRAWL_ATTRS}
+    text = (snap["text"] or "").strip()
 
     if attrs["id"]:
         return f"//{tag}[@id='{attrs['id']}']"
@@ -37,6 +30,7 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from common_utilities.element_snapshot import CRAWL_ATTRS, snapshot
 from common_utilities.load_settings import load_settings
 from selenium.webdriver.remote.webelement import WebElement
 
@@ -60,25 +54,20 @@ def extract_locators(driver, page_name, out_dir):
         "router-outlet", "head", "title", "base", "viewport"
     }
 
-    elements = driver.find_elements(By.XPATH, "//*")
+    # tag/text/attributes of every element in one execute_script
+    elements = snapshot(driver, "//*", CRAWL_ATTRS)
     locators = {}
 
     for i, el in enumerate(elements):
         try:
-            tag = el.tag_name.lower()
+            if el is None:
+                continue
+            tag = el["tag"]
             if tag in skip_tags:
                 continue
 
-            text = clean_text_for_xpath(el.text)
-            attrs = {
-                "id": el.get_attribute("id"),
-                "name": el.get_attribute("name"),
-                "placeholder": el.get_attribute("placeholder"),
-                "aria-label": el.get_attribute("aria-label"),
-                "class": el.get_attribute("class"),
-                "type": el.get_attribute("type"),
-                "data-icon": el.get_attribute("data-icon"),
-            }
+            text = clean_text_for_xpath(el["text"])
+            attrs = {a: el["attrs"].get(a) for a in CRAWL_ATTRS}
 
             key = attrs["id"] or attrs["name"] or f"{tag}_{text[:10]}_{i}"
             if not key or key in locators:
@@ -168,7 +157,7 @@ def login_to_app(driver, settings):
 
     wait.until(EC.presence_of_element_located((By.ID, "email")))
 
-    elements = driver.find_elements(By.XPATH, "//*")
+    elements = snapshot(driver, "//*", CRAWL_ATTRS)
     login_json = "common_utilities/self_healing_locators/login.json"
     scraped_data = {}
 
@@ -180,20 +169,14 @@ def login_to_app(driver, settings):
 
     for i, el in enumerate(elements):
         try:
-            tag = el.tag_name.lower()
+            if el is None:
+                continue
+            tag = el["tag"]
             if tag in skip_tags:
                 continue  # ❌ Skip irrelevant tags
 
-            text = clean_text_for_xpath(el.text)
-            attrs = {
-                "id": el.get_attribute("id"),
-                "name": el.get_attribute("name"),
-                "placeholder": el.get_attribute("placeholder"),
-                "aria-label": el.get_attribute("aria-label"),
-                "class": el.get_attribute("class"),
-                "type": el.get_attribute("type"),
-                "data-icon": el.get_attribute("data-icon"),
-            }
+            text = clean_text_for_xpath(el["text"])
+            attrs = {a: el["attrs"].get(a) for a in CRAWL_ATTRS}
 
             identifier = {k: v for k, v in attrs.items() if v}
             identifier["tag"] = tag
@@ -1,12 +1,21 @@
 import os
 import base64
+import uuid
 import pytest
 import sys
 from pathlib import Path
 from seleniumbase import Driver
 from seleniumbase import config as sb_config
+from common_utilities.adaptive_timeouts import get_latency_store
+from common_utilities.base_page import BasePage
+from common_utilities.heal_journal import compact as compact_heal_journals, get_journal as get_heal_journal
 from common_utilities.load_settings import load_settings
+from common_utilities.locator_registry import get_registry as get_locator_registry
+from common_utilities.locator_store import get_store as get_locator_store
 from common_utilities.path_settings import PathSettings
+from common_utilities.resolution_cache import get_cache as get_resolution_cache
+from common_utilities.resolution_telemetry import get_telemetry, write_report as write_resolution_report
+from common_utilities.wait_profiler import get_profiler as get_wait_profiler
 from selenium.webdriver.chrome.options import Options
 import matplotlib.pyplot as plt
 from PIL import Image
@@ -119,6 +128,57 @@ def pytest_configure(config):
         config.option.htmlpath = "seleniumbase_report.html"
     if not config.option.self_contained_html:
         config.option.self_contained_html = True
+    # One id per run; xdist workers inherit it from the controller's environment
+    os.environ.setdefault("SA_RUN_ID", uuid.uuid4().hex)
+    # Time blocked in sleeps/waits per test and per call site (merged on the controller)
+    profiler = get_wait_profiler()
+    if profiler is not None and not config.pluginmanager.has_plugin("sa_wait_profiler"):
+        profiler.install()
+        config.pluginmanager.register(profiler, "sa_wait_profiler")
+    # Locator resolution telemetry (SA_TELEMETRY=1): count WebDriver commands, name this worker's event file
+    telemetry = get_telemetry()
+    if telemetry is not None:
+        telemetry.install(os.environ["SA_RUN_ID"], _worker_id(config))
+    # Compile changed locator JSON once, before any xdist worker builds page objects
+    store = get_locator_store()
+    if store is not None and not hasattr(config, "workerinput"):
+        try:
+            store.build()
+        except Exception as e:
+            print(f"[locators] could not compile locator store: {e}")
+
+
+def _worker_id(config) -> str:
+    return getattr(config, "workerinput", {}).get("workerid", "master")
+
+
+def pytest_sessionfinish(session, exitstatus):
+    # per-worker locator/race counters, only with -v
+    verbose = session.config.option.verbose > 0
+    if verbose:
+        st = get_locator_registry().stats()
+        print(f"\n[locators] {_worker_id(session.config)}: page loads={st['loads']} registry hits={st['hits']}")
+    race = BasePage.race_stats
+    if verbose and race["races"]:
+        print(f"[resolve] {_worker_id(session.config)}: {race['races']} selector races, "
+              f"≈{race['saved_seconds']:.1f}s saved vs one-by-one tiers")
+    cache = get_resolution_cache()
+    if cache is not None:
+        cache.flush_stats(os.environ.get("SA_RUN_ID", ""), _worker_id(session.config))
+    telemetry = get_telemetry()
+    if telemetry is not None:
+        telemetry.flush(os.environ.get("SA_RUN_ID", ""), _worker_id(session.config))
+    latency = get_latency_store()
+    if latency is not None:
+        latency.flush()  # the session's time-to-appear samples, one transaction
+    # workers only append heal journals; the controller folds them into self_healed/ once
+    if get_heal_journal() is not None and not hasattr(session.config, "workerinput"):
+        try:
+            done = compact_heal_journals(os.environ.get("SA_RUN_ID"))
+            if done:
+                print(f"[heal-journal] compacted {sum(done.values())} record(s) into {len(done)} page(s)")
+        except Exception as e:
+            print(f"[heal-journal] compaction failed ({e}); run `python -m common_utilities.heal_journal compact`")
 # ---------------------
 # Selenium WebDriver setup
 # ---------------------
@@ -287,6 +347,47 @@ def pytest_terminal_summary(terminalreporter, exitstatus, config):
         f.write(f'SKIPPED={len(skipped)}\n')
         f.write(f'XFAIL={len(xfail)}\n')
 
+    # Resolution cache effectiveness (aggregated over all xdist workers)
+    cache = get_resolution_cache()
+    if cache is not None:
+        st = cache.session_stats(os.environ.get("SA_RUN_ID", ""))
+        if st["hits"] or st["misses"]:
+            terminalreporter.write_sep("-", "locator resolution cache")
+            terminalreporter.write_line(
+                f"hits={st['hits']} misses={st['misses']} invalidated={st['invalidated']} "
+                f"saved≈{st['saved_seconds']:.1f}s"
+            )
+
+    # Locator hot spots (all workers' telemetry for this run)
+    if get_telemetry() is not None and not hasattr(config, "workerinput"):
+        try:
+            report = write_resolution_report(os.environ.get("SA_RUN_ID", ""), f"sa_resolution_report_{env}")
+        except Exception as e:
+            report = None
+            terminalreporter.write_line(f"[telemetry] could not write resolution report: {e}")
+        if report:
+            terminalreporter.write_sep("-", "locator resolution hot spots")
+            terminalreporter.write_line(
+                f"{report['resolutions']} resolutions, {report['healing_lost_seconds']:.1f}s lost to healing; "
+                f"details in sa_resolution_report_{env}.html"
+            )
+            for row in report["slowest"][:5]:
+                terminalreporter.write_line(
+                    f"  {row['total_s']:>7.1f}s  {row['page']}/{row['name']}  x{row['count']}  {row['tiers']}")
+
+    # Timeouts far looser than the recorded time-to-appear needs
+    latency = get_latency_store()
+    if latency is not None and not hasattr(config, "workerinput"):
+        loose = latency.loose_timeouts(env)
+        if loose:
+            terminalreporter.write_sep("-", "loose element timeouts")
+            for row in loose[:5]:
+                terminalreporter.write_line(
+                    f"  {row['configured_s']:>5.0f}s configured, {row['derived_s']:.1f}s needed "
+                    f"(p99 {row['p99_s']:.2f}s, n={row['samples']})  {row['page']}/{row['name']}")
+            terminalreporter.write_line(
+                f"{len(loose)} in total; `python -m common_utilities.adaptive_timeouts report --env {env}`")
+
     # Generate summary charts for Slack
     save_summary_charts({
         "passed":  len(passed),
@@ -338,8 +439,7 @@ def pytest_collection_modifyitems(config, items):
 
 def pytest_runtest_setup(item):
     if item.get_closest_marker("run_on_main_process"):
-        worker_id = getattr(item.config, "workerinput", {}).get("workerid", "master")
-        if worker_id != "master":
+        if _worker_id(item.config) != "master":
             pytest.skip("Presetup runs only on master node")
 
 @pytest.fixture(scope="function")
@@ -72,7 +72,9 @@ class test_module_11_dashboard(BaseCase):
         home.open_filter_search_staff("Treatment Monitor", name=UserData.default_staff_name, select=True)
         home.open_filter_search_staff("Patient Manager", name=UserData.default_staff_name, select=True)
         home.close_filter()
-        home.verify_dashboard_table_data(presence=True, patient_manager=UserData.default_staff_name, treatment_monitor=UserData.default_staff_name)
+        # the filter must hold on every page, not just the first
+        home.verify_dashboard_table_data(presence=True, patient_manager=UserData.default_staff_name,
+                                         treatment_monitor=UserData.default_staff_name, all_pages=True)
 
         home.open_filter()
         home.clear_filter()
@@ -34,28 +34,18 @@ class AdminReportsByClientsPage(BasePage):
         print(f"Admin Reports by Clients opened with Client {text}")
 
     def set_ffs(self, ff_dict):
-        for ff, toggle in ff_dict.items():
-            print(ff, toggle)
-            target = True if toggle == "ON" else False
-            element = f"kendo-switch_{ff}"
-            if self.is_element_present(element, strict=True):
-                print(f"element {element} is present")
-                print(element, target)
-                self.wait_for_element(element)
-                was_on = self.kendo_switch_is_on(element, strict=True)
-                print(f"[switch] {element}: was_on={was_on}")
-                if was_on == target:
-                    print(f"{element} is already set to {target}")
-                else:
-                    self.kendo_switch_set(element, target, strict=True)
-                    time.sleep(2)
-                    self.kendo_switch_wait(element, target, timeout=8, strict=True)
-                    # verify
-                    now_on = self.kendo_switch_is_on(element, strict=True)
-                    print(f"[switch] {element}: now_on={now_on}")
-            else:
-                print(f"element {element} is not present")
-        time.sleep(10)
+        """
+        Reconcile the flag switches with `ff_dict` ({flag: "ON"/"OFF"}) in one pass:
+        only flags in the wrong state are clicked, then one wait for the saves.
+        Returns the diff keyed by flag name (see kendo_switch_reconcile).
+        """
+        desired = {ff: toggle == "ON" for ff, toggle in ff_dict.items()}
+        diff = self.kendo_switch_reconcile(desired, name_format="kendo-switch_{}")
+        for ff, change in diff["changed"].items():
+            print(f"[switch] {ff}: {change['from']} -> {change['to']}")
+        print(f"[switch] already set: {diff['unchanged']}; not present: {diff['missing']}")
+        assert not diff["failed"], f"Feature flags not set: {diff['failed']}"
+        return diff
 
     def double_check_ff(self, ff_dict):
         for ff, toggle in ff_dict.items():
@@ -51,7 +51,7 @@ class HomePage(BasePage):
             assert self.is_element_visible('p_Staff', strict=True), "Staff Menu access is missing"
             print("Staff Menu is accessible")
         else:
-            assert not self.is_element_visible('p_Staff', strict=True), "Staff Menu is accessible"
+            assert not self.is_element_visible('p_Staff', strict=True, expect_absent=True), "Staff Menu is accessible"
             print("Staff Menu is not accessible")
 
     def verify_presence_of_patient_menu(self, presence=True):
@@ -59,7 +59,7 @@ class HomePage(BasePage):
             assert self.is_element_visible('p_Patients', strict=True), "Patient Menu access is missing"
             print("Patient Menu is accessible")
         else:
-            assert not self.is_element_visible('p_Patients', strict=True), "Patient Menu is accessible"
+            assert not self.is_element_visible('p_Patients', strict=True, expect_absent=True), "Patient Menu is accessible"
             print("Patient Menu is not accessible")
 
     def verify_presence_of_admin_menu(self, presence=True):
@@ -67,7 +67,7 @@ class HomePage(BasePage):
             assert self.is_element_visible('p_Admin', strict=True), "Admin Menu access is missing"
             print("Admin Menu is accessible")
         else:
-            assert not self.is_element_visible('p_Admin', strict=True), "Admin Menu is accessible"
+            assert not self.is_element_visible('p_Admin', strict=True, expect_absent=True), "Admin Menu is accessible"
             print("Admin Menu is not accessible")
 
     def verify_presence_of_dashboard_menu(self, presence=True):
@@ -75,7 +75,8 @@ class HomePage(BasePage):
             assert self.is_element_visible('p_Dashboard', strict=True), "Dashboard Menu access is missing"
             print("Dashboard Menu is accessible")
         else:
-            assert not self.is_element_present('p_Dashboard', strict=True), "Dashboard Menu is accessible"
+            assert not self.is_element_present('p_Dashboard', strict=True, expect_absent=True), \
+                "Dashboard Menu is accessible"
             print("Dashboard Menu is not accessible")
 
     def verify_presence_of_reports_menu(self, presence=True):
@@ -83,7 +84,7 @@ class HomePage(BasePage):
             assert self.is_element_visible('p_Reports', strict=True), "Reports Menu access is missing"
             print("Reports Menu is accessible")
         else:
-            assert not self.is_element_visible('p_Reports', strict=True), "Reports Menu is accessible"
+            assert not self.is_element_visible('p_Reports', strict=True, expect_absent=True), "Reports Menu is accessible"
             print("Reports Menu is not accessible")
 
     def open_manage_patient_page(self):
@@ -136,8 +137,7 @@ class HomePage(BasePage):
     def stay_idle(self, timeout, active=True):
         self.open_dashboard_page()
         print(f"Starting {timeout} minutes of inactivity")
-        # self.idle_wait(timeout*60)
-        time.sleep(timeout*60)
+        self.idle_wait(timeout*60)
         if active==True:
             self.open_admin_page()
             self.open_dashboard_page()
@@ -246,7 +246,8 @@ class HomePage(BasePage):
 
     def get_total_pages(self):
         self.wait_for_element('tbody_dashboard')
-        text = self.get_text('kendo-pager-info')
+        self.wait_for_grid_refresh('tbody_dashboard', timeout=10)
+        text = self.snapshot_grid('tbody_dashboard').pager or self.get_text('kendo-pager-info')
         text_list = text.split('of')
         print(text_list[-1].strip())
         return text_list[-1].strip()
@@ -283,7 +284,8 @@ class HomePage(BasePage):
                 self.is_element_present_rendered(logical_name=name, index=1)
         else:
             print("No element present")
-    def verify_dashboard_table_data(self, presence=True, patient_manager=None, treatment_monitor=None, video=None):
+    def verify_dashboard_table_data(self, presence=True, patient_manager=None, treatment_monitor=None, video=None,
+                                    all_pages=False):
         self.wait_for_page_to_load(60)
         self.scroll_to_element('k-tabstrip-tab-New patient videos')
         if presence:
@@ -293,26 +295,29 @@ class HomePage(BasePage):
             assert self.is_element_present('table_no_data', strict=True) == True, "Data is still present"
             print("No data is present")
 
-        if patient_manager:
-            pm_list_data = self.find_elements('td_patient_manager')
-            print(len(pm_list_data))
-            for item in pm_list_data:
-                assert patient_manager in item.text, f"{patient_manager} doesnot match {item.text}"
-                print(f"{patient_manager} matches {item.text}")
-
-        if treatment_monitor:
-            tm_list_data = self.find_elements('td_treatment_monitor')
-            print(len(tm_list_data))
-            for item in tm_list_data:
-                assert treatment_monitor in item.text, f"{treatment_monitor} doesnot match {item.text}"
-                print(f"{treatment_monitor} matches {item.text}")
-
-        if video:
-            vdo_list_data = self.find_elements('td_recorded')
-            print(len(vdo_list_data))
-            for item in vdo_list_data:
-                assert item.text is not None, f"Value not present"
-                print(f"{item.text} present for this row")
+        if not (patient_manager or treatment_monitor or video):
+            return
+        # one snapshot per page; with all_pages the pager is walked from page 1
+        if all_pages:
+            rows = self.iter_grid_rows('tbody_dashboard', from_first=True)
+        else:
+            rows = self.snapshot_grid('tbody_dashboard').grid_rows()
+
+        for row in rows:
+            if patient_manager:
+                value = row.cell("Patient manager")
+                assert patient_manager in value, f"{patient_manager} doesnot match {value} (page {row.page})"
+                print(f"{patient_manager} matches {value}")
+
+            if treatment_monitor:
+                value = row.cell("Treatment monitor")
+                assert treatment_monitor in value, f"{treatment_monitor} doesnot match {value} (page {row.page})"
+                print(f"{treatment_monitor} matches {value}")
+
+            if video:
+                value = row.cell("Recorded")
+                assert value is not None, f"Value not present"
+                print(f"{value} present for this row")
 
     def check_for_adherence_section(self):
         self.scroll_to_element('div_Adherence')
@@ -356,7 +361,8 @@ class HomePage(BasePage):
             self.click('moveChartLeft')
         elif next:
             self.click('moveChartRight')
-        time.sleep(10)
+        # a chart, not a grid: wait for it to finish re-rendering
+        self.wait_for_dom_quiet(quiet_ms=1000, timeout=10)
         self.wait_for_page_to_load()
         get_new_labels = self.get_current_labels()
         print("New labels:", get_new_labels)
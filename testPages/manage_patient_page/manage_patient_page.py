@@ -17,37 +17,38 @@ class ManagePatientPage(BasePage):
     def validate_manage_patient_page(self):
         self.wait_for_page_to_load()
         self.wait_for_element("span_Patients", 50)
-        time.sleep(10)
+        self.wait_for_dom_quiet(timeout=10)
         self.wait_for_page_to_load()
         self.wait_for_element("tbody_patient", 100)
 
 
     def search_patient(self, fname, lname, mrn, username, sa_id, start=None, end=None, dose=None):
         full_name = fname+" "+lname
-        self.type('input_search_patient', full_name)
-        time.sleep(10)
+        with self.expect_grid_refresh("tbody_patient", timeout=10):
+            self.type('input_search_patient', full_name)
         self.wait_for_page_to_load()
         self.wait_for_element('tbody_patient')
         self.wait_for_element('td_name')
-        self.wait_for_element('td_username')
 
-        name = self.get_text('td_name')
-        username_value = self.get_text('td_username')
-        mrn_value = self.get_text('td_mrn')
-        sa_id_value = self.get_text("td_sa_id")
+        # the first result row, every column from one grid snapshot
+        grid = self.snapshot_grid('tbody_patient')
+        name = grid.cell(0, "Name")
+        username_value = grid.cell(0, "UserName")
+        mrn_value = grid.cell(0, "MRN")
+        sa_id_value = grid.cell(0, "SA-ID")
         print(name, username_value, mrn_value)
         assert name.strip() == full_name, "Name mismatch"
         assert username_value.strip() == username, "Username mismatch"
         if dose:
-            doses_value = self.get_text('td_est_doses_remain')
+            doses_value = grid.cell(0, "Est. doses remaining")
             assert str(doses_value).strip() == str(dose), f"Doses mismatch {dose} and {doses_value}"
         assert mrn_value.strip() == mrn, "MRN mismatch"
         assert sa_id_value.strip() == sa_id, "SA ID mismatch"
         if start:
-            start_value = self.get_text('td_start_date')
+            start_value = grid.cell(0, "Start date")
             assert start_value == start, f"Start Date mismatch {start} and {start_value}"
         if end:
-            end_value = self.get_text('td_end_date')
+            end_value = grid.cell(0, "End date")
             assert end_value == end, f"End Date mismatch {end} and {end_value}"
 
 
@@ -58,7 +59,7 @@ class ManagePatientPage(BasePage):
         name = self.get_text('a_name')
         assert name.strip() == full_name, "Name mismatch"
         self.click('a_name')
-        time.sleep(5)
+        self.wait_for_dom_quiet(timeout=5)
         self.wait_for_page_to_load(50)
         try:
             self.kendo_dialog_wait_open()  # no title constraint
@@ -67,16 +68,16 @@ class ManagePatientPage(BasePage):
             print("popup not present")
 
     def open_inactive_tab(self):
-        self.click("li_span_Inactive_tab")
-        time.sleep(15)
+        with self.expect_grid_refresh("tbody_patient", timeout=15):
+            self.click("li_span_Inactive_tab")
         self.wait_for_page_to_load()
         self.wait_for_element("span_Patients", 50)
         self.wait_for_element("tbody_patient", 100)
         self.wait_for_element('a_name', 50)
 
     def open_test_tab(self):
-        self.click("li_span_Test_tab")
-        time.sleep(15)
+        with self.expect_grid_refresh("tbody_patient", timeout=15):
+            self.click("li_span_Test_tab")
         self.wait_for_page_to_load()
         self.wait_for_element("span_Patients", 50)
         self.wait_for_element("tbody_patient", 100)
@@ -86,7 +87,7 @@ class ManagePatientPage(BasePage):
         self.click("li_span_Active_tab")
         self.wait_for_page_to_load()
         self.wait_for_element("span_Patients", 50)
-        time.sleep(20)
+        self.wait_for_dom_quiet(quiet_ms=1000, timeout=20)
         self.wait_for_page_to_load()
         self.wait_for_element('k-opened-tabstrip-tab')
         tabname = self.get_text('k-opened-tabstrip-tab')
@@ -116,17 +117,19 @@ class ManagePatientPage(BasePage):
         return fname, lname, mrn_value, username_value, sa_id_value.upper()
 
     def search_test_patients(self, name='pat_fn'):
-        self.type('input_search_patient', name)
-        time.sleep(10)
+        with self.expect_grid_refresh("tbody_patient", timeout=10):
+            self.type('input_search_patient', name)
         self.wait_for_page_to_load()
         self.wait_for_element('tbody_patient')
         self.wait_for_element('td_name')
-        assert name in self.get_text('a_name'), f"Test patient {name} not displayed"
-        print(f"Test patient {name} is displayed")
+        # the search also matches other columns: look for the name on any result page
+        row = self.find_first('tbody_patient', lambda rec: name in rec.get("Name", ""))
+        assert row is not None, f"Test patient {name} not displayed"
+        print(f"Test patient {name} is displayed (page {row.page}, row {row.index + 1})")
 
     def search_test_patients_not_present(self, name='pat_fn_'):
-        self.type('input_search_patient', name)
-        time.sleep(10)
+        with self.expect_grid_refresh("tbody_patient", timeout=10):
+            self.type('input_search_patient', name)
         self.wait_for_page_to_load()
         self.wait_for_element('tbody_patient')
         self.wait_for_element('no_data')
@@ -232,19 +235,11 @@ class ManagePatientPage(BasePage):
                 time.sleep(5)
                 self.wait_for_page_to_load()
                 self.wait_for_element('tbody_patient')
-                rows = self.find_elements("tr_patient_rows")  # locator for all rows
-                found = False
-                for row in rows:
-                    cells = row.find_elements(By.TAG_NAME, "td")
-
-                    for cell in cells:
-                        cell_text = cell.text.strip().lower()
-                        print(cell_text)
-
-                        if search_name in cell_text:
-                            found = True
-                            print(f"'{any}' found in: {cell_text}")
-                            break  # stop checking cells in this row
+                grid = self.snapshot_grid('tbody_patient')
+                matches = grid.find_rows_containing(search_name)
+                found = bool(matches)
+                for r in matches:
+                    print(f"'{any}' found in: {grid.row_texts(r)}")
 
                 assert found, f"'{any}' not found in any table cell"
 
@@ -276,22 +271,11 @@ class ManagePatientPage(BasePage):
             time.sleep(8)
             self.wait_for_page_to_load(50)
 
-            headers = self.find_elements("table_header_sort")
-            header = headers[index - 1]
-            sort_type = header.get_attribute("aria-sort") or ""
-
-            if sort_type not in ("ascending", "descending"):
+            # header state + column values from one snapshot of the grid
+            if self.check_grid_sort(self.snapshot_grid("tbody_patient"), index) is None:
                 print(f"Column {index} has no valid sort state. Skipping.")
                 continue
 
-            print(f"Column {index} sort type: {sort_type}")
-            values = self._get_column_values(index)
-            print(f"Column {index}, Row counts: {len(values)} values: {values}")
-
-            if len(values) >= 2:
-                processed = self.normalize_values(values)
-                self.is_sorted(processed, sort_type)
-
             time.sleep(3)
             # ---------- SECOND CLICK (REVERSE) ----------
             headers = self.find_elements("table_header_sort")
@@ -302,28 +286,19 @@ class ManagePatientPage(BasePage):
             time.sleep(8)
             self.wait_for_page_to_load(50)
 
-            headers = self.find_elements("table_header_sort")
-            header = headers[index - 1]
-            sort_type = header.get_attribute("aria-sort") or ""
-
-            print(f"Column {index} sort type: {sort_type}")
-            values = self._get_column_values(index)
-            print(f"Column {index}, Row counts: {len(values)} values: {values}")
-
-            if len(values) >= 2:
-                processed = self.normalize_values(values)
-                self.is_sorted(processed, sort_type)
+            self.check_grid_sort(self.snapshot_grid("tbody_patient"), index)
 
     def get_total_pages(self):
         self.wait_for_element('tbody_patient')
-        text = self.get_text('kendo-pager-info')
+        self.wait_for_grid_refresh('tbody_patient', timeout=10)
+        text = self.snapshot_grid('tbody_patient').pager or self.get_text('kendo-pager-info')
         text_list = text.split('of')
         print(text_list[-1].strip())
         return text_list[-1].strip()
 
     def search_test_patient(self, name='pat_fn'):
-        self.type('input_search_staff', name)
-        time.sleep(10)
+        with self.expect_grid_refresh("tbody_patient", timeout=10):
+            self.type('input_search_staff', name)
         self.wait_for_page_to_load()
         self.wait_for_element('tbody_patient')
         self.wait_for_element('a_name')
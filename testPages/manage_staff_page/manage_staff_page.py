@@ -25,12 +25,12 @@ class ManageStaffPage(BasePage):
     def search_staff(self, fname=None, lname=None, email=None, phn=None, manager = UserData.default_managers, site=None):
         self.wait_for_element('a_name')
         full_name = " ".join(part for part in (fname, lname) if part)
-        if email:
-            self.type('input_search_staff', email)
-        else:
-            full_name = fname+" "+lname
-            self.type('input_search_staff', full_name+Keys.ENTER)
-        time.sleep(15)
+        with self.expect_grid_refresh("tbody_staff", timeout=15):
+            if email:
+                self.type('input_search_staff', email)
+            else:
+                full_name = fname+" "+lname
+                self.type('input_search_staff', full_name+Keys.ENTER)
         self.wait_for_page_to_load(50)
         self.wait_for_element('tbody_staff')
         name = self.get_text('a_name')
@@ -53,8 +53,8 @@ class ManageStaffPage(BasePage):
         print(f"All data matching: {name}, {email_text}, {phn_number}")
 
     def search_staff_with_email(self, email=None):
-        self.type('input_search_staff', email)
-        time.sleep(15)
+        with self.expect_grid_refresh("tbody_staff", timeout=15):
+            self.type('input_search_staff', email)
         self.wait_for_page_to_load(50)
         self.wait_for_element('tbody_staff')
         email_text = self.get_text('td_email')
@@ -75,16 +75,16 @@ class ManageStaffPage(BasePage):
         return fname, lname
 
     def open_inactive_tab(self):
-        self.click("li_span_Inactive_tab")
-        time.sleep(15)
+        with self.expect_grid_refresh("tbody_staff", timeout=15):
+            self.click("li_span_Inactive_tab")
         self.wait_for_page_to_load()
         self.wait_for_element("span_Manage_staff", 50)
         self.wait_for_element("tbody_staff", 100)
         self.wait_for_element('a_name', 50)
 
     def open_test_tab(self):
-        self.click("li_span_Test_tab")
-        time.sleep(15)
+        with self.expect_grid_refresh("tbody_staff", timeout=15):
+            self.click("li_span_Test_tab")
         self.wait_for_page_to_load()
         self.wait_for_element("span_Manage_staff", 50)
         self.wait_for_element("tbody_staff", 100)
@@ -149,22 +149,11 @@ class ManageStaffPage(BasePage):
             time.sleep(15)
             self.wait_for_page_to_load(50)
 
-            headers = self.find_elements("table_header_sort")
-            header = headers[index - 1]
-            sort_type = header.get_attribute("aria-sort") or ""
-
-            if sort_type not in ("ascending", "descending"):
+            # header state + column values from one snapshot of the grid
+            if self.check_grid_sort(self.snapshot_grid("tbody_staff"), index) is None:
                 print(f"Column {index} has no valid sort state. Skipping.")
                 continue
 
-            print(f"Column {index} sort type: {sort_type}")
-            values = self._get_column_values(index)
-            print(f"Column {index}, Row counts: {len(values)} values: {values}")
-
-            if len(values) >= 2:
-                processed = self.normalize_values(values)
-                self.is_sorted(processed, sort_type)
-
             # ---------- SECOND CLICK (REVERSE) ----------
             headers = self.find_elements("table_header_sort")
             header = headers[index - 1]
@@ -172,21 +161,11 @@ class ManageStaffPage(BasePage):
             time.sleep(15)
             self.wait_for_page_to_load(50)
 
-            headers = self.find_elements("table_header_sort")
-            header = headers[index - 1]
-            sort_type = header.get_attribute("aria-sort") or ""
-
-            print(f"Column {index} sort type: {sort_type}")
-            values = self._get_column_values(index)
-            print(f"Column {index}, Row counts: {len(values)} values: {values}")
-
-            if len(values) >= 2:
-                processed = self.normalize_values(values)
-                self.is_sorted(processed, sort_type)
+            self.check_grid_sort(self.snapshot_grid("tbody_staff"), index)
 
     def search_test_staff(self, name='test_f'):
-        self.type('input_search_staff', name)
-        time.sleep(10)
+        with self.expect_grid_refresh("tbody_staff", timeout=10):
+            self.type('input_search_staff', name)
         self.wait_for_page_to_load()
         self.wait_for_element('tbody_staff')
         self.wait_for_element('a_name')
@@ -194,8 +173,8 @@ class ManageStaffPage(BasePage):
         print(f"Test staff {name} is displayed")
 
     def search_test_staff_not_present(self, name='test_f'):
-        self.type('input_search_staff', name)
-        time.sleep(10)
+        with self.expect_grid_refresh("tbody_staff", timeout=10):
+            self.type('input_search_staff', name)
         self.wait_for_page_to_load()
         self.wait_for_element('tbody_staff')
         self.wait_for_element('no_data')
@@ -339,5 +339,5 @@ class UserStaffPage(BasePage):
             assert self.is_element_present('button_SUBMIT'), "Cannot save changes"
             print("Changes can be saved")
         else:
-            assert not self.is_element_present('button_SUBMIT'), "Changes can be saved"
+            assert not self.is_element_present('button_SUBMIT', expect_absent=True), "Changes can be saved"
             print("Cannot save changes")
\ No newline at end of file